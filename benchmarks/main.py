@@ -0,0 +1,253 @@
+"""Offline benchmarks of the client-side overhead of the cloud backends.
+
+The providers are replaced by local stand-ins: Braket's ``LocalSimulator``, qiskit's
+``BasicSimulator`` and a numpy-backed ``qibo_client.Client``, hence no token or network
+connection is needed. The timings are stored as JSON files, which can be compared with
+the ones of previous runs::
+
+    python benchmarks/main.py --output benchmarks/results/new.json
+    python benchmarks/main.py --compare benchmarks/results/new.json --filter decode
+"""
+
+import argparse
+import importlib.metadata as im
+import json
+import platform
+import statistics
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from braket.circuits.serialization import IRType
+from providers import LocalQiboClient, LocalQiskitProvider
+from qibo import Circuit, gates
+from qibo.backends import NumpyBackend
+from qiskit import QuantumCircuit
+
+from qibo_cloud_backends import qibo_client
+from qibo_cloud_backends.braket_client import BraketClientBackend
+from qibo_cloud_backends.braket_translation import to_braket, to_openqasm
+from qibo_cloud_backends.ionq_client import IonQClientBackend
+from qibo_cloud_backends.pool import PROVIDERS
+from qibo_cloud_backends.qiskit_client import QiskitClientBackend
+from qibo_cloud_backends.qiskit_translation import to_qiskit
+from qibo_cloud_backends.utils import (
+    counts_to_frequencies,
+    counts_to_outcomes,
+    counts_to_samples,
+    samples_to_outcomes,
+)
+
+RESULTS = Path(__file__).parent / "results"
+NQUBITS = (2, 5, 10, 20)
+DEPTHS = (10, 100)
+NSHOTS = (10**3, 10**5)
+NBITS = (5, 20)
+EXECUTION_NQUBITS = (2, 5, 10)
+EXECUTION_NSHOTS = 1000
+TOKEN = "local"
+
+NP_BACKEND = NumpyBackend()
+
+
+def random_circuit(nqubits, depth, seed=0):
+    """Layers of random rotations followed by a ladder of CNOTs, measuring all the qubits."""
+    rng = np.random.default_rng(seed)
+    circuit = Circuit(nqubits)
+    rotations = [gates.RX, gates.RY, gates.RZ]
+    for _ in range(depth):
+        for qubit in range(nqubits):
+            gate = rotations[rng.integers(len(rotations))]
+            circuit.add(gate(qubit, theta=rng.uniform(0, 2 * np.pi)))
+        circuit.add(gates.CNOT(q, q + 1) for q in range(nqubits - 1))
+    circuit.add(gates.M(*range(nqubits)))
+    return circuit
+
+
+def random_counts(nbits, nshots, seed=0):
+    """Qiskit-style counts of uniformly random bitstrings."""
+    rng = np.random.default_rng(seed)
+    states = Counter(rng.integers(0, 2**nbits, nshots).tolist())
+    return {format(state, f"0{nbits}b"): count for state, count in states.items()}
+
+
+def measurements(nbits):
+    circuit = Circuit(nbits)
+    circuit.add(gates.M(*range(nbits)))
+    return circuit.measurements
+
+
+def load_backends():
+    """Loads the backends on the local stand-ins of the providers."""
+    for name in ("qiskit-client", "ionq-client"):
+        PROVIDERS.get((name, TOKEN), LocalQiskitProvider)
+    with mock.patch.object(qibo_client.qibo_client, "Client", LocalQiboClient):
+        qibo = qibo_client.QiboClientBackend(token=TOKEN, platform="sim")
+    return {
+        "braket": BraketClientBackend(),
+        "qiskit": QiskitClientBackend(token=TOKEN, platform="basic_simulator"),
+        "ionq": IonQClientBackend(token=TOKEN, platform="basic_simulator"),
+        "qibo": qibo,
+    }
+
+
+def cases():
+    """Yields the ``(name, parameters, function)`` of each benchmark."""
+    for nqubits in NQUBITS:
+        for depth in DEPTHS:
+            params = {"nqubits": nqubits, "depth": depth}
+            circuit = random_circuit(nqubits, depth)
+            yield "translate.braket", params, lambda c=circuit: to_braket(c, False)
+            yield "translate.braket_ir", params, (
+                lambda c=circuit: to_braket(c, False).to_ir(IRType.OPENQASM).source
+            )
+            yield "translate.openqasm", params, lambda c=circuit: to_openqasm(c, False)
+            yield "translate.qiskit", params, lambda c=circuit: to_qiskit(c)
+            yield "translate.qasm", params, (
+                lambda c=circuit: QuantumCircuit.from_qasm_str(c.to_qasm())
+            )
+
+    for nbits in NBITS:
+        for nshots in NSHOTS:
+            params = {"nbits": nbits, "nshots": nshots}
+            counts = random_counts(nbits, nshots)
+            measured = measurements(nbits)
+            samples = counts_to_samples(counts)
+            yield "decode.samples", params, lambda c=counts: counts_to_samples(c)
+            yield "decode.frequencies", params, (
+                lambda c=counts: counts_to_frequencies(c)
+            )
+            yield "outcomes.samples", params, (
+                lambda m=measured, c=counts, n=nshots: counts_to_outcomes(
+                    m, c, NP_BACKEND, n
+                ).frequencies()
+            )
+            for result_format in ("counts", "packed"):
+                yield f"outcomes.{result_format}", params, (
+                    lambda m=measured, c=counts, n=nshots, f=result_format: (
+                        counts_to_outcomes(m, c, NP_BACKEND, n, result_format=f)
+                    ).frequencies()
+                )
+            yield "outcomes.from_samples", params, (
+                lambda m=measured, s=samples, n=nshots: samples_to_outcomes(
+                    m, s, NP_BACKEND, n
+                ).frequencies()
+            )
+
+    backends = load_backends()
+    for nqubits in EXECUTION_NQUBITS:
+        circuit = random_circuit(nqubits, 10)
+        params = {"nqubits": nqubits, "nshots": EXECUTION_NSHOTS}
+        for name, backend in backends.items():
+            yield f"execute.{name}", params, (
+                lambda b=backend, c=circuit: b.execute_circuit(
+                    c, nshots=EXECUTION_NSHOTS
+                ).frequencies()
+            )
+
+
+def measure(function, repeat):
+    """Times ``repeat`` calls of ``function``, after a warm-up call."""
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    packages = (
+        "qibo-cloud-backends",
+        "qibo",
+        "qibo-client",
+        "qiskit",
+        "amazon-braket-sdk",
+    )
+    return {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "versions": {package: im.version(package) for package in packages},
+    }
+
+
+def compare(results, baseline):
+    """Prints the ratio between the median timings and the ones of a baseline run."""
+    reference = {
+        (entry["name"], json.dumps(entry["params"], sort_keys=True)): entry["median"]
+        for entry in baseline["results"]
+    }
+    for entry in results:
+        key = (entry["name"], json.dumps(entry["params"], sort_keys=True))
+        if key in reference:
+            ratio = entry["median"] / reference[key]
+            print(f"{entry['name']:24} {key[1]:40} {ratio:6.2f}x")
+
+
+def main(repeat, pattern, output, baseline):
+    results = []
+    for name, params, function in cases():
+        if pattern is not None and pattern not in name:
+            continue
+        entry = {"name": name, "params": params, **measure(function, repeat)}
+        print(f"{name:24} {json.dumps(params):40} {entry['median'] * 1e3:10.3f} ms")
+        results.append(entry)
+
+    if output is None:
+        RESULTS.mkdir(exist_ok=True)
+        date = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        output = RESULTS / f"{date}.json"
+    Path(output).write_text(
+        json.dumps({"metadata": metadata(), "results": results}, indent=2)
+    )
+    print(f"Results stored in {output}")
+
+    if baseline is not None:
+        compare(results, json.loads(Path(baseline).read_text()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Number of timed calls per benchmark."
+    )
+    parser.add_argument(
+        "--filter",
+        dest="pattern",
+        default=None,
+        help="Run only the benchmarks containing this string.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON file storing the results. Defaults to a timestamped file in benchmarks/results.",
+    )
+    parser.add_argument(
+        "--compare",
+        dest="baseline",
+        default=None,
+        help="JSON file of a previous run, to compare the median timings with.",
+    )
+    main(**vars(parser.parse_args()))
@@ -0,0 +1,51 @@
+"""Local stand-ins of the provider services, so that the benchmarks never reach the network."""
+
+import itertools
+
+from qibo.backends import NumpyBackend
+from qibo_client.qibo_job import QiboJobStatus
+from qiskit.providers.basic_provider import BasicSimulator
+
+
+class LocalQiskitProvider:
+    """Stand-in for the IBM and IonQ providers, serving qiskit's local simulator."""
+
+    def __init__(self, token=None):
+        self.token = token
+
+    def get_backend(self, name=None):
+        return BasicSimulator()
+
+
+class LocalQiboJob:
+    """Stand-in for :class:`qibo_client.qibo_job.QiboJob`, executed with numpy on request."""
+
+    def __init__(self, pid, circuit, nshots):
+        self.pid = pid
+        self.circuit = circuit
+        self.nshots = nshots
+
+    def status(self):
+        return QiboJobStatus.SUCCESS
+
+    def delete(self):
+        return "Job deleted"
+
+    def result(self, wait=5, verbose=False):
+        # the server deserializes a fresh copy of the circuit
+        circuit = self.circuit.copy(deep=True)
+        return NumpyBackend().execute_circuit(circuit, nshots=self.nshots)
+
+
+class LocalQiboClient:
+    """Stand-in for :class:`qibo_client.Client`."""
+
+    pids = itertools.count()
+
+    def __init__(self, token, url=None):
+        self.token = token
+
+    def run_circuit(
+        self, circuit, device, project="personal", nshots=None, verbatim=False
+    ):
+        return LocalQiboJob(str(next(self.pids)), circuit, nshots)
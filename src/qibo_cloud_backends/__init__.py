@@ -1,28 +1,67 @@
+import importlib
 import importlib.metadata as im
 import os
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 from qibo.config import raise_error
 
-from qibo_cloud_backends.braket_client import BraketClientBackend
-from qibo_cloud_backends.ionq_client import IonQClientBackend
-from qibo_cloud_backends.qibo_client import QiboClientBackend
-from qibo_cloud_backends.qiskit_client import QiskitClientBackend
+from qibo_cloud_backends.limits import LIMITERS, RateLimit
+from qibo_cloud_backends.pool import PROVIDERS, Pool
+
+if TYPE_CHECKING:  # pragma: no cover
+    from qibo_cloud_backends.braket_client import BraketClientBackend
+    from qibo_cloud_backends.dispatcher import DispatcherBackend
+    from qibo_cloud_backends.ionq_client import IonQClientBackend
+    from qibo_cloud_backends.qibo_client import QiboClientBackend
+    from qibo_cloud_backends.qiskit_client import QiskitClientBackend
 
 __version__ = im.version(__package__)
 
-QibocloudBackend = Union[QiboClientBackend, QiskitClientBackend, BraketClientBackend]
+QibocloudBackend = Union[
+    "QiboClientBackend", "QiskitClientBackend", "BraketClientBackend"
+]
 
 CLIENTS = ("ionq-client", "qibo-client", "qiskit-client", "braket-client")
 TOKENS = ("IONQ_TOKEN", "QIBO_CLIENT_TOKEN", "IBMQ_TOKEN", None)
 
+# The backends are imported only on first use, as each of them loads the SDK of its provider
+_BACKENDS = {
+    "BraketClientBackend": "qibo_cloud_backends.braket_client",
+    "DispatcherBackend": "qibo_cloud_backends.dispatcher",
+    "IonQClientBackend": "qibo_cloud_backends.ionq_client",
+    "QiboClientBackend": "qibo_cloud_backends.qibo_client",
+    "QiskitClientBackend": "qibo_cloud_backends.qiskit_client",
+}
+
+
+def __getattr__(name: str):
+    if name in _BACKENDS:
+        return getattr(importlib.import_module(_BACKENDS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_BACKENDS))
+
 
 class MetaBackend:
-    """Meta-backend class which takes care of loading the qibo-cloud backends."""
+    """Meta-backend class which takes care of loading the qibo-cloud backends.
+
+    The loaded backends are kept in the ``pool`` class attribute, a
+    :class:`qibo_cloud_backends.pool.Pool` shared by all the threads, so that
+    loading again the same client with the same token, platform and verbosity
+    returns the same backend without contacting the provider.
+    """
+
+    pool = Pool()
 
     @staticmethod
     def load(
-        client: str, token: str = None, platform: str = None, verbosity: bool = False
+        client: str,
+        token: str = None,
+        platform: str = None,
+        verbosity: bool = False,
+        pooled: bool = True,
     ) -> QibocloudBackend:
         """Loads the backend.
 
@@ -32,46 +71,156 @@ class MetaBackend:
             token (str): User token for the remote connection.
             platform (str): Name of the platform to connect to on the provider's servers.
             verbosity (bool): Enable verbose mode for the qibo-client. Default is False.
+            pooled (bool): Whether to reuse a backend loaded before with the same arguments.
+                The pooled backends are shared, hence changes of their attributes affect
+                all the users. Default is True.
         Returns:
             qibo.backends.abstract.Backend: The loaded backend.
         """
+        if client not in CLIENTS:
+            raise_error(
+                ValueError,
+                f"Unsupported service, please use one among {CLIENTS}.",
+            )
+        if not pooled:
+            return MetaBackend._create(client, token, platform, verbosity)
+        return MetaBackend.pool.get(
+            (client, token, platform, verbosity),
+            lambda: MetaBackend._create(client, token, platform, verbosity),
+        )
 
+    @staticmethod
+    def _create(client, token, platform, verbosity):
         if client == "qibo-client":
-            return QiboClientBackend(token, platform, verbosity)
+            from qibo_cloud_backends.qibo_client import QiboClientBackend
+
+            return QiboClientBackend(
+                token=token, platform=platform, verbosity=verbosity
+            )
         elif client == "ionq-client":
+            from qibo_cloud_backends.ionq_client import IonQClientBackend
+
             return IonQClientBackend(token, platform)
         elif client == "qiskit-client":
+            from qibo_cloud_backends.qiskit_client import QiskitClientBackend
+
             return QiskitClientBackend(token, platform)
-        elif client == "braket-client":
-            return BraketClientBackend(verbosity=verbosity)
         else:
+            from qibo_cloud_backends.braket_client import BraketClientBackend
+
+            return BraketClientBackend(verbosity=verbosity)
+
+    @staticmethod
+    def invalidate(client: str = None, token: str = None, platform: str = None):
+        """Drops the pooled backends, and the provider sessions of the dropped credentials.
+
+        Only the backends matching all the given arguments are dropped, e.g. all the
+        backends authenticated with a revoked ``token``. If no argument is given, the
+        pool is emptied.
+
+        Args:
+            client (str): Name of the cloud client.
+            token (str): User token for the remote connection.
+            platform (str): Name of the platform.
+        """
+        for key in MetaBackend.pool.keys():
+            matches = (
+                (client is None or key[0] == client)
+                and (token is None or key[1] == token)
+                and (platform is None or key[2] == platform)
+            )
+            if matches:
+                MetaBackend.pool.discard(key)
+        if platform is not None:
+            # the providers are shared by all the platforms
+            return
+        for key in PROVIDERS.keys():
+            if (client is None or key[0] == client) and (
+                token is None or key[1] == token
+            ):
+                PROVIDERS.discard(key)
+
+    @staticmethod
+    def limit(
+        client: str,
+        rate: float = None,
+        burst: int = 1,
+        max_in_flight: int = None,
+        token: str = None,
+    ):
+        """Configures the client-side limits of the submissions to a provider, enforced
+        by a token bucket per credentials shared by all the backends of the client.
+
+        If both ``rate`` and ``max_in_flight`` are ``None``, the limits are removed.
+        The time spent waiting is reported by :meth:`qibo_cloud_backends.limits.Limiters.stats`
+        of :data:`qibo_cloud_backends.limits.LIMITERS`.
+
+        Args:
+            client (str): Name of the cloud client, one among
+                ``("ionq-client", "qibo-client", "qiskit-client", "braket-client")``.
+            rate (float): Maximum sustained number of jobs submitted per second.
+                If ``None``, the submissions are not throttled. Defaults to ``None``.
+            burst (int): Number of jobs which can be submitted at once. Defaults to ``1``.
+            max_in_flight (int): Maximum number of jobs submitted and not completed yet.
+                If ``None``, the jobs in flight are not limited. Defaults to ``None``.
+            token (str): If given, the limits apply only to this token, otherwise to
+                every token of the client. Defaults to ``None``.
+        """
+        if client not in CLIENTS:
             raise_error(
                 ValueError,
                 f"Unsupported service, please use one among {CLIENTS}.",
             )
+        limit = None
+        if rate is not None or max_in_flight is not None:
+            limit = RateLimit(rate, burst, max_in_flight)
+        # the Braket backends are named after AWS
+        provider = "aws" if client == "braket-client" else client
+        LIMITERS.configure(provider, limit, token)
 
-    def list_available(self, tokens: dict = None) -> dict:
+    def list_available(self, tokens: dict = None, timeout: float = None) -> dict:
         """Lists all the available qibo cloud backends.
 
         Args:
             tokens (dict): Mapping between the services and their tokens, e.g.
                            {"qibo-client": "xxxxx", "qiskit-client": "xxxxx", "braket-client": "xxxxx"}.
                            By default reads the variables ("QIBO_CLIENT_TOKEN", "IBMQ_TOKEN", None).
+            timeout (float): Maximum number of seconds to wait for the availability checks.
+                             Defaults to ``10``.
         Returns:
             dict: the qibo-cloud available backends.
         """
+        return {
+            client: result.available
+            for client, result in self.probe(tokens, timeout).items()
+        }
+
+    @staticmethod
+    def probe(tokens: dict = None, timeout: float = None, ttl: float = None) -> dict:
+        """Checks the availability of the qibo cloud backends, with diagnostics.
+
+        The clients are probed concurrently through a lightweight authenticated request,
+        without constructing the backends, and the results are cached for a short time.
+
+        Args:
+            tokens (dict): Mapping between the services and their tokens, as in
+                           :meth:`list_available`.
+            timeout (float): Maximum number of seconds to wait for the probes. Defaults to ``10``.
+            ttl (float): Number of seconds a probe result is reused for. Defaults to ``60``.
+        Returns:
+            dict: The :class:`qibo_cloud_backends.probes.ProbeResult` of each client,
+            reporting why it is unavailable and how long the probe took.
+        """
+        from qibo_cloud_backends import probes
+
         if tokens is None:
             tokens = {}
-        available_backends = {}
-        for client, token in zip(CLIENTS, TOKENS):
-            kwargs = {}
-            if client != "braket-client":
-                token = tokens.get(client, os.environ.get(token))
-                kwargs.update({"token": token})
-            try:
-                MetaBackend.load(client=client, **kwargs)
-                available = True
-            except:
-                available = False
-            available_backends[client] = available
-        return available_backends
+        resolved = {
+            client: tokens.get(client, os.environ.get(token) if token else None)
+            for client, token in zip(CLIENTS, TOKENS)
+        }
+        return probes.probe(
+            resolved,
+            timeout=probes.DEFAULT_TIMEOUT if timeout is None else timeout,
+            ttl=probes.DEFAULT_TTL if ttl is None else ttl,
+        )
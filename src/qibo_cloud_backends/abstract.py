@@ -0,0 +1,495 @@
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from qibo.backends import NumpyBackend
+from qibo.config import log, raise_error
+
+from qibo_cloud_backends.cache import fingerprint
+from qibo_cloud_backends.jobs import SplitJob, as_completed
+from qibo_cloud_backends.journal import JobJournal
+from qibo_cloud_backends.limits import LIMITERS
+from qibo_cloud_backends.timing import Timings, report
+from qibo_cloud_backends.utils import (
+    PackedMeasurementOutcomes,
+    bind_parameters,
+    bits_to_outcomes,
+    check_stack_size,
+    frequencies_to_bits,
+    parity_expectations,
+    samples_to_outcomes,
+    split_shots,
+    stack_frequencies,
+    sweep_values,
+)
+
+MAX_SUBMISSION_THREADS = 8
+"""Maximum number of parts of a split execution submitted at the same time."""
+
+
+class CloudBackend(NumpyBackend):
+    """Base class of the qibo cloud backends.
+
+    Subclasses implement :meth:`submit_circuit` and :meth:`submit_circuits`, returning
+    :class:`qibo_cloud_backends.jobs.CloudJob` handles right after the submission.
+    The blocking and the ``asyncio`` execution methods are built on top of them.
+
+    The ``poller`` attribute can be set to a :class:`qibo_cloud_backends.polling.Poller`,
+    which is then used to wait for the completion of every job before retrieving its result.
+    Otherwise, the provider's own waiting mechanism is used.
+
+    The ``cache`` attribute can be set to a :class:`qibo_cloud_backends.cache.ResultCache`,
+    which is then queried by ``execute_circuit`` before contacting the provider.
+
+    The ``journal`` attribute can be set to a :class:`qibo_cloud_backends.journal.JobJournal`,
+    where ``execute_circuit`` records the submitted jobs before waiting for them, so that
+    they can be reattached after a crash instead of being submitted again.
+
+    The ``result_format`` attribute selects the representation of the results, one of
+    ``"samples"`` (default), ``"packed"`` and ``"counts"``, see
+    :func:`qibo_cloud_backends.utils.bits_to_outcomes`. The last two reduce the memory
+    of large-shot results, building the per-shot samples only when requested.
+
+    The ``max_shots`` attribute is the maximum number of shots of a single job, as
+    advertised by the device when available. Executions requiring more shots are split
+    in several jobs, submitted concurrently, whose results are merged together.
+
+    The results carry the time spent in each stage of the execution in their ``timings``
+    attribute, see :class:`qibo_cloud_backends.timing.Timings`. The ``timing_callback``
+    attribute can be set to a function, called as ``timing_callback(timings)`` after every
+    execution, e.g. to forward the timings to a tracing system. Setting it on
+    :class:`qibo_cloud_backends.abstract.CloudBackend` applies it to all the backends.
+
+    The submissions are throttled by the :class:`qibo_cloud_backends.limits.RateLimiter`
+    of the provider and credentials of the backend, if limits are configured in
+    :data:`qibo_cloud_backends.limits.LIMITERS`, e.g. through
+    :meth:`qibo_cloud_backends.MetaBackend.limit`.
+
+    The ``retry`` attribute can be set to a :class:`qibo_cloud_backends.retry.RetryPolicy`,
+    which then retries the status requests and the retrievals of the results failing with
+    transient errors, e.g. network failures or throttled requests, reattaching to the
+    submitted jobs through :meth:`attach` instead of submitting them again. The
+    submissions are only retried when they fail before reaching the provider.
+    """
+
+    poller = None
+    cache = None
+    journal = None
+    timing_callback = None
+    result_format = "samples"
+    platform = None
+    max_shots = None
+    credentials = None
+    retry = None
+
+    def _split(self, circuit, nshots, submit, timings=None):
+        """Submits a circuit in parts complying with the ``max_shots`` limit.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The circuit to execute.
+            nshots (int): Total number of shots.
+            submit (Callable): Function submitting the circuit as ``submit(shots)`` and
+                returning the :class:`qibo_cloud_backends.jobs.CloudJob` handle.
+            timings (:class:`qibo_cloud_backends.timing.Timings`): The timings recorded
+                before the submission, e.g. of the translation. Defaults to ``None``.
+
+        Returns:
+            :class:`qibo_cloud_backends.jobs.CloudJob`: The handle of the single job, or a
+            :class:`qibo_cloud_backends.jobs.SplitJob` merging the parts.
+        """
+        if timings is None:
+            timings = Timings()
+        shots = split_shots(nshots, self.max_shots)
+
+        def limited(shots):
+            return self._limited(lambda: submit(shots))
+
+        with timings.stage("submit"):
+            if len(shots) == 1:
+                job = limited(nshots)
+            else:
+                with ThreadPoolExecutor(
+                    min(len(shots), MAX_SUBMISSION_THREADS)
+                ) as executor:
+                    jobs = list(executor.map(limited, shots))
+                job = SplitJob(jobs, circuit, nshots, self)
+        job.timings = timings
+        return job
+
+    def _limited(self, submit, count=1):
+        """Calls ``submit()`` within the limits of the provider, if any, retrying it
+        according to the ``retry`` policy of the backend.
+
+        Args:
+            submit (Callable): Function submitting ``count`` jobs to the provider and
+                returning their :class:`qibo_cloud_backends.jobs.CloudJob` handle, or a
+                list of handles.
+            count (int): Number of jobs submitted. If ``submit`` returns as many handles,
+                each of them frees its own slot when completed, otherwise the handles
+                share the slots, e.g. the circuits of a multi-circuit job. Defaults to ``1``.
+
+        Returns:
+            The handles returned by ``submit``.
+        """
+
+        def request():
+            if self.retry is None:
+                return submit()
+            return self.retry.call(
+                submit,
+                f"submission to {self.name}",
+                retryable=self.retry.resubmittable,
+            )
+
+        limiter = LIMITERS.get(self.name, self.credentials)
+        if limiter is None:
+            return request()
+        limiter.acquire(count)
+        try:
+            jobs = request()
+        except Exception:
+            limiter.release(count)
+            raise
+        handles = jobs if isinstance(jobs, list) else [jobs]
+        if len(handles) == count:
+            for job in handles:
+                limiter.track([job])
+        else:
+            limiter.track(handles, count)
+        return jobs
+
+    def _exceeds_max_shots(self, nshots) -> bool:
+        return self.max_shots is not None and nshots > self.max_shots
+
+    def _cached(self, circuit, nshots, execute, **options):
+        """Runs ``execute()`` unless the result of the execution is cached already.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The circuit to execute.
+            nshots (int): Total number of shots.
+            execute (Callable): Function executing the circuit remotely.
+            options (dict): Additional options affecting the result of the execution.
+
+        Returns:
+            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+        """
+        if self.cache is None:
+            return execute()
+        route = f"{self.name}:{self.platform}"
+        key = fingerprint(circuit, nshots, route, **options)
+        timings = Timings(route=route, nshots=nshots)
+        with timings.stage("cache"):
+            entry = self.cache.get_packed(key)
+        if entry is not None:
+            packed, nbits = entry
+            with timings.stage("decode"):
+                if self.result_format == "packed":
+                    result = PackedMeasurementOutcomes(
+                        circuit.measurements, packed, nbits, self, nshots
+                    )
+                else:
+                    samples = np.unpackbits(packed, axis=1, count=nbits)
+                    result = samples_to_outcomes(
+                        circuit.measurements,
+                        samples.astype(np.int64),
+                        self,
+                        nshots,
+                        self.result_format,
+                    )
+            result.timings = timings
+            report(timings, self.timing_callback)
+            return result
+        result = execute()
+        if isinstance(result, PackedMeasurementOutcomes):
+            self.cache.put_packed(key, result.packed, result.nbits)
+        elif result is not None and result.has_samples():
+            self.cache.put(key, result.samples())
+        elif result is not None:
+            # the counts results are stored without building their samples
+            nbits = sum(len(gate.qubits) for gate in circuit.measurements)
+            bits, occurrences = frequencies_to_bits(result.frequencies(False), nbits)
+            packed = np.repeat(np.packbits(bits, axis=1), occurrences, axis=0)
+            self.cache.put_packed(key, packed, nbits)
+        return result
+
+    def _execute(self, circuit, nshots, submit, adaptive=None, **options):
+        """Submits a circuit through ``submit(nshots)`` and waits for its result, unless the
+        result is cached already or the job is recorded in the journal.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The circuit to execute.
+            nshots (int): Total number of shots.
+            submit (Callable): Function submitting the circuit as ``submit(shots)`` and
+                returning the :class:`qibo_cloud_backends.jobs.CloudJob` handle.
+            adaptive (:class:`qibo_cloud_backends.adaptive.AdaptiveShots`): If given,
+                the shots are executed in increments, see :meth:`_adaptive`.
+                Defaults to ``None``.
+            options (dict): Additional options affecting the result of the execution.
+
+        Returns:
+            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+        """
+        if adaptive is not None:
+            return self._adaptive(circuit, nshots, submit, adaptive)
+        return self._cached(
+            circuit,
+            nshots,
+            lambda: self._journaled(
+                circuit, nshots, lambda: submit(nshots), **options
+            ).result(),
+            **options,
+        )
+
+    def _adaptive(self, circuit, nshots, submit, adaptive):
+        """Executes a circuit in rounds of shots, until the probabilities of the outcomes
+        of each measurement register are estimated within the precision of ``adaptive``,
+        or ``nshots`` shots are executed. The executions are neither cached nor journaled.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The circuit to execute.
+            nshots (int): Maximum total number of shots.
+            submit (Callable): Function submitting the circuit as ``submit(shots)`` and
+                returning the :class:`qibo_cloud_backends.jobs.CloudJob` handle.
+            adaptive (:class:`qibo_cloud_backends.adaptive.AdaptiveShots`): The stopping
+                rule.
+
+        Returns:
+            :class:`qibo.result.MeasurementOutcomes`: Outcome of the merged rounds, whose
+            ``nshots`` are the shots actually executed.
+        """
+        sizes = [len(gate.qubits) for gate in circuit.measurements]
+        route = f"{self.name}:{self.platform}"
+        timings = Timings(route=route)
+        frequencies = Counter()
+        used = 0
+        shots = min(adaptive.initial_shots, nshots)
+        with timings.stage("download"):
+            while shots > 0:
+                frequencies.update(submit(shots).frequencies())
+                used += shots
+                half_width = adaptive.half_width(frequencies, sizes)
+                log.info(
+                    f"Adaptive execution on {route}: {used} shots, "
+                    + f"half width {half_width:.4f}."
+                )
+                shots = adaptive.next_shots(used, half_width, nshots)
+        # merged results never build the per-shot samples upfront
+        result_format = self.result_format
+        if result_format == "samples":
+            result_format = "counts"
+        with timings.stage("decode"):
+            bits, occurrences = frequencies_to_bits(frequencies, sum(sizes))
+            result = bits_to_outcomes(
+                circuit.measurements,
+                bits,
+                occurrences,
+                self,
+                used,
+                result_format,
+            )
+        timings.nshots = used
+        result.timings = timings
+        report(timings, self.timing_callback)
+        return result
+
+    def _journaled(self, circuit, nshots, submit, **options):
+        """Reattaches to the job of an execution recorded in the journal, or submits it
+        and records it before returning its handle."""
+        if self.journal is None:
+            return submit()
+        key = fingerprint(circuit, nshots, f"{self.name}:{self.platform}", **options)
+        entry = self.journal.get(key)
+        if entry is not None:
+            try:
+                return self._reattach(key, entry, circuit)
+            except Exception as exception:  # pylint: disable=broad-except
+                log.warning(f"Cannot reattach to {entry['jobs']}: {exception!r}")
+                self.journal.discard(key)
+        job = submit()
+        self.journal.record(key, job)
+        job.journal_key = key
+        return job
+
+    def _reattach(self, key, entry, circuit):
+        parts = [self.attach(job_id, circuit, shots) for job_id, shots in entry["jobs"]]
+        if len(parts) == 1:
+            job = parts[0]
+        else:
+            job = SplitJob(parts, circuit, entry["nshots"], self)
+        job.journal_key = key
+        return job
+
+    def attach(self, job_id, circuit, nshots):  # pragma: no cover
+        """Builds the handle of a job submitted before, e.g. by another process.
+
+        Args:
+            job_id (str): Identifier of the job on the provider's servers.
+            circuit (:class:`qibo.models.Circuit`): The submitted circuit.
+            nshots (int): Number of shots of the job.
+
+        Returns:
+            :class:`qibo_cloud_backends.jobs.CloudJob`: Handle of the job.
+        """
+        raise NotImplementedError
+
+    def resume(self):
+        """Reattaches to the jobs recorded in the journal by this backend, e.g. after
+        a crash. The entries are removed from the journal once their results are
+        retrieved.
+
+        The handles refer to circuits made of the measurement gates only, as rebuilt by
+        :meth:`qibo_cloud_backends.journal.JobJournal.circuit`. Executing again one of the
+        original circuits reattaches to its job as well.
+
+        Returns:
+            dict: Mapping between the :func:`qibo_cloud_backends.cache.fingerprint` of the
+            pending executions and their :class:`qibo_cloud_backends.jobs.CloudJob` handles.
+        """
+        if self.journal is None:
+            raise_error(RuntimeError, "No journal is set for this backend.")
+        route = f"{self.name}:{self.platform}"
+        return {
+            key: self._reattach(key, entry, JobJournal.circuit(entry))
+            for key, entry in self.journal.entries(route).items()
+        }
+
+    def supports(self, circuit) -> bool:
+        """Checks whether the backend can execute all the gates of a circuit.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The circuit to check.
+
+        Returns:
+            bool: ``True`` if the circuit can be executed.
+        """
+        return True
+
+    def queue_depth(self):
+        """Returns the number of jobs waiting on the device, as reported by the provider.
+
+        Returns:
+            int: The number of queued jobs, or ``None`` if the provider does not report it.
+        """
+        return None
+
+    def submit_circuit(self, circuit, *args, **kwargs):  # pragma: no cover
+        """Submits a circuit without waiting for its execution.
+
+        Returns:
+            :class:`qibo_cloud_backends.jobs.CloudJob`: Handle of the submitted job.
+        """
+        raise NotImplementedError
+
+    def submit_circuits(self, circuits, *args, **kwargs):  # pragma: no cover
+        """Submits a list of circuits without waiting for their execution.
+
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.CloudJob` handles, in input order.
+        """
+        raise NotImplementedError
+
+    def submit_sweep(self, circuit, parameter_values, nshots=1000, **kwargs):
+        """Submits a parametric circuit with several sets of parameters, without waiting
+        for their execution.
+
+        By default, a copy of the circuit is bound to each parameter set and the copies
+        are submitted together through :meth:`submit_circuits`.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The parametric circuit.
+            parameter_values (ndarray): The ``(n_sets, n_parameters)`` parameter values,
+                listing the parameters of the trainable gates in the order of
+                :meth:`qibo.models.Circuit.get_parameters`.
+            nshots (int): Total number of shots for each parameter set. Defaults to ``1000``.
+            kwargs (dict): Additional keyword arguments passed to :meth:`submit_circuits`.
+
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.CloudJob` handles, one per parameter set.
+        """
+        values = sweep_values(circuit, parameter_values)
+        circuits = [bind_parameters(circuit, row) for row in values]
+        return self.submit_circuits(circuits, nshots=nshots, **kwargs)
+
+    def execute_sweep(self, circuit, parameter_values, nshots=1000, **kwargs):
+        """Executes a parametric circuit with several sets of parameters.
+
+        The arguments are the same of :meth:`submit_sweep`.
+
+        Returns:
+            ndarray: The ``(n_sets, 2**n_measured_qubits)`` array of the number of occurrences
+            of each bitstring, with the first measured qubit as most significant bit.
+        """
+        if not circuit.measurements:
+            raise_error(RuntimeError, "No measurement found in the provided circuit.")
+        nbits = sum(len(gate.qubits) for gate in circuit.measurements)
+        # fail before submitting executions whose frequencies cannot be stacked
+        check_stack_size(len(sweep_values(circuit, parameter_values)), nbits)
+        jobs = self.submit_sweep(circuit, parameter_values, nshots, **kwargs)
+        return stack_frequencies((job.frequencies() for job in jobs), len(jobs), nbits)
+
+    def expectation_from_counts(self, circuit, observables, nshots=1000, **kwargs):
+        """Executes a circuit and computes the expectation values of Pauli-Z strings
+        on the measured qubits, directly from the counts reported by the provider,
+        without building the per-shot samples.
+
+        The other arguments are the same of :meth:`submit_circuit`.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The circuit to execute.
+            observables (list): Strings of ``"Z"`` and ``"I"`` characters, one per measured
+                qubit, ordered as the measured qubits, e.g. ``["ZZI", "IZZ"]``.
+            nshots (int): Total number of shots. Defaults to ``1000``.
+
+        Returns:
+            (ndarray, ndarray): The expectation values of the observables and their
+            single-shot variances. The variances of the estimates are obtained dividing
+            the latter by ``nshots``.
+        """
+        if not circuit.measurements:
+            raise_error(RuntimeError, "No measurement found in the provided circuit.")
+        job = self.submit_circuit(circuit, nshots=nshots, **kwargs)
+        nbits = sum(len(gate.qubits) for gate in circuit.measurements)
+        bits, occurrences = frequencies_to_bits(job.frequencies(), nbits)
+        return parity_expectations(bits, occurrences, observables)
+
+    def as_completed(self, circuits, *args, poller=None, **kwargs):
+        """Submits a list of circuits and yields their results as soon as each of them
+        completes, see :func:`qibo_cloud_backends.jobs.as_completed`.
+
+        The other arguments are the same of :meth:`submit_circuits`.
+
+        Args:
+            circuits (list): The circuits to execute.
+            poller (:class:`qibo_cloud_backends.polling.Poller`): Polling strategy.
+                If ``None``, the one of the backend is used, if any. Defaults to ``None``.
+
+        Returns:
+            Iterator: The ``(index, result)`` pairs, where ``index`` is the position of
+            the circuit in ``circuits`` and ``result`` its
+            :class:`qibo.result.MeasurementOutcomes`, in completion order.
+        """
+        jobs = self.submit_circuits(circuits, *args, **kwargs)
+        return as_completed(jobs, poller)
+
+    async def async_execute_circuit(self, circuit, *args, **kwargs):
+        """Executes a circuit without blocking the running event loop.
+
+        The arguments are the same of :meth:`submit_circuit`.
+
+        Returns:
+            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+        """
+        job = await asyncio.to_thread(self.submit_circuit, circuit, *args, **kwargs)
+        return await job.async_result()
+
+    async def async_execute_circuits(self, circuits, *args, **kwargs):
+        """Executes a list of circuits without blocking the running event loop.
+
+        The arguments are the same of :meth:`submit_circuits`.
+
+        Returns:
+            list: The :class:`qibo.result.MeasurementOutcomes` of each circuit, in input order.
+        """
+        jobs = await asyncio.to_thread(self.submit_circuits, circuits, *args, **kwargs)
+        return await asyncio.gather(*(job.async_result() for job in jobs))
@@ -0,0 +1,133 @@
+import math
+from collections import Counter
+from statistics import NormalDist
+from typing import List
+
+from qibo.config import raise_error
+
+
+def wilson_half_width(occurrences: int, nshots: int, z: float) -> float:
+    """Half width of the Wilson score interval of a probability estimated by sampling.
+
+    Unlike the normal approximation, the interval does not collapse for the outcomes
+    observed in none or all of the shots.
+
+    Args:
+        occurrences (int): Number of shots of the outcome.
+        nshots (int): Total number of shots.
+        z (float): Quantile of the standard normal distribution of the confidence level,
+            e.g. ``1.96`` for ``95%``.
+
+    Returns:
+        float: The half width of the interval.
+    """
+    p = occurrences / nshots
+    z2 = z**2 / nshots
+    return z * math.sqrt(p * (1 - p) / nshots + z2 / (4 * nshots)) / (1 + z2)
+
+
+def marginal_frequencies(frequencies: Counter, sizes: List[int]) -> List[Counter]:
+    """Splits the frequencies of the measured bitstrings in the ones of each register.
+
+    Args:
+        frequencies (:class:`collections.Counter`): Mapping between the decimal
+            representation of the measured bitstrings, with the first measured qubit as
+            most significant bit, and their number of occurrences.
+        sizes (list): Number of qubits of each register, in measurement order.
+
+    Returns:
+        list: The decimal frequencies of the marginal distribution of each register.
+    """
+    nbits = sum(sizes)
+    marginals = []
+    shift = nbits
+    for size in sizes:
+        shift -= size
+        mask = (1 << size) - 1
+        marginal = Counter()
+        for state, count in frequencies.items():
+            marginal[(state >> shift) & mask] += count
+        marginals.append(marginal)
+    return marginals
+
+
+class AdaptiveShots:
+    """Stopping rule of the executions running the shots in increments, until the
+    probabilities of the measured outcomes are estimated within a target precision.
+
+    After every round, the Wilson score interval of the probability of each outcome of
+    the marginal distribution of each measurement register is computed, and the
+    execution stops once all of them are narrower than ``precision``, or the shot
+    budget is exhausted. The following round is sized on the shots projected to reach
+    the precision, as the intervals shrink with the square root of the shots.
+
+    Args:
+        precision (float): Target half width of the confidence intervals of the
+            probabilities. Defaults to ``0.01``.
+        confidence (float): Confidence level of the intervals. Defaults to ``0.95``.
+        initial_shots (int): Shots of the first round, and minimum shots of the
+            following ones. Defaults to ``100``.
+        growth (float): Maximum ratio between the total shots after and before a round,
+            limiting the shots spent beyond the projection when it is inaccurate.
+            Defaults to ``2``.
+    """
+
+    def __init__(
+        self,
+        precision: float = 0.01,
+        confidence: float = 0.95,
+        initial_shots: int = 100,
+        growth: float = 2.0,
+    ):
+        if not 0 < precision < 0.5:
+            raise_error(ValueError, f"Precision must be in (0, 0.5), got {precision}.")
+        if not 0 < confidence < 1:
+            raise_error(ValueError, f"Confidence must be in (0, 1), got {confidence}.")
+        if initial_shots < 1:
+            raise_error(
+                ValueError, f"Initial shots must be at least 1, got {initial_shots}."
+            )
+        if growth <= 1:
+            raise_error(ValueError, f"Growth must be larger than 1, got {growth}.")
+        self.precision = precision
+        self.confidence = confidence
+        self.initial_shots = initial_shots
+        self.growth = growth
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def half_width(self, frequencies: Counter, sizes: List[int]) -> float:
+        """Widest half width of the confidence intervals of the marginal probabilities.
+
+        Args:
+            frequencies (:class:`collections.Counter`): The decimal frequencies of the
+                measured bitstrings, see :func:`marginal_frequencies`.
+            sizes (list): Number of qubits of each register, in measurement order.
+
+        Returns:
+            float: The half width of the widest interval.
+        """
+        nshots = sum(frequencies.values())
+        return max(
+            wilson_half_width(count, nshots, self.z)
+            for marginal in marginal_frequencies(frequencies, sizes)
+            for count in marginal.values()
+        )
+
+    def next_shots(self, used: int, half_width: float, budget: int) -> int:
+        """Shots of the following round.
+
+        Args:
+            used (int): Shots executed so far.
+            half_width (float): Current half width of the widest interval.
+            budget (int): Maximum total number of shots.
+
+        Returns:
+            int: The shots of the following round, ``0`` if the execution is over.
+        """
+        if half_width <= self.precision or used >= budget:
+            return 0
+        needed = math.ceil(used * (half_width / self.precision) ** 2) - used
+        shots = min(
+            max(needed, self.initial_shots), math.ceil(used * (self.growth - 1))
+        )
+        return max(min(shots, budget - used), 1)
@@ -1,18 +1,114 @@
-import time
+import itertools
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-from braket.aws import AwsDevice
+import numpy as np
+from braket.aws import AwsDevice, AwsQuantumTask
+from braket.circuits.serialization import IRType
 from braket.devices import LocalSimulator
+from braket.ir.openqasm import Program as OpenQASMProgram
+from braket.tasks.local_quantum_task import LocalQuantumTask
 from qibo import Circuit as QiboCircuit
-from qibo.backends import NumpyBackend
 from qibo.config import raise_error
-from qibo.result import MeasurementOutcomes
 
-from qibo_cloud_backends.braket_translation import to_braket
+from qibo_cloud_backends.abstract import CloudBackend
+from qibo_cloud_backends.braket_translation import (
+    BraketTemplate,
+    native_operations,
+    supports,
+    template_key,
+    to_braket,
+    to_openqasm,
+)
+from qibo_cloud_backends.jobs import BraketJob
+from qibo_cloud_backends.polling import Poller, log_status
+from qibo_cloud_backends.pool import PROVIDERS
+from qibo_cloud_backends.timing import Timings
+from qibo_cloud_backends.utils import batched, sweep_values
 
+MAX_TEMPLATES = 128
+"""Maximum number of parametric templates kept by each backend."""
 
-class BraketClientBackend(NumpyBackend):
+BATCH_OPTIONS = ("max_parallel", "max_connections")
+"""Options of the devices' ``run_batch`` not accepted by ``run``."""
+
+_WORKER_DEVICE = None
+
+
+def _init_worker(device_name):
+    global _WORKER_DEVICE  # pylint: disable=global-statement
+    _WORKER_DEVICE = LocalSimulator(device_name)
+
+
+def _run_worker(source, shots, inputs, options):
+    program = OpenQASMProgram(source=source)
+    result = _WORKER_DEVICE.run(program, shots=shots, inputs=inputs, **options).result()
+    return np.asarray(result.measurements, dtype=np.uint8)
+
+
+def _openqasm_source(braket_circuit) -> str:
+    if isinstance(braket_circuit, OpenQASMProgram):
+        return braket_circuit.source
+    return braket_circuit.to_ir(IRType.OPENQASM).source
+
+
+class LocalPoolResult:
+    """Measurements of a circuit executed by the process pool of a
+    :class:`BraketClientBackend`, with the attributes of the Braket results read by
+    :class:`qibo_cloud_backends.jobs.BraketJob`."""
+
+    task_metadata = None
+
+    def __init__(self, measurements):
+        self.measurements = measurements
+
+    @property
+    def measurement_counts(self) -> Counter:
+        states, counts = np.unique(self.measurements, axis=0, return_counts=True)
+        return Counter(
+            {
+                "".join(map(str, state)): int(count)
+                for state, count in zip(states, counts)
+            }
+        )
+
+
+class LocalPoolTask:
+    """Handle of a circuit submitted to the process pool of a :class:`BraketClientBackend`,
+    exposing the interface of the Braket quantum tasks."""
+
+    _ids = itertools.count()
+
+    def __init__(self, future):
+        self.future = future
+        self.id = f"local-pool-{next(self._ids)}"
+
+    def state(self) -> str:
+        if self.future.cancelled():
+            return "CANCELLED"
+        if not self.future.done():
+            return "RUNNING"
+        return "FAILED" if self.future.exception() is not None else "COMPLETED"
+
+    def cancel(self):
+        self.future.cancel()
+
+    def result(self) -> LocalPoolResult:
+        return LocalPoolResult(self.future.result())
+
+
+class BraketClientBackend(CloudBackend):
     def __init__(
-        self, device=None, verbatim_circuit=False, verbosity=False, token: str = None
+        self,
+        device=None,
+        verbatim_circuit=False,
+        verbosity=False,
+        token: str = None,
+        poller: Poller = None,
+        parametric: bool = False,
+        optimize: bool = False,
+        openqasm: bool = False,
+        processes: int = None,
     ):
         """Backend for the remote execution of AWS circuits on the AWS backends.
 
@@ -28,56 +124,343 @@ class BraketClientBackend(NumpyBackend):
                           https://docs.aws.amazon.com/braket/latest/developerguide/braket-devices.html.
             verbatim_circuit (bool): If `True`, to_braket will wrap the Braket circuit in a verbatim box to run it on the QPU
                                      without any transpilation. Defaults to `False`.
-            verbosity (bool): If `True`, the status of the executed task will be displayed. Defaults to `False`.
+            verbosity (bool): If `True`, the status of the executed task will be logged. Defaults to `False`.
             token (str): This parameter is not required for executing circuits on Amazon Braket devices.
                          It is included for potential future compatibility but should be left as None.
+            poller (qibo_cloud_backends.polling.Poller): Polling strategy used while waiting for the tasks to complete.
+                                                         If `None`, an exponential backoff is used, logging the status
+                                                         of the task if `verbosity` is `True`. Defaults to `None`.
+            parametric (bool): If `True`, each circuit structure is translated only once into a
+                               :class:`qibo_cloud_backends.braket_translation.BraketTemplate`, whose trainable parameters
+                               are bound at every execution through the Braket inputs. Useful for variational loops,
+                               where only the parameters change between executions. Defaults to `False`.
+            optimize (bool): If `True`, the runs of adjacent single-qubit gates are simplified before the translation
+                             by :func:`qibo_cloud_backends.braket_translation.optimize_gates`, reducing the size of
+                             the submitted circuits. The runs are fused into the `U` gate only if the device supports
+                             it, and the number of removed gates is recorded in the `removed_gates` of the timings of
+                             the results. Never applied to verbatim circuits nor to parametric templates.
+                             Defaults to `False`.
+            openqasm (bool): If `True`, the circuits are emitted directly as OpenQASM 3 programs by
+                             :func:`qibo_cloud_backends.braket_translation.to_openqasm`, skipping the construction
+                             and serialization of the Braket circuits. Parametric templates are still submitted as
+                             Braket circuits. Defaults to `False`.
+            processes (int): Only for the local simulators. If given, the circuits are executed by a pool of
+                             this many worker processes, each holding its own LocalSimulator, which receive the
+                             circuits as OpenQASM 3 programs, together with the keyword arguments of the
+                             submissions. The pool is started at the first submission.
+                             If `None`, the circuits are executed by the device in the calling process.
+                             Defaults to `None`.
         """
 
         super().__init__()
 
         self.verbatim_circuit = verbatim_circuit
         self.verbosity = verbosity
+        self.parametric = parametric
+        self.optimize = optimize
+        self.openqasm = openqasm
+        self._templates = {}
+        if poller is None:
+            poller = Poller(callback=log_status if verbosity else None)
+        self.poller = poller
 
+        self.platform = device if device is not None else "local_simulator:default"
         if device is None:
             self.device = LocalSimulator("default")
         else:
             self.device = (
-                AwsDevice(device)
+                PROVIDERS.get(("braket-client", device), lambda: AwsDevice(device))
                 if device.split(":")[0] != "local_simulator"
                 else LocalSimulator(device.split(":")[1])
             )
         self.name = "aws"
+        shots_range = getattr(
+            getattr(self.device.properties, "service", None), "shotsRange", None
+        )
+        if shots_range is not None:
+            self.max_shots = shots_range[1]
+        self.native_operations = native_operations(self.device)
+
+        if processes is not None and not isinstance(self.device, LocalSimulator):
+            raise_error(
+                ValueError, "Process pools are only supported by the local simulators."
+            )
+        self.processes = processes
+        self._executor = None
+
+    def supports(self, circuit) -> bool:
+        return supports(circuit)
+
+    def queue_depth(self):
+        if isinstance(self.device, LocalSimulator):
+            return 0
+        tasks = self.device.queue_depth().quantum_tasks
+        # large queues are reported as lower bounds, e.g. ">4000"
+        return sum(int(str(depth).lstrip(">")) for depth in tasks.values())
+
+    def submit_circuit(self, circuit_qibo, nshots=1000, **kwargs):
+        """Submits a Qibo circuit to an AWS Braket device without waiting for its execution.
+
+        Args:
+            circuit (qibo.models.Circuit): circuit to execute on the Braket device.
+            nshots (int): Total number of shots. If it exceeds the shot limit of the device,
+                the execution is split in several tasks.
+            kwargs (dict): Additional keyword arguments passed to the device's `run()`
+                method.
+        Returns:
+            :class:`qibo_cloud_backends.jobs.BraketJob`: Handle of the submitted task.
+        """
+
+        if not circuit_qibo.measurements:
+            raise_error(RuntimeError, "No measurement found in the provided circuit.")
+        timings = Timings()
+        with timings.stage("translate"):
+            braket_circuit, inputs = self._translate(circuit_qibo, timings)
 
-    def execute_circuit(self, circuit_qibo, nshots=1000, **kwargs):
+        if self.processes is not None:
+            # the program is serialized once for all the parts of a split execution
+            braket_circuit = _openqasm_source(braket_circuit)
+
+        def submit(shots):
+            if self.processes is not None:
+                task = self._run_local(braket_circuit, shots, inputs, **kwargs)
+            else:
+                task = self.device.run(
+                    braket_circuit, shots=shots, inputs=inputs, **kwargs
+                )
+            return BraketJob(task, circuit_qibo, shots, self)
+
+        return self._split(circuit_qibo, nshots, submit, timings)
+
+    def attach(self, job_id, circuit, nshots):
+        """Builds the handle of a task submitted before, e.g. by another process.
+
+        Args:
+            job_id (str): The ARN of the task.
+            circuit (qibo.models.Circuit): The submitted circuit.
+            nshots (int): Number of shots of the task.
+        Returns:
+            :class:`qibo_cloud_backends.jobs.BraketJob`: Handle of the task.
+        """
+        if isinstance(self.device, LocalSimulator):
+            raise_error(
+                NotImplementedError,
+                "The tasks of the local simulator cannot be reattached.",
+            )
+        return BraketJob(AwsQuantumTask(job_id), circuit, nshots, self)
+
+    def template(self, circuit_qibo):
+        """Returns the parametric template of a Qibo circuit, translating it only if
+        no circuit with the same structure was translated before.
+
+        Args:
+            circuit (qibo.models.Circuit): circuit to translate.
+        Returns:
+            :class:`qibo_cloud_backends.braket_translation.BraketTemplate`: The parametric template.
+        """
+        key = template_key(circuit_qibo)
+        template = self._templates.pop(key, None)
+        if template is None:
+            template = BraketTemplate(circuit_qibo, self.verbatim_circuit)
+            if len(self._templates) >= MAX_TEMPLATES:
+                del self._templates[next(iter(self._templates))]
+        # reinsert to keep the least recently used template first
+        self._templates[key] = template
+        return template
+
+    def _translate(self, circuit_qibo, timings=None):
+        if self.parametric:
+            template = self.template(circuit_qibo)
+            return template.circuit, template.inputs(circuit_qibo)
+        options = {
+            "optimize": self.optimize,
+            "native": self.native_operations,
+            "timings": timings,
+        }
+        if self.openqasm or self.processes is not None:
+            source = to_openqasm(circuit_qibo, self.verbatim_circuit, **options)
+            return OpenQASMProgram(source=source), {}
+        return to_braket(circuit_qibo, self.verbatim_circuit, **options), {}
+
+    def execute_circuit(self, circuit_qibo, nshots=1000, adaptive=None, **kwargs):
         """Executes a Qibo circuit on an AWS Braket device. The device defaults to the LocalSimulator().
 
         Args:
             circuit (qibo.models.Circuit): circuit to execute on the Braket device.
             nshots (int): Total number of shots.
+            adaptive (:class:`qibo_cloud_backends.adaptive.AdaptiveShots`): If given, the
+                shots are executed in increments until the outcome probabilities reach the
+                target precision, ``nshots`` being the shot budget. Defaults to ``None``.
         Returns:
             Measurement outcomes (qibo.measurement.MeasurementOutcomes): The outcome of the circuit execution.
         """
 
-        measurements = circuit_qibo.measurements
-        if not measurements:
-            raise_error(RuntimeError, "No measurement found in the provided circuit.")
-        braket_circuit = to_braket(circuit_qibo, self.verbatim_circuit)
+        return self._execute(
+            circuit_qibo,
+            nshots,
+            lambda shots: self.submit_circuit(circuit_qibo, shots, **kwargs),
+            adaptive,
+            verbatim_circuit=self.verbatim_circuit,
+            **kwargs,
+        )
+
+    def submit_circuits(self, circuits, nshots=1000, batch_size=None, **kwargs):
+        """Submits a list of Qibo circuits as Braket batches of quantum tasks, without waiting
+        for their execution.
+
+        Args:
+            circuits (list): List of :class:`qibo.models.Circuit` to execute on the Braket device.
+            nshots (int): Total number of shots for each circuit. If it exceeds the shot limit
+                of the device, each circuit is submitted separately, split in several tasks.
+            batch_size (int): Maximum number of circuits submitted in a single batch.
+                If ``None``, all the circuits are submitted together. Defaults to ``None``.
+            kwargs (dict): Additional keyword arguments passed to the device's `run_batch()`
+                method, e.g. ``max_parallel``.
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.BraketJob` handles, in input order.
+        """
+        for circuit in circuits:
+            if not circuit.measurements:
+                raise_error(
+                    RuntimeError, "No measurement found in the provided circuit."
+                )
+        if self._exceeds_max_shots(nshots):
+            # the circuits are split in single tasks, which run with the same options
+            options = {
+                key: value for key, value in kwargs.items() if key not in BATCH_OPTIONS
+            }
+            return [
+                self.submit_circuit(circuit, nshots, **options) for circuit in circuits
+            ]
 
-        task = self.device.run(braket_circuit, shots=nshots, **kwargs)
+        jobs = []
+        for chunk in batched(circuits, batch_size):
+            braket_circuits, inputs = zip(
+                *(self._translate(circuit) for circuit in chunk)
+            )
+            jobs += self._run_batch(chunk, braket_circuits, inputs, nshots, **kwargs)
+        return jobs
 
-        while self.verbosity:
-            status = task.state()
-            print(f"> Status {status}", end=" ", flush=True)
-            if status == "COMPLETED":
-                print("\n")
-                break
-            for _ in range(3):
-                time.sleep(1)
-                print(".", end=" ", flush=True)
-            print("\r" + " " * 30, end="\r")
+    def _run_local(self, source, shots, inputs, **kwargs):
+        """Submits the source of an OpenQASM 3 program to the process pool, forwarding
+        the keyword arguments to the `run()` method of the workers' devices."""
+        if self._executor is None:
+            name = self.platform.split(":")[1]
+            self._executor = ProcessPoolExecutor(
+                self.processes, initializer=_init_worker, initargs=(name,)
+            )
+        return LocalPoolTask(
+            self._executor.submit(_run_worker, source, shots, inputs, kwargs)
+        )
 
-        samples = task.result().measurements
+    def close(self):
+        """Shuts down the process pool of the local simulator, if started."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
 
-        return MeasurementOutcomes(
-            measurements=measurements, backend=self, samples=samples, nshots=nshots
+    def _run_batch(self, circuits, braket_circuits, inputs, nshots, **kwargs):
+        # each circuit of the batch is a separate task
+        return self._limited(
+            lambda: self._submit_batch(
+                circuits, braket_circuits, inputs, nshots, **kwargs
+            ),
+            len(circuits),
         )
+
+    def _submit_batch(self, circuits, braket_circuits, inputs, nshots, **kwargs):
+        if self.processes is not None:
+            options = {
+                key: value for key, value in kwargs.items() if key not in BATCH_OPTIONS
+            }
+            # the parameter sets of a sweep share the same template, serialized once
+            sources = {}
+            for braket_circuit in braket_circuits:
+                if id(braket_circuit) not in sources:
+                    sources[id(braket_circuit)] = _openqasm_source(braket_circuit)
+            return [
+                BraketJob(
+                    self._run_local(
+                        sources[id(braket_circuit)], nshots, values, **options
+                    ),
+                    circuit,
+                    nshots,
+                    self,
+                )
+                for circuit, braket_circuit, values in zip(
+                    circuits, braket_circuits, inputs
+                )
+            ]
+        batch = self.device.run_batch(
+            list(braket_circuits), shots=nshots, inputs=list(inputs), **kwargs
+        )
+        # local batches are executed on creation and only expose their results
+        tasks = getattr(batch, "tasks", None)
+        if tasks is None:
+            tasks = [LocalQuantumTask(result) for result in batch.results()]
+        return [
+            BraketJob(task, circuit, nshots, self)
+            for circuit, task in zip(circuits, tasks)
+        ]
+
+    def submit_sweep(
+        self, circuit, parameter_values, nshots=1000, batch_size=None, **kwargs
+    ):
+        """Submits a parametric Qibo circuit with several sets of parameters as Braket batches,
+        translating the circuit only once into a :class:`qibo_cloud_backends.braket_translation.BraketTemplate`
+        and binding each parameter set through the Braket inputs.
+
+        Args:
+            circuit (qibo.models.Circuit): The parametric circuit.
+            parameter_values (ndarray): The ``(n_sets, n_parameters)`` parameter values, listing the
+                parameters of the trainable gates in the order of :meth:`qibo.models.Circuit.get_parameters`.
+            nshots (int): Total number of shots for each parameter set.
+            batch_size (int): Maximum number of parameter sets submitted in a single batch.
+                If ``None``, all the parameter sets are submitted together. Defaults to ``None``.
+            kwargs (dict): Additional keyword arguments passed to the device's `run_batch()` method.
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.BraketJob` handles, one per parameter set.
+        """
+        if not circuit.measurements:
+            raise_error(RuntimeError, "No measurement found in the provided circuit.")
+        values = sweep_values(circuit, parameter_values)
+        if self._exceeds_max_shots(nshots):
+            return super().submit_sweep(
+                circuit, values, nshots, batch_size=batch_size, **kwargs
+            )
+
+        template = self.template(circuit)
+        jobs = []
+        for chunk in batched(values, batch_size):
+            jobs += self._run_batch(
+                [circuit] * len(chunk),
+                [template.circuit] * len(chunk),
+                [template.inputs(row) for row in chunk],
+                nshots,
+                **kwargs,
+            )
+        return jobs
+
+    def execute_circuits(
+        self, circuits, initial_states=None, nshots=1000, batch_size=None, **kwargs
+    ):
+        """Executes a list of Qibo circuits as a Braket batch of quantum tasks.
+
+        Args:
+            circuits (list): List of :class:`qibo.models.Circuit` to execute on the Braket device.
+            initial_states (list): Not supported, must be ``None``.
+            nshots (int): Total number of shots for each circuit.
+            batch_size (int): Maximum number of circuits submitted in a single batch.
+                If ``None``, all the circuits are submitted together. Defaults to ``None``.
+            kwargs (dict): Additional keyword arguments passed to the device's `run_batch()`
+                method, e.g. ``max_parallel``.
+        Returns:
+            list: The :class:`qibo.result.MeasurementOutcomes` of each circuit, in input order.
+        """
+        if initial_states is not None:
+            raise_error(
+                NotImplementedError,
+                "The use of an `initial_state` is not supported yet.",
+            )
+        jobs = self.submit_circuits(circuits, nshots, batch_size, **kwargs)
+        return [job.result() for job in jobs]
@@ -1,22 +1,103 @@
 from functools import singledispatch
 
+import numpy as np
 from braket.circuits import Circuit as BraketCircuit
-from braket.circuits import Instruction
+from braket.circuits import FreeParameter, Instruction
 from braket.circuits import gates as braket_gates
 from qibo import Circuit as QiboCircuit
 from qibo import gates as qibo_gates
+from qibo.backends import NumpyBackend
+from qibo.config import log, raise_error
 
+from qibo_cloud_backends.utils import is_free
 
-def to_braket(qibo_circuit: QiboCircuit, verbatim_circuit: bool) -> BraketCircuit:
+_BACKEND = NumpyBackend()
+
+
+def to_braket(
+    qibo_circuit: QiboCircuit,
+    verbatim_circuit: bool,
+    optimize: bool = False,
+    native=None,
+    timings=None,
+) -> BraketCircuit:
     circuit = BraketCircuit()
+    queue = _queue(qibo_circuit, verbatim_circuit, optimize, native, timings)
 
     # Add gates
-    for gate in qibo_circuit.queue:
-        if isinstance(gate, qibo_gates.M):
-            continue
-
+    for gate in queue:
         circuit.add_instruction(Instruction(_translate_op(gate), gate.qubits))
 
+    return _finalize(circuit, qibo_circuit, verbatim_circuit)
+
+
+def to_openqasm(
+    qibo_circuit: QiboCircuit,
+    verbatim_circuit: bool,
+    optimize: bool = False,
+    native=None,
+    timings=None,
+) -> str:
+    """Translates a Qibo circuit directly to the OpenQASM 3 program submitted to
+    Amazon Braket, without building the intermediate :class:`braket.circuits.Circuit`.
+
+    The program is the same produced by the serialization of :func:`to_braket`.
+
+    Args:
+        qibo_circuit (qibo.models.Circuit): The circuit to translate.
+        verbatim_circuit (bool): If `True`, the gates are wrapped in a verbatim box,
+            acting on the physical qubits.
+        optimize (bool): If `True`, the gates are simplified by :func:`optimize_gates`
+            first, unless `verbatim_circuit` is `True`. Defaults to `False`.
+        native (set): The operations supported by the device, passed to
+            :func:`optimize_gates`. Defaults to `None`.
+        timings (:class:`qibo_cloud_backends.timing.Timings`): If given, the number of
+            gates removed by the optimization is recorded in its ``removed_gates``.
+            Defaults to `None`.
+
+    Returns:
+        str: The source of the OpenQASM 3 program.
+    """
+    queue = _queue(qibo_circuit, verbatim_circuit, optimize, native, timings)
+    measured = [
+        qubit for qubits in qibo_circuit.measurement_tuples.values() for qubit in qubits
+    ]
+
+    def target(qubit):
+        return f"${qubit}" if verbatim_circuit else f"q[{qubit}]"
+
+    lines = ["OPENQASM 3.0;", f"bit[{len(measured)}] b;"]
+    if not verbatim_circuit:
+        nqubits = max((q for gate in queue for q in gate.qubits), default=-1)
+        nqubits = max([nqubits + 1] + [qubit + 1 for qubit in measured])
+        lines.append(f"qubit[{nqubits}] q;")
+    else:
+        lines += ["#pragma braket verbatim", "box{"]
+    for gate in queue:
+        targets = ", ".join(target(qubit) for qubit in gate.qubits)
+        lines.append(_openqasm_op(gate, targets))
+    if verbatim_circuit:
+        lines.append("}")
+    for bit, qubit in enumerate(measured):
+        lines.append(f"b[{bit}] = measure {target(qubit)};")
+    return "\n".join(lines)
+
+
+def _queue(qibo_circuit, verbatim_circuit, optimize, native, timings):
+    queue = [gate for gate in qibo_circuit.queue if not isinstance(gate, qibo_gates.M)]
+    # Simplify the single-qubit gates, unless the gates must be executed as written
+    if not optimize or verbatim_circuit:
+        return queue
+    optimized = optimize_gates(queue, native)
+    log.debug(f"Peephole optimization reduced {len(queue)} gates to {len(optimized)}.")
+    if timings is not None:
+        timings.removed_gates = len(queue) - len(optimized)
+    return optimized
+
+
+def _finalize(
+    circuit: BraketCircuit, qibo_circuit: QiboCircuit, verbatim_circuit: bool
+) -> BraketCircuit:
     # Add verbatim box
     if verbatim_circuit:
         circuit = BraketCircuit().add_verbatim_box(circuit)
@@ -28,11 +109,315 @@ def to_braket(qibo_circuit: QiboCircuit, verbatim_circuit: bool) -> BraketCircui
     return circuit
 
 
+_INVERSES = {
+    qibo_gates.H: qibo_gates.H,
+    qibo_gates.X: qibo_gates.X,
+    qibo_gates.Y: qibo_gates.Y,
+    qibo_gates.Z: qibo_gates.Z,
+    qibo_gates.S: qibo_gates.SDG,
+    qibo_gates.SDG: qibo_gates.S,
+    qibo_gates.T: qibo_gates.TDG,
+    qibo_gates.TDG: qibo_gates.T,
+    qibo_gates.SX: qibo_gates.SXDG,
+    qibo_gates.SXDG: qibo_gates.SX,
+}
+_ROTATIONS = (qibo_gates.RX, qibo_gates.RY, qibo_gates.RZ)
+_ATOL = 1e-10
+
+
+def native_operations(device):
+    """Returns the names of the OpenQASM operations supported by a Braket device,
+    in lower case, or ``None`` if the device does not advertise them."""
+    action = getattr(getattr(device, "properties", None), "action", {}) or {}
+    program = action.get("braket.ir.openqasm.program")
+    operations = getattr(program, "supportedOperations", None)
+    if operations is None:
+        return None
+    return {operation.lower() for operation in operations}
+
+
+def optimize_gates(queue: list, native=None) -> list:
+    """Peephole optimization of the runs of adjacent single-qubit gates of a circuit.
+
+    In every run of single-qubit gates acting on the same qubit, between two
+    multi-qubit gates, the identities are dropped, the pairs of inverse gates,
+    e.g. ``H·H`` or ``S·SDG``, are cancelled and consecutive rotations about the
+    same axis are merged. The gates left in the run are then fused into a single
+    :class:`qibo.gates.U3`, or dropped if their product is the identity. On devices
+    without the ``U`` operation, the product is decomposed in ``RZ·RY·RZ``, or
+    ``RZ·RX·RZ``, instead, and only when shorter than the run. The
+    simplifications hold up to a global phase, which does not change the
+    measured samples. The gates of the queue are never modified.
+
+    Args:
+        queue (list): The gates of the circuit, without the measurements.
+        native (set): The lower case names of the operations supported by the device,
+            as returned by :func:`native_operations`. If ``None``, the ``U`` operation is
+            assumed to be supported. Defaults to ``None``.
+
+    Returns:
+        list: The optimized gates.
+    """
+    optimized, runs = [], {}
+
+    def flush(qubit):
+        optimized.extend(_simplify(runs.pop(qubit, []), native))
+
+    for gate in queue:
+        if len(gate.qubits) == 1 and gate.__class__ in _translate_op.registry:
+            runs.setdefault(gate.qubits[0], []).append(gate)
+            continue
+        for qubit in gate.qubits:
+            flush(qubit)
+        optimized.append(gate)
+    for qubit in sorted(runs):
+        flush(qubit)
+    return optimized
+
+
+def _simplify(run: list, native=None) -> list:
+    stack = []
+    for gate in run:
+        if isinstance(gate, qibo_gates.I):
+            continue
+        last = stack[-1] if stack else None
+        if last is not None and _INVERSES.get(last.__class__) is gate.__class__:
+            stack.pop()
+        elif (
+            last is not None
+            and gate.__class__ in _ROTATIONS
+            and last.__class__ is gate.__class__
+        ):
+            stack.pop()
+            theta = last.parameters[0] + gate.parameters[0]
+            if not _is_identity(gate.__class__(0, theta).matrix(_BACKEND)):
+                stack.append(gate.__class__(gate.qubits[0], theta, trainable=False))
+        else:
+            stack.append(gate)
+    if len(stack) < 2:
+        return stack
+
+    matrix = np.eye(2, dtype=complex)
+    for gate in stack:
+        matrix = gate.matrix(_BACKEND) @ matrix
+    if _is_identity(matrix):
+        return []
+    qubit = stack[0].qubits[0]
+    theta, phi, lam = _u3_parameters(matrix)
+    if native is None or "u" in native:
+        return [qibo_gates.U3(qubit, theta, phi, lam, trainable=False)]
+    # U3(theta, phi, lam) = RZ(phi) RY(theta) RZ(lam), up to a global phase
+    if {"rz", "ry"} <= native:
+        rotations = [(qibo_gates.RZ, lam), (qibo_gates.RY, theta), (qibo_gates.RZ, phi)]
+    elif {"rz", "rx"} <= native:
+        # RY(theta) = RZ(pi/2) RX(theta) RZ(-pi/2)
+        rotations = [
+            (qibo_gates.RZ, lam - np.pi / 2),
+            (qibo_gates.RX, theta),
+            (qibo_gates.RZ, phi + np.pi / 2),
+        ]
+    else:
+        return stack
+    decomposed = [
+        gate(qubit, angle, trainable=False)
+        for gate, angle in rotations
+        if not _is_identity(gate(qubit, angle).matrix(_BACKEND))
+    ]
+    return decomposed if len(decomposed) < len(stack) else stack
+
+
+def _is_identity(matrix) -> bool:
+    """Checks whether a single-qubit matrix is the identity, up to a global phase."""
+    return abs(matrix[0, 1]) < _ATOL and abs(matrix[0, 0] - matrix[1, 1]) < _ATOL
+
+
+def _u3_parameters(matrix) -> tuple:
+    """Angles of the :class:`qibo.gates.U3` equal to a single-qubit unitary, up to a
+    global phase."""
+    matrix = matrix / np.sqrt(np.linalg.det(matrix))
+    theta = 2 * np.arctan2(abs(matrix[1, 0]), abs(matrix[0, 0]))
+    phase_sum = -2 * np.angle(matrix[0, 0])
+    phase_diff = 2 * np.angle(matrix[1, 0])
+    return theta, (phase_sum + phase_diff) / 2, (phase_sum - phase_diff) / 2
+
+
+def template_key(qibo_circuit: QiboCircuit) -> tuple:
+    """Hashable description of the structure of a circuit, which does not depend
+    on the parameters of the gates that are free in a :class:`BraketTemplate`."""
+    key = [qibo_circuit.nqubits]
+    for gate in qibo_circuit.queue:
+        if is_free(gate):
+            key.append((gate.__class__, gate.qubits))
+        else:
+            parameters = tuple(
+                np.asarray(p).tobytes() if isinstance(p, np.ndarray) else p
+                for p in gate.parameters
+            )
+            key.append((gate.__class__, gate.qubits, parameters))
+    key.append(tuple(qibo_circuit.measurement_tuples.items()))
+    return tuple(key)
+
+
+class BraketTemplate:
+    """Parametric Braket circuit, translated only once out of a Qibo circuit.
+
+    The parameters of the trainable gates of the Qibo circuit are replaced by
+    :class:`braket.circuits.FreeParameter` placeholders named ``p0, p1, ...``,
+    following the order of :meth:`qibo.models.Circuit.get_parameters`. Trainable
+    :class:`qibo.gates.Unitary` gates are the only exception, and are translated
+    with their current matrix. The same template can then be executed with
+    different parameter values, bound through the Braket ``inputs``.
+
+    Args:
+        qibo_circuit (qibo.models.Circuit): The circuit to translate.
+        verbatim_circuit (bool): If `True`, the template is wrapped in a verbatim box.
+    """
+
+    def __init__(self, qibo_circuit: QiboCircuit, verbatim_circuit: bool):
+        circuit = BraketCircuit()
+        names = []
+        for gate in qibo_circuit.queue:
+            if isinstance(gate, qibo_gates.M):
+                continue
+            if is_free(gate):
+                symbols = [
+                    FreeParameter(f"p{len(names) + i}")
+                    for i in range(len(gate.parameters))
+                ]
+                names += [symbol.name for symbol in symbols]
+                operator = _translate_op(gate, symbols)
+            else:
+                operator = _translate_op(gate)
+            circuit.add_instruction(Instruction(operator, gate.qubits))
+
+        self.circuit = _finalize(circuit, qibo_circuit, verbatim_circuit)
+        self.parameter_names = names
+
+    @staticmethod
+    def parameters(qibo_circuit: QiboCircuit) -> list:
+        """Flat list of the values of the free parameters of a circuit."""
+        return [
+            float(value)
+            for gate in qibo_circuit.queue
+            if is_free(gate)
+            for value in gate.parameters
+        ]
+
+    def inputs(self, values) -> dict:
+        """Binds the parameter values to the free parameters of the template.
+
+        Args:
+            values (list): Flat list of the parameter values, or the
+                :class:`qibo.models.Circuit` to read them from.
+
+        Returns:
+            dict: The inputs to pass to the Braket device.
+        """
+        if isinstance(values, QiboCircuit):
+            values = self.parameters(values)
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) != len(self.parameter_names):
+            raise_error(
+                ValueError,
+                f"The template has {len(self.parameter_names)} free parameters, "
+                + f"but {len(values)} values were given.",
+            )
+        return dict(zip(self.parameter_names, values.tolist()))
+
+
+def supports(qibo_circuit: QiboCircuit) -> bool:
+    """Checks whether all the gates of a Qibo circuit can be translated to Amazon Braket.
+
+    Args:
+        qibo_circuit (qibo.models.Circuit): The circuit to check.
+
+    Returns:
+        bool: ``True`` if the circuit can be translated.
+    """
+    unsupported = _translate_op.dispatch(object)
+    return all(
+        isinstance(gate, qibo_gates.M)
+        or _translate_op.dispatch(type(gate)) is not unsupported
+        for gate in qibo_circuit.queue
+    )
+
+
+_OPENQASM_GATES = {
+    qibo_gates.I: "i",
+    qibo_gates.H: "h",
+    qibo_gates.X: "x",
+    qibo_gates.Y: "y",
+    qibo_gates.Z: "z",
+    qibo_gates.S: "s",
+    qibo_gates.SDG: "si",
+    qibo_gates.T: "t",
+    qibo_gates.TDG: "ti",
+    qibo_gates.SX: "v",
+    qibo_gates.SXDG: "vi",
+    qibo_gates.CNOT: "cnot",
+    qibo_gates.CY: "cy",
+    qibo_gates.CZ: "cz",
+    qibo_gates.CSX: "cv",
+    qibo_gates.SWAP: "swap",
+    qibo_gates.iSWAP: "iswap",
+    qibo_gates.ECR: "ecr",
+    qibo_gates.TOFFOLI: "ccnot",
+    qibo_gates.RX: "rx",
+    qibo_gates.RY: "ry",
+    qibo_gates.RZ: "rz",
+    qibo_gates.RXX: "xx",
+    qibo_gates.RYY: "yy",
+    qibo_gates.RZZ: "zz",
+    qibo_gates.RXXYY: "xy",
+    qibo_gates.GPI: "gpi",
+    qibo_gates.GPI2: "gpi2",
+    qibo_gates.PRX: "prx",
+    qibo_gates.MS: "ms",
+    qibo_gates.U3: "U",
+}
+
+
+def _openqasm_op(gate, targets: str) -> str:
+    """OpenQASM 3 statement of a gate, following the Braket gate names of
+    :func:`_translate_op`."""
+    if isinstance(gate, qibo_gates.Unitary):
+        rows = ", ".join(
+            "[" + ", ".join(_format_complex(complex(value)) for value in row) + "]"
+            for row in np.asarray(gate.matrix(_BACKEND))
+        )
+        return f"#pragma braket unitary([{rows}]) {targets}"
+    name = _OPENQASM_GATES.get(gate.__class__)
+    if name is None:
+        raise_error(NotImplementedError, f"Amazon Braket does not support gate {gate}")
+    parameters = [float(value) for value in gate.parameters]
+    if isinstance(gate, qibo_gates.RXXYY):
+        parameters = [-parameters[0]]
+    if parameters:
+        name += f"({', '.join(repr(value) for value in parameters)})"
+    return f"{name} {targets};"
+
+
+def _format_complex(number: complex) -> str:
+    # same format of the unitary pragma of the Braket SDK
+    if number.real:
+        if not number.imag:
+            return f"{number.real}"
+        sign = "+" if number.imag > 0 else "-"
+        return f"{number.real} {sign} {abs(number.imag)}im"
+    if number.imag:
+        return f"{number.imag}im"
+    return "0"
+
+
 @singledispatch
-def _translate_op(g):
+def _translate_op(g, parameters=None):
     raise NotImplementedError(f"Amazon Braket does not support gate {g}")
 
 
+def _parameters(g, parameters):
+    return g.parameters if parameters is None else parameters
+
+
 @_translate_op.register
 def _(_: qibo_gates.I):
     return braket_gates.I()
@@ -129,65 +514,65 @@ def _(_: qibo_gates.TOFFOLI):
 
 
 @_translate_op.register
-def _(g: qibo_gates.RX):
-    return braket_gates.Rx(g.parameters[0])
+def _(g: qibo_gates.RX, parameters=None):
+    return braket_gates.Rx(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.RY):
-    return braket_gates.Ry(g.parameters[0])
+def _(g: qibo_gates.RY, parameters=None):
+    return braket_gates.Ry(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.RZ):
-    return braket_gates.Rz(g.parameters[0])
+def _(g: qibo_gates.RZ, parameters=None):
+    return braket_gates.Rz(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.RXX):
-    return braket_gates.XX(g.parameters[0])
+def _(g: qibo_gates.RXX, parameters=None):
+    return braket_gates.XX(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.RYY):
-    return braket_gates.YY(g.parameters[0])
+def _(g: qibo_gates.RYY, parameters=None):
+    return braket_gates.YY(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.RZZ):
-    return braket_gates.ZZ(g.parameters[0])
+def _(g: qibo_gates.RZZ, parameters=None):
+    return braket_gates.ZZ(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.RXXYY):
-    return braket_gates.XY(-g.parameters[0])
+def _(g: qibo_gates.RXXYY, parameters=None):
+    return braket_gates.XY(-_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.GPI):
-    return braket_gates.GPi(g.parameters[0])
+def _(g: qibo_gates.GPI, parameters=None):
+    return braket_gates.GPi(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.GPI2):
-    return braket_gates.GPi2(g.parameters[0])
+def _(g: qibo_gates.GPI2, parameters=None):
+    return braket_gates.GPi2(_parameters(g, parameters)[0])
 
 
 @_translate_op.register
-def _(g: qibo_gates.PRX):
-    parameters = g.parameters
+def _(g: qibo_gates.PRX, parameters=None):
+    parameters = _parameters(g, parameters)
     return braket_gates.PRx(parameters[0], parameters[1])
 
 
 @_translate_op.register
-def _(g: qibo_gates.MS):
-    parameters = g.parameters
+def _(g: qibo_gates.MS, parameters=None):
+    parameters = _parameters(g, parameters)
     return braket_gates.MS(parameters[0], parameters[1], parameters[2])
 
 
 @_translate_op.register
-def _(g: qibo_gates.U3):
-    parameters = g.parameters
+def _(g: qibo_gates.U3, parameters=None):
+    parameters = _parameters(g, parameters)
     return braket_gates.U(parameters[0], parameters[1], parameters[2])
 
 
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from qibo.config import raise_error
+
+DEFAULT_DIRECTORY = Path.home() / ".cache" / "qibo_cloud_backends"
+
+STALE_TEMPORARY = 3600.0
+"""Seconds after which the temporary files left by interrupted writes are removed."""
+
+
+def _encode(value):
+    if isinstance(value, np.ndarray):
+        return {"real": value.real.tolist(), "imag": value.imag.tolist()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return repr(value)
+
+
+def fingerprint(circuit, nshots: int, platform: str, **kwargs) -> str:
+    """Computes the canonical hash identifying a circuit execution.
+
+    Args:
+        circuit (:class:`qibo.models.Circuit`): The executed circuit.
+        nshots (int): Total number of shots.
+        platform (str): Identifier of the device or platform executing the circuit.
+        kwargs (dict): Additional options affecting the execution.
+
+    Returns:
+        str: The SHA-256 hex digest of the execution.
+    """
+    raw = circuit.raw
+    queue = [
+        {key: value for key, value in gate.items() if key != "measurement_result"}
+        for gate in raw["queue"]
+    ]
+    payload = {
+        "queue": queue,
+        "nqubits": raw["nqubits"],
+        "density_matrix": raw["density_matrix"],
+        "nshots": nshots,
+        "platform": platform,
+        "kwargs": kwargs,
+    }
+    serialized = json.dumps(payload, sort_keys=True, default=_encode)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class ResultCache:
+    """Persistent, content-addressed cache of the samples of circuit executions.
+
+    Samples are stored on disk as bit-packed ``uint8`` arrays, one file per
+    execution, named after the :func:`qibo_cloud_backends.cache.fingerprint`
+    of the execution. When the total size of the cache exceeds ``max_size``,
+    the least recently used entries are evicted.
+
+    The size of the cache is scanned from the directory at the first write, and then
+    tracked as the entries are written, so that the directory is scanned again only
+    when the size exceeds ``max_size``. The entries written by other processes sharing
+    the directory are counted at the next scan.
+
+    Args:
+        directory (str): Folder where the results are stored. Defaults to
+            ``~/.cache/qibo_cloud_backends``.
+        max_size (int): Maximum size of the cache, in bytes. Defaults to 1 GiB.
+        ttl (float): Time to live of the entries, in seconds. If ``None``, entries
+            never expire. Defaults to ``None``.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_size: int = 2**30,
+        ttl: Optional[float] = None,
+    ):
+        if max_size <= 0:
+            raise_error(ValueError, f"Cache size must be positive, got {max_size}.")
+        self.directory = Path(DEFAULT_DIRECTORY if directory is None else directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.ttl = ttl
+        self._size = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str):
+        """Retrieves the samples of an execution.
+
+        Args:
+            key (str): Fingerprint of the execution.
+
+        Returns:
+            ndarray: The ``(nshots, n_measured_qubits)`` binary samples, or ``None``
+            if the execution is not cached or expired.
+        """
+        entry = self.get_packed(key)
+        if entry is None:
+            return None
+        packed, nbits = entry
+        return np.unpackbits(packed, axis=1, count=nbits).astype(np.int64)
+
+    def get_packed(self, key: str):
+        """Retrieves the samples of an execution, without unpacking them.
+
+        Args:
+            key (str): Fingerprint of the execution.
+
+        Returns:
+            (ndarray, int): The bit-packed samples, in the :func:`numpy.packbits` layout,
+            and the number of measured bits, or ``None`` if the execution is not cached
+            or expired.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as entry:
+                created = float(entry["created"])
+                packed = entry["packed"]
+                nbits = int(entry["nbits"])
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+        if self.ttl is not None and time.time() - created > self.ttl:
+            self._remove(path)
+            return None
+        # the modification time tracks the last access, for the LRU eviction
+        os.utime(path)
+        return packed, nbits
+
+    def put(self, key: str, samples):
+        """Stores the samples of an execution.
+
+        Args:
+            key (str): Fingerprint of the execution.
+            samples (ndarray): The ``(nshots, n_measured_qubits)`` binary samples.
+        """
+        samples = np.asarray(samples, dtype=np.uint8)
+        self.put_packed(key, np.packbits(samples, axis=1), samples.shape[1])
+
+    def put_packed(self, key: str, packed, nbits: int):
+        """Stores the bit-packed samples of an execution.
+
+        Args:
+            key (str): Fingerprint of the execution.
+            packed (ndarray): The samples, in the :func:`numpy.packbits` layout.
+            nbits (int): Number of measured bits.
+        """
+        path = self._path(key)
+        file = tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        )
+        try:
+            with file:
+                np.savez(file, packed=packed, nbits=nbits, created=time.time())
+            replaced = _size(path)
+            os.replace(file.name, path)
+        except BaseException:
+            Path(file.name).unlink(missing_ok=True)
+            raise
+        if self._size is None:
+            self._evict()
+            return
+        self._size += _size(path) - replaced
+        if self._size > self.max_size:
+            self._evict()
+
+    def _remove(self, path: Path):
+        size = _size(path)
+        path.unlink(missing_ok=True)
+        if self._size is not None:
+            self._size -= size
+
+    def _evict(self):
+        now = time.time()
+        for path in self.directory.glob("*.tmp"):
+            try:
+                if now - path.stat().st_mtime > STALE_TEMPORARY:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:  # pragma: no cover
+                continue
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # pragma: no cover
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries, key=lambda entry: entry[0]):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def clear(self):
+        """Removes all the entries of the cache."""
+        for path in self.directory.glob("*.npz"):
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
@@ -0,0 +1,356 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from qibo.config import log, raise_error
+
+from qibo_cloud_backends.abstract import CloudBackend
+
+DEFAULT_SMOOTHING = 0.3
+MAX_DECISIONS = 10000
+"""Maximum number of routing decisions kept by a dispatcher."""
+
+
+@dataclass
+class RouteStats:
+    """Load and performance observed on a backend by the dispatcher.
+
+    Args:
+        in_flight (int): Number of executions currently running.
+        queue_depth (int): Last number of jobs queued on the device, as reported by the
+            provider, or ``None`` if not reported.
+        latency (float): Exponential moving average of the execution time, in seconds,
+            or ``None`` if no execution completed yet.
+        completed (int): Number of completed executions.
+        failures (int): Number of failed executions.
+        consecutive_failures (int): Number of failed executions since the last success.
+    """
+
+    in_flight: int = 0
+    queue_depth: Optional[int] = None
+    latency: Optional[float] = None
+    completed: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    refreshed: float = field(default=float("-inf"), repr=False)
+
+    def score(self) -> tuple:
+        """Sorting key of the backend, lower is better: failing backends come last,
+        then the expected waiting time of a new execution decides, then the load."""
+        waiting = self.in_flight + (self.queue_depth or 0) + 1
+        return (self.consecutive_failures, waiting * (self.latency or 0.0), waiting)
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    """Record of the routing of a circuit execution.
+
+    Args:
+        route (str): The backend which executed the circuit, or ``None`` if all failed.
+        candidates (list): The compatible backends, ordered by preference.
+        failures (list): The ``(route, error)`` pairs of the failed attempts.
+        elapsed (float): Duration of the execution, failovers included, in seconds.
+    """
+
+    route: Optional[str]
+    candidates: List[str]
+    failures: List[tuple]
+    elapsed: float
+
+
+def _route(backend) -> str:
+    return f"{backend.name}:{backend.platform}"
+
+
+class DispatcherBackend(CloudBackend):
+    """Backend routing each circuit execution to the least loaded of a set of backends.
+
+    The backends are ranked by the expected waiting time of a new execution, i.e.
+    the number of jobs queued on the device and submitted by the dispatcher, times
+    the average execution time observed. Backends which never completed an execution
+    are preferred, so that all of them are measured, while backends whose last
+    execution failed come last. Backends unable to translate the gates of the circuit
+    are skipped, and when an execution fails, the next backend is tried.
+    The same holds for :meth:`execute_sweep` and :meth:`expectation_from_counts`, while
+    the ``submit_*`` methods, hence :meth:`as_completed`, hand the jobs to the best
+    ranked backend without failover.
+
+    Every execution is recorded as a :class:`qibo_cloud_backends.dispatcher.RoutingDecision`
+    in the ``decisions`` attribute, and the load observed on each backend is available in
+    the ``stats`` attribute.
+
+    Args:
+        backends (list): The loaded :class:`qibo_cloud_backends.abstract.CloudBackend`
+            instances to dispatch to, in order of preference for equal scores.
+        refresh (float): Minimum number of seconds between two queue depth requests to the
+            same provider. Defaults to ``30``.
+        max_workers (int): Maximum number of circuits of a batch executed at the same time.
+            Defaults to ``16``.
+    """
+
+    def __init__(self, backends, refresh: float = 30.0, max_workers: int = 16):
+        super().__init__()
+        if not backends:
+            raise_error(ValueError, "At least one backend is required.")
+        self.backends = list(backends)
+        self.routes = []
+        for backend in self.backends:
+            route = _route(backend)
+            if route in self.routes:
+                route = f"{route}#{len(self.routes)}"
+            self.routes.append(route)
+        self.stats = {route: RouteStats() for route in self.routes}
+        self.decisions = deque(maxlen=MAX_DECISIONS)
+        self.refresh = refresh
+        self.max_workers = max_workers
+        self.name = "dispatcher"
+        self.platform = ",".join(self.routes)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_clients(cls, clients: dict, **kwargs):
+        """Loads the backends through :meth:`qibo_cloud_backends.MetaBackend.load` and
+        builds a dispatcher over them.
+
+        Args:
+            clients (dict): Mapping between the clients and the keyword arguments of
+                :meth:`qibo_cloud_backends.MetaBackend.load`, e.g.
+                ``{"qiskit-client": {"token": "xxx", "platform": "ibm_kyiv"}, "braket-client": {}}``.
+            kwargs (dict): Additional arguments of the dispatcher.
+
+        Returns:
+            :class:`qibo_cloud_backends.dispatcher.DispatcherBackend`: The dispatcher.
+        """
+        from qibo_cloud_backends import MetaBackend
+
+        backends = [
+            MetaBackend.load(client, **options) for client, options in clients.items()
+        ]
+        return cls(backends, **kwargs)
+
+    def _queue_depth(self, backend, stats: RouteStats):
+        now = time.monotonic()
+        with self._lock:
+            if now - stats.refreshed < self.refresh:
+                return
+            stats.refreshed = now
+        try:
+            stats.queue_depth = backend.queue_depth()
+        except Exception as exception:  # pylint: disable=broad-except
+            log.warning(f"Queue depth of {_route(backend)} unavailable: {exception}")
+
+    def rank(self, circuit) -> list:
+        """Orders the backends able to execute a circuit by preference.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The circuit to execute.
+
+        Returns:
+            list: The indices of the compatible backends, best first.
+        """
+        compatible = [
+            index
+            for index, backend in enumerate(self.backends)
+            if backend.supports(circuit)
+        ]
+        for index in compatible:
+            self._queue_depth(self.backends[index], self.stats[self.routes[index]])
+        with self._lock:
+            scores = {
+                index: self.stats[self.routes[index]].score() for index in compatible
+            }
+        return sorted(compatible, key=lambda index: (scores[index], index))
+
+    def supports(self, circuit) -> bool:
+        return any(backend.supports(circuit) for backend in self.backends)
+
+    def _dispatch(self, circuit, run):
+        start = time.monotonic()
+        candidates = self.rank(circuit)
+        remaining = list(candidates)
+        failures = []
+        while remaining:
+            with self._lock:
+                # the choice and the reservation are atomic, so that concurrent
+                # executions see each other's load
+                index = min(
+                    remaining,
+                    key=lambda index: (self.stats[self.routes[index]].score(), index),
+                )
+                remaining.remove(index)
+                backend, route = self.backends[index], self.routes[index]
+                stats = self.stats[route]
+                stats.in_flight += 1
+            attempt = time.monotonic()
+            try:
+                result = run(backend)
+            except Exception as exception:  # pylint: disable=broad-except
+                failures.append((route, f"{type(exception).__name__}: {exception}"))
+                with self._lock:
+                    stats.in_flight -= 1
+                    stats.failures += 1
+                    stats.consecutive_failures += 1
+                log.warning(f"Execution on {route} failed, trying the next backend.")
+                continue
+            elapsed = time.monotonic() - attempt
+            with self._lock:
+                stats.in_flight -= 1
+                stats.completed += 1
+                stats.consecutive_failures = 0
+                stats.latency = (
+                    elapsed
+                    if stats.latency is None
+                    else (1 - DEFAULT_SMOOTHING) * stats.latency
+                    + DEFAULT_SMOOTHING * elapsed
+                )
+            self._record(route, candidates, failures, start)
+            return result
+
+        self._record(None, candidates, failures, start)
+        if not candidates:
+            raise_error(
+                NotImplementedError, "No backend supports all the gates of the circuit."
+            )
+        raise_error(
+            RuntimeError,
+            "The execution failed on all the backends: "
+            + "; ".join(f"{route}: {error}" for route, error in failures),
+        )
+
+    def _record(self, route, candidates, failures, start):
+        self.decisions.append(
+            RoutingDecision(
+                route,
+                [self.routes[index] for index in candidates],
+                failures,
+                time.monotonic() - start,
+            )
+        )
+
+    def execute_circuit(self, circuit, nshots=1000):
+        """Executes a circuit on the least loaded compatible backend.
+
+        Args:
+            circuit (qibo.models.Circuit): The circuit to execute.
+            nshots (int): Total number of shots. Defaults to ``1000``.
+
+        Returns:
+            (qibo.result.MeasurementOutcomes) The outcome of the circuit execution.
+        """
+        return self._cached(
+            circuit,
+            nshots,
+            lambda: self._dispatch(
+                circuit, lambda backend: backend.execute_circuit(circuit, nshots=nshots)
+            ),
+        )
+
+    def execute_sweep(self, circuit, parameter_values, nshots=1000):
+        """Executes a parametric circuit with several sets of parameters on the least
+        loaded compatible backend, see
+        :meth:`qibo_cloud_backends.abstract.CloudBackend.execute_sweep`.
+
+        Returns:
+            ndarray: The ``(n_sets, 2**n_measured_qubits)`` array of the number of occurrences
+            of each bitstring, with the first measured qubit as most significant bit.
+        """
+        return self._dispatch(
+            circuit,
+            lambda backend: backend.execute_sweep(circuit, parameter_values, nshots),
+        )
+
+    def expectation_from_counts(self, circuit, observables, nshots=1000):
+        """Computes expectation values of Pauli-Z strings executing a circuit on the least
+        loaded compatible backend, see
+        :meth:`qibo_cloud_backends.abstract.CloudBackend.expectation_from_counts`.
+
+        Returns:
+            (ndarray, ndarray): The expectation values of the observables and their
+            single-shot variances.
+        """
+        return self._dispatch(
+            circuit,
+            lambda backend: backend.expectation_from_counts(
+                circuit, observables, nshots
+            ),
+        )
+
+    def _select(self, circuit):
+        candidates = self.rank(circuit)
+        if not candidates:
+            raise_error(
+                NotImplementedError, "No backend supports all the gates of the circuit."
+            )
+        return self.backends[candidates[0]]
+
+    def submit_circuit(self, circuit, nshots=1000):
+        """Submits a circuit to the least loaded compatible backend, without waiting
+        for its execution. Unlike :meth:`execute_circuit`, a failed submission is not
+        retried on the other backends, and the load of the job is not tracked.
+
+        Args:
+            circuit (qibo.models.Circuit): The circuit to execute.
+            nshots (int): Total number of shots. Defaults to ``1000``.
+
+        Returns:
+            :class:`qibo_cloud_backends.jobs.CloudJob`: Handle of the submitted job.
+        """
+        return self._select(circuit).submit_circuit(circuit, nshots=nshots)
+
+    def submit_circuits(self, circuits, nshots=1000):
+        """Submits a list of circuits, each of them as :meth:`submit_circuit`.
+
+        Args:
+            circuits (list): The circuits to execute.
+            nshots (int): Total number of shots for each circuit. Defaults to ``1000``.
+
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.CloudJob` handles, in input order.
+        """
+        return [self.submit_circuit(circuit, nshots) for circuit in circuits]
+
+    def submit_sweep(self, circuit, parameter_values, nshots=1000):
+        """Submits a parametric circuit with several sets of parameters to the least
+        loaded compatible backend, as :meth:`submit_circuit`, see
+        :meth:`qibo_cloud_backends.abstract.CloudBackend.submit_sweep`.
+
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.CloudJob` handles, one per parameter set.
+        """
+        return self._select(circuit).submit_sweep(circuit, parameter_values, nshots)
+
+    def execute_circuits(self, circuits, initial_states=None, nshots=1000):
+        """Executes a list of circuits, routing each of them separately. The circuits are
+        executed concurrently, hence they are spread among the backends by their load.
+
+        Args:
+            circuits (list): The circuits to execute.
+            initial_states (list): Not supported, must be ``None``.
+            nshots (int): Total number of shots for each circuit. Defaults to ``1000``.
+
+        Returns:
+            (list) The outcomes of each circuit, in input order.
+        """
+        if initial_states is not None:
+            raise_error(
+                NotImplementedError,
+                "The use of an `initial_state` is not supported yet.",
+            )
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda circuit: self.execute_circuit(circuit, nshots), circuits
+                )
+            )
+
+    async def async_execute_circuit(self, circuit, nshots=1000):
+        return await asyncio.to_thread(self.execute_circuit, circuit, nshots)
+
+    async def async_execute_circuits(self, circuits, nshots=1000):
+        return await asyncio.gather(
+            *(self.async_execute_circuit(circuit, nshots) for circuit in circuits)
+        )
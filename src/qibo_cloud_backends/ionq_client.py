@@ -1,14 +1,16 @@
 import os
-from itertools import repeat
 
-from qibo.backends import NumpyBackend
 from qibo.config import raise_error
-from qibo.result import MeasurementOutcomes
-from qiskit import QuantumCircuit
 from qiskit_ionq import IonQProvider  # type: ignore
 
+from qibo_cloud_backends.jobs import QiskitJob
+from qibo_cloud_backends.limits import credentials_id
+from qibo_cloud_backends.pool import PROVIDERS
+from qibo_cloud_backends.qiskit_based import QiskitBasedBackend
+from qibo_cloud_backends.utils import qiskit_max_shots
 
-class IonQClientBackend(NumpyBackend):
+
+class IonQClientBackend(QiskitBasedBackend):
     """Backend for the remote execution of Qibo circuits on the IonQ Cloud servers.
 
     Args:
@@ -31,43 +33,24 @@ class IonQClientBackend(NumpyBackend):
         if platform is None:
             platform = "ionq_simulator"
         self.name = "ionq-client"
-        provider = IonQProvider(token)
+        self.credentials = credentials_id(token)
+        self.platform = platform
+        provider = PROVIDERS.get((self.name, token), lambda: IonQProvider(token))
         self.backend = provider.get_backend(platform)
+        self.max_shots = qiskit_max_shots(self.backend)
 
         # For the classical simulator, options like noise model can be set
         self.backend.set_options(**kwargs)
 
-    def execute_circuit(self, circuit, initial_state=None, nshots=1000, **kwargs):
-        """Executes the passed circuit.
+    def attach(self, job_id, circuit, nshots):
+        """Builds the handle of a job submitted before, e.g. by another process.
 
         Args:
-            circuit (:class:`qibo.models.Circuit`): Circuit to be executed.
-            initial_state (ndarray, optional): Initial state of the circuit.
-                Defaults to :math:`\\ket{0}^{\\otimes n}`.
-            nshots (int, optional): Total number of shots. Defaults to :math:`10^{3}`.
-            kwargs (dict, optional): Additional keyword arguments passed to the
-                IonQ backends' `run()` method.
+            job_id (str): Identifier of the job on the IonQ servers.
+            circuit (:class:`qibo.models.Circuit`): The submitted circuit.
+            nshots (int): Number of shots of the job.
 
         Returns:
-            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+            :class:`qibo_cloud_backends.jobs.QiskitJob`: Handle of the job.
         """
-        if initial_state is not None:
-            raise_error(
-                NotImplementedError,
-                "The use of an `initial_state` is not supported yet.",
-            )
-        measurements = circuit.measurements
-        if not measurements:
-            raise_error(RuntimeError, "No measurement found in the provided circuit.")
-        circuit = QuantumCircuit.from_qasm_str(circuit.to_qasm())
-        result = self.backend.run(circuit, shots=nshots, **kwargs).result()
-        samples = []
-        for state, count in result.get_counts().items():
-            sample = [int(bit) for bit in state[::-1].split()]
-            samples += list(repeat(sample, count))
-        return MeasurementOutcomes(
-            measurements,
-            backend=self,
-            samples=self.cast(samples, dtype=int),
-            nshots=nshots,
-        )
+        return QiskitJob(self.backend.retrieve_job(job_id), circuit, nshots, self)
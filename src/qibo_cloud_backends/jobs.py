@@ -0,0 +1,429 @@
+import asyncio
+import time
+from collections import Counter
+
+from qibo.config import raise_error
+
+from qibo_cloud_backends.polling import Poller, PollingTimeoutError
+from qibo_cloud_backends.timing import (
+    Timings,
+    braket_timings,
+    qiskit_timings,
+    report,
+)
+from qibo_cloud_backends.utils import (
+    bits_to_outcomes,
+    counts_to_frequencies,
+    counts_to_outcomes,
+    frequencies_to_bits,
+    samples_to_outcomes,
+)
+
+BRAKET_TERMINAL_STATES = ("COMPLETED", "FAILED", "CANCELLED")
+
+
+class CloudJob:
+    """Lightweight handle of a circuit execution submitted to a cloud provider.
+
+    The handle is returned as soon as the job is submitted, the provider is
+    contacted again only when the status or the result are requested. If the
+    backend defines a :class:`qibo_cloud_backends.polling.Poller`, it is used to
+    wait for the completion of the job before retrieving its result.
+
+    The time spent in each stage of the execution is recorded in the ``timings``
+    attribute, a :class:`qibo_cloud_backends.timing.Timings` attached to the result
+    and forwarded to the ``timing_callback`` of the backend, if any.
+
+    If the backend defines a :class:`qibo_cloud_backends.retry.RetryPolicy`, the
+    status requests and the retrieval of the result are retried when they fail with
+    transient errors, reattaching to the same job on the provider's servers instead of
+    submitting it again. The ``timeout`` of the poller is never retried.
+
+    Args:
+        job: The job object returned by the provider.
+        circuit (:class:`qibo.models.Circuit`): The submitted circuit.
+        nshots (int): Total number of shots.
+        backend (:class:`qibo.backends.abstract.Backend`): The backend which submitted the job.
+    """
+
+    def __init__(self, job, circuit, nshots, backend):
+        self.job = job
+        self.circuit = circuit
+        self.nshots = nshots
+        self.backend = backend
+        self._result = None
+        self._fetched = False
+        self.timings = Timings()
+        self.journal_key = None
+        self.slot = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(job_id={self.job_id!r})"
+
+    @property
+    def job_id(self) -> str:
+        """Identifier of the job on the provider's servers."""
+        raise NotImplementedError
+
+    def status(self):
+        """Returns the status of the job, as reported by the provider."""
+        raise NotImplementedError
+
+    def _is_final(self, status) -> bool:
+        raise NotImplementedError
+
+    def done(self) -> bool:
+        """Checks whether the job reached a final state."""
+        final = self._is_final(self._status())
+        if final:
+            self._settle()
+        return final
+
+    def _settle(self):
+        # frees the slot of the job in the rate limiter of the provider, if any
+        if self.slot is not None:
+            self.slot.release()
+
+    def cancel(self):
+        """Cancels the job on the provider's servers."""
+        raise NotImplementedError
+
+    def _fetch(self):
+        raise NotImplementedError
+
+    def _retrying(self, fetch, description="retrieval"):
+        """Calls ``fetch()``, retrying it according to the retry policy of the backend."""
+        policy = getattr(self.backend, "retry", None)
+        if policy is None:
+            return fetch()
+        return policy.call(fetch, f"{description} of {self}", self._reconnect)
+
+    def _status(self):
+        # the status requests are idempotent, hence retried as the retrievals
+        return self._retrying(self.status, "status request")
+
+    def _reconnect(self):
+        # rebuilds the provider object from the job identifier, never resubmitting
+        try:
+            job = self.backend.attach(self.job_id, self.circuit, self.nshots)
+        except NotImplementedError:
+            return
+        self.job = job.job
+
+    def frequencies(self) -> Counter:
+        """Waits for the job to complete and retrieves the frequencies of the measured
+        bitstrings, without building the per-shot samples when the provider reports counts.
+
+        Returns:
+            :class:`collections.Counter`: Mapping between the decimal representation of the
+            measured bitstrings, with the first measured qubit as most significant bit,
+            and their number of occurrences.
+        """
+        return self.result().frequencies(binary=False)
+
+    def _result_format(self) -> str:
+        return getattr(self.backend, "result_format", "samples")
+
+    def _poller(self, poller=None):
+        if poller is None:
+            poller = getattr(self.backend, "poller", None)
+        return Poller() if poller is None else poller
+
+    def wait(self, poller: Poller = None):
+        """Blocks until the job reaches a final state.
+
+        Args:
+            poller (:class:`qibo_cloud_backends.polling.Poller`): Polling strategy.
+                If ``None``, the one of the backend is used, or the default one if the
+                backend does not define any. Defaults to ``None``.
+
+        Returns:
+            The final status of the job.
+        """
+        return self._poller(poller).wait(self._status, self._is_final)
+
+    def result(self):
+        """Waits for the job to complete and retrieves its result.
+
+        Returns:
+            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+        """
+        if not self._fetched:
+            if getattr(self.backend, "poller", None) is not None:
+                with self.timings.stage("wait"):
+                    self.wait()
+            try:
+                self._result = self._retrying(self._fetch)
+            except Exception:
+                # failed jobs are released and not reattached again, pending ones are
+                tracked = self.journal_key is not None or self.slot is not None
+                if tracked and self.done() and self.journal_key is not None:
+                    self.backend.journal.discard(self.journal_key)
+                raise
+            self._fetched = True
+            self._settle()
+            if self.journal_key is not None:
+                self.backend.journal.discard(self.journal_key)
+            self._report()
+        return self._result
+
+    def _report(self):
+        self.timings.route = f"{self.backend.name}:{self.backend.platform}"
+        self.timings.job_id = self.job_id
+        self.timings.nshots = self.nshots
+        if self._result is not None:
+            self._result.timings = self.timings
+        report(self.timings, getattr(self.backend, "timing_callback", None))
+
+    async def async_result(self, poller: Poller = None):
+        """Awaits the completion of the job without blocking the event loop.
+
+        Args:
+            poller (:class:`qibo_cloud_backends.polling.Poller`): Polling strategy.
+                If ``None``, the one of the backend is used, or the default one if the
+                backend does not define any. Defaults to ``None``.
+
+        Returns:
+            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+        """
+        if not self._fetched:
+            await self._poller(poller).async_wait(self._status, self._is_final)
+        return await asyncio.to_thread(self.result)
+
+
+class BraketJob(CloudJob):
+    """Handle of a Braket quantum task."""
+
+    @property
+    def job_id(self) -> str:
+        return self.job.id
+
+    def status(self) -> str:
+        return self.job.state()
+
+    def _is_final(self, status) -> bool:
+        return status in BRAKET_TERMINAL_STATES
+
+    def cancel(self):
+        self.job.cancel()
+
+    def _fetch(self):
+        with self.timings.stage("download"):
+            result = self.job.result()
+        if result is None:
+            raise_error(
+                RuntimeError,
+                f"Task {self.job_id} ended in state {self.status()} without results.",
+            )
+        self.timings.provider.update(braket_timings(result))
+        with self.timings.stage("decode"):
+            return samples_to_outcomes(
+                self.circuit.measurements,
+                result.measurements,
+                self.backend,
+                self.nshots,
+                self._result_format(),
+            )
+
+    def frequencies(self) -> Counter:
+        if self._fetched:
+            return super().frequencies()
+        result = self._retrying(lambda: self.job.result())
+        if result is None:
+            return super().frequencies()
+        self._settle()
+        return counts_to_frequencies(result.measurement_counts, little_endian=False)
+
+
+class QiskitJob(CloudJob):
+    """Handle of a circuit of a qiskit job, used by the qiskit and IonQ backends.
+
+    Args:
+        index (int): Position of the circuit in a multi-circuit job. Defaults to ``0``.
+    """
+
+    def __init__(self, job, circuit, nshots, backend, index: int = 0):
+        super().__init__(job, circuit, nshots, backend)
+        self.index = index
+
+    @property
+    def job_id(self) -> str:
+        return self.job.job_id()
+
+    def status(self):
+        return self.job.status()
+
+    def _is_final(self, status) -> bool:
+        return status.name in ("DONE", "CANCELLED", "ERROR")
+
+    def cancel(self):
+        self.job.cancel()
+
+    def _fetch(self):
+        with self.timings.stage("download"):
+            result = self.job.result()
+        self.timings.provider.update(qiskit_timings(self.job, result))
+        with self.timings.stage("decode"):
+            return counts_to_outcomes(
+                self.circuit.measurements,
+                result.get_counts(self.index),
+                backend=self.backend,
+                nshots=self.nshots,
+                result_format=self._result_format(),
+            )
+
+    def frequencies(self) -> Counter:
+        if self._fetched:
+            return super().frequencies()
+        counts = self._retrying(lambda: self.job.result().get_counts(self.index))
+        self._settle()
+        return counts_to_frequencies(counts)
+
+
+class QiboClientJob(CloudJob):
+    """Handle of a qibo-client job."""
+
+    @property
+    def job_id(self) -> str:
+        return self.job.pid
+
+    def status(self):
+        return self.job.status()
+
+    def _is_final(self, status) -> bool:
+        return status.value in ("success", "error")
+
+    def cancel(self):
+        self.job.delete()
+
+    def _fetch(self):
+        # the client downloads and decodes the result in a single call
+        with self.timings.stage("download"):
+            result = self.job.result(verbose=self.backend.verbosity)
+        if result is None:
+            # the client logs the failure and returns nothing
+            raise_error(
+                RuntimeError,
+                f"Job {self.job_id} ended in state {self.status()} without results.",
+            )
+        if self._result_format() == "samples":
+            return result
+        with self.timings.stage("decode"):
+            return samples_to_outcomes(
+                self.circuit.measurements,
+                result.samples(),
+                self.backend,
+                self.nshots,
+                self._result_format(),
+            )
+
+
+class SplitJob(CloudJob):
+    """Handle of a circuit execution split in several jobs, e.g. to comply with the shot
+    limit of the device. The results of the jobs are merged by summing their frequencies,
+    one job at a time, so that the memory footprint is bounded by the number of distinct
+    measured bitstrings.
+
+    Args:
+        jobs (list): The :class:`qibo_cloud_backends.jobs.CloudJob` handles of the parts.
+    """
+
+    def __init__(self, jobs, circuit, nshots, backend):
+        super().__init__(None, circuit, nshots, backend)
+        self.jobs = list(jobs)
+
+    @property
+    def job_id(self) -> str:
+        return ",".join(str(job.job_id) for job in self.jobs)
+
+    def status(self) -> tuple:
+        return tuple(job._status() for job in self.jobs)
+
+    def _is_final(self, status) -> bool:
+        return all(job._is_final(current) for job, current in zip(self.jobs, status))
+
+    def cancel(self):
+        for job in self.jobs:
+            job.cancel()
+
+    def _retrying(self, fetch, description="retrieval"):
+        # the parts retry their own requests
+        return fetch()
+
+    def frequencies(self) -> Counter:
+        if self._fetched:
+            return super().frequencies()
+        frequencies = Counter()
+        for job in self.jobs:
+            frequencies.update(job.frequencies())
+            job._settle()
+        return frequencies
+
+    def _fetch(self):
+        nbits = sum(len(gate.qubits) for gate in self.circuit.measurements)
+        with self.timings.stage("download"):
+            frequencies = self.frequencies()
+        # merged results never build the per-shot samples upfront
+        result_format = self._result_format()
+        if result_format == "samples":
+            result_format = "counts"
+        with self.timings.stage("decode"):
+            bits, occurrences = frequencies_to_bits(frequencies, nbits)
+            return bits_to_outcomes(
+                self.circuit.measurements,
+                bits,
+                occurrences,
+                self.backend,
+                self.nshots,
+                result_format,
+            )
+
+
+def as_completed(jobs, poller: Poller = None):
+    """Yields the results of a list of jobs as soon as each of them completes, regardless
+    of their order, so that the results can be processed while the other jobs are running.
+
+    The pending jobs are polled together, querying once the status of the provider jobs
+    shared by several handles, with the intervals of ``poller``, restarting from the
+    initial interval whenever a job completes.
+
+    Args:
+        jobs (list): The :class:`qibo_cloud_backends.jobs.CloudJob` handles.
+        poller (:class:`qibo_cloud_backends.polling.Poller`): Polling strategy.
+            If ``None``, the one of the backend of the first job is used, or the
+            default one if the backend does not define any. Defaults to ``None``.
+
+    Yields:
+        (int, :class:`qibo.result.MeasurementOutcomes`): The position of the job in
+        ``jobs`` and its result.
+    """
+    pending = dict(enumerate(jobs))
+    if not pending:
+        return
+    poller = next(iter(pending.values()))._poller(poller)
+    start = time.monotonic()
+    intervals = poller.intervals()
+    while True:
+        statuses = {}
+        completed = []
+        for index, job in pending.items():
+            # the circuits of a multi-circuit job share the same provider job
+            key = id(job) if job.job is None else id(job.job)
+            if key not in statuses:
+                statuses[key] = job._status()
+            if job._is_final(statuses[key]):
+                completed.append(index)
+        for index in completed:
+            yield index, pending.pop(index).result()
+        if not pending:
+            return
+        if completed:
+            intervals = poller.intervals()
+        interval = next(intervals)
+        elapsed = time.monotonic() - start
+        if poller.timeout is not None and elapsed + interval > poller.timeout:
+            raise_error(
+                PollingTimeoutError,
+                f"{len(pending)} jobs still running after {elapsed:.1f}s, giving up.",
+            )
+        time.sleep(interval)
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from qibo import Circuit, gates
+
+from qibo_cloud_backends.cache import DEFAULT_DIRECTORY
+
+
+class JobJournal:
+    """On-disk journal of the jobs submitted to the providers and not collected yet.
+
+    The backends record the identifiers of the remote jobs before waiting for them,
+    one file per execution, named after the :func:`qibo_cloud_backends.cache.fingerprint`
+    of the execution, and remove the entry once the result is retrieved. If the process
+    dies in between, executing again the same circuit reattaches to the recorded jobs
+    instead of submitting them again, while
+    :meth:`qibo_cloud_backends.abstract.CloudBackend.resume` reattaches to all of them.
+
+    Args:
+        directory (str): Folder where the entries are stored. Defaults to
+            ``~/.cache/qibo_cloud_backends/journal``.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(
+            DEFAULT_DIRECTORY / "journal" if directory is None else directory
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def record(self, key: str, job):
+        """Records the remote jobs of an execution, flushing them to disk.
+
+        Args:
+            key (str): Fingerprint of the execution.
+            job (:class:`qibo_cloud_backends.jobs.CloudJob`): Handle of the submitted job,
+                possibly a :class:`qibo_cloud_backends.jobs.SplitJob`.
+        """
+        parts = getattr(job, "jobs", [job])
+        entry = {
+            "route": f"{job.backend.name}:{job.backend.platform}",
+            "nshots": job.nshots,
+            "nqubits": job.circuit.nqubits,
+            "measurements": [
+                [list(gate.qubits), gate.register_name]
+                for gate in job.circuit.measurements
+            ],
+            "jobs": [[part.job_id, part.nshots] for part in parts],
+            "created": time.time(),
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            json.dump(entry, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(file.name, self._path(key))
+
+    def get(self, key: str) -> Optional[dict]:
+        """Retrieves the entry of an execution.
+
+        Args:
+            key (str): Fingerprint of the execution.
+
+        Returns:
+            dict: The recorded entry, or ``None`` if the execution is not pending.
+        """
+        try:
+            return json.loads(self._path(key).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def entries(self, route: Optional[str] = None) -> dict:
+        """Returns the pending executions.
+
+        Args:
+            route (str): If given, only the executions submitted by the backend with this
+                ``name:platform`` are returned. Defaults to ``None``.
+
+        Returns:
+            dict: Mapping between the fingerprints and the entries of the executions.
+        """
+        entries = {}
+        for path in sorted(self.directory.glob("*.json")):
+            entry = self.get(path.stem)
+            if entry is not None and route in (None, entry["route"]):
+                entries[path.stem] = entry
+        return entries
+
+    def discard(self, key: str):
+        """Removes the entry of an execution."""
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self):
+        """Removes all the entries of the journal."""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def circuit(entry: dict) -> Circuit:
+        """Rebuilds the measurements of the circuit of an entry, which are enough to
+        decode the results of its jobs.
+
+        Args:
+            entry (dict): The recorded entry.
+
+        Returns:
+            :class:`qibo.models.Circuit`: Circuit made of the measurement gates only.
+        """
+        circuit = Circuit(entry["nqubits"])
+        for qubits, register_name in entry["measurements"]:
+            circuit.add(gates.M(*qubits, register_name=register_name))
+        return circuit
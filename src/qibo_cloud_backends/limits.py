@@ -0,0 +1,270 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from qibo.config import log, raise_error
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Client-side limits of the submissions to a provider.
+
+    Args:
+        rate (float): Maximum sustained number of submissions per second. If ``None``,
+            the submissions are not throttled. Defaults to ``None``.
+        burst (int): Number of submissions which can be sent at once, before being
+            throttled to ``rate``. Defaults to ``1``.
+        max_in_flight (int): Maximum number of jobs submitted and not completed yet.
+            If ``None``, the jobs in flight are not limited. Defaults to ``None``.
+        poll_interval (float): Seconds between the checks of the status of the jobs in
+            flight, while a submission waits for one of them to complete.
+            Defaults to ``1``.
+    """
+
+    rate: Optional[float] = None
+    burst: int = 1
+    max_in_flight: Optional[int] = None
+    poll_interval: float = 1.0
+
+    def __post_init__(self):
+        if self.rate is not None and self.rate <= 0:
+            raise_error(ValueError, f"Rate must be positive, got {self.rate}.")
+        if self.burst < 1:
+            raise_error(ValueError, f"Burst must be at least 1, got {self.burst}.")
+        if self.max_in_flight is not None and self.max_in_flight < 1:
+            raise_error(
+                ValueError,
+                f"Jobs in flight must be at least 1, got {self.max_in_flight}.",
+            )
+
+
+@dataclass
+class LimiterStats:
+    """Metrics of a :class:`RateLimiter`.
+
+    Args:
+        submissions (int): Number of jobs submitted through the limiter.
+        throttled (int): Number of submissions which had to wait.
+        wait_time (float): Total time spent waiting, in seconds.
+        in_flight (int): Number of jobs submitted and not completed yet.
+    """
+
+    submissions: int = 0
+    throttled: int = 0
+    wait_time: float = 0.0
+    in_flight: int = 0
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of the submissions, which also caps the jobs in flight.
+
+    The bucket holds up to ``burst`` tokens, refilled at ``rate`` tokens per second, and
+    every submitted job takes one. Submissions of more jobs than the ``burst`` or the
+    ``max_in_flight`` limits wait for a full bucket and no job in flight, respectively,
+    and then take all the tokens they need, which are paid back before the following
+    submissions.
+
+    The jobs in flight free their slots when their completion is observed, e.g. when
+    their results are retrieved. While a submission waits for a free slot, the status of
+    the jobs in flight is checked every ``poll_interval`` seconds, so that the jobs
+    submitted and not waited for yet by the same thread do not block it forever.
+
+    Args:
+        limit (:class:`RateLimit`): The limits to enforce.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._stats = LimiterStats()
+        self._slots = set()
+
+    def _delay(self, count: int) -> Optional[float]:
+        # must be called holding the lock, None means waiting for a release
+        limit = self.limit
+        if limit.max_in_flight is not None and self._stats.in_flight > 0:
+            if self._stats.in_flight + count > limit.max_in_flight:
+                return None
+        if limit.rate is None:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(
+            limit.burst, self._tokens + (now - self._updated) * limit.rate
+        )
+        self._updated = now
+        missing = min(count, limit.burst) - self._tokens
+        return max(missing, 0.0) / limit.rate
+
+    def acquire(self, count: int = 1) -> float:
+        """Blocks until ``count`` jobs can be submitted within the limits.
+
+        Args:
+            count (int): Number of jobs to submit. Defaults to ``1``.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        start = time.monotonic()
+        waited = 0.0
+        while True:
+            with self._condition:
+                delay = self._delay(count)
+                if delay == 0.0:
+                    if self.limit.rate is not None:
+                        self._tokens -= count
+                    self._stats.submissions += count
+                    self._stats.in_flight += count
+                    if waited > 0:
+                        self._stats.throttled += count
+                        self._stats.wait_time += waited
+                    return waited
+                notified = self._condition.wait(
+                    self.limit.poll_interval if delay is None else delay
+                )
+                waited = time.monotonic() - start
+                if delay is not None or notified:
+                    continue
+                slots = list(self._slots)
+            # outside the lock, as the completed jobs release their slots
+            for slot in slots:
+                slot.probe()
+
+    def release(self, count: int = 1):
+        """Marks ``count`` jobs as completed, freeing their slots."""
+        with self._condition:
+            self._stats.in_flight = max(self._stats.in_flight - count, 0)
+            self._condition.notify_all()
+
+    def track(self, jobs: list, count: int = 1) -> "Slot":
+        """Creates the slot of ``count`` jobs in flight, shared by the job handles."""
+        slot = Slot(self, jobs, count)
+        with self._condition:
+            self._slots.add(slot)
+        for job in jobs:
+            job.slot = slot
+        return slot
+
+    def stats(self) -> LimiterStats:
+        """Returns a snapshot of the metrics of the limiter."""
+        with self._condition:
+            return replace(self._stats)
+
+
+class Slot:
+    """Jobs in flight of a :class:`RateLimiter`, released once when the first of the
+    job handles sharing it reaches a final state.
+
+    Args:
+        limiter (:class:`RateLimiter`): The limiter of the jobs.
+        jobs (list): The :class:`qibo_cloud_backends.jobs.CloudJob` handles sharing the slot.
+        count (int): Number of jobs in flight. Defaults to ``1``.
+    """
+
+    def __init__(self, limiter: RateLimiter, jobs: list, count: int = 1):
+        self.limiter = limiter
+        self.jobs = jobs
+        self.count = count
+        self._released = False
+        self._lock = threading.Lock()
+
+    def probe(self):
+        """Checks whether the jobs completed, releasing the slot if so."""
+        try:
+            self.jobs[0].done()
+        except Exception as exception:  # pylint: disable=broad-except
+            log.warning(f"Cannot check the status of {self.jobs[0]}: {exception!r}")
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        with self.limiter._condition:
+            self.limiter._slots.discard(self)
+        self.limiter.release(self.count)
+
+
+def credentials_id(token: Optional[str]) -> Optional[str]:
+    """Digest identifying a token without storing it."""
+    if token is None:
+        return None
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class Limiters:
+    """Registry of the :class:`RateLimiter` of each provider and credentials, shared by
+    all the backends.
+
+    Limits configured without credentials apply to every credentials of the provider,
+    each of them with its own token bucket, unless more specific limits are configured.
+    """
+
+    def __init__(self):
+        self._limits = {}
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        provider: str,
+        limit: Optional[RateLimit],
+        token: Optional[str] = None,
+    ):
+        """Sets the limits of the submissions to a provider.
+
+        Args:
+            provider (str): Name of the backends of the provider, e.g. ``"qiskit-client"``.
+            limit (:class:`RateLimit`): The limits. If ``None``, the limits are removed.
+            token (str): If given, the limits apply only to the submissions authenticated
+                with this token. Defaults to ``None``.
+        """
+        key = (provider, credentials_id(token))
+        with self._lock:
+            if limit is None:
+                self._limits.pop(key, None)
+            else:
+                self._limits[key] = limit
+            # the jobs in flight of the replaced limiters are not counted anymore
+            for other in list(self._limiters):
+                if (other[0] == provider and token is None) or other == key:
+                    del self._limiters[other]
+
+    def get(
+        self, provider: str, credentials: Optional[str] = None
+    ) -> Optional[RateLimiter]:
+        """Returns the limiter of a provider and credentials, or ``None`` if the
+        submissions are not limited.
+
+        Args:
+            provider (str): Name of the backends of the provider.
+            credentials (str): Digest of the token, see :func:`credentials_id`.
+        """
+        key = (provider, credentials)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limit = self._limits.get(key, self._limits.get((provider, None)))
+                if limit is None:
+                    return None
+                limiter = self._limiters[key] = RateLimiter(limit)
+            return limiter
+
+    def stats(self) -> dict:
+        """Returns the :class:`LimiterStats` of each ``(provider, credentials)``."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {key: limiter.stats() for key, limiter in limiters.items()}
+
+    def clear(self):
+        """Removes all the limits."""
+        with self._lock:
+            self._limits.clear()
+            self._limiters.clear()
+
+
+LIMITERS = Limiters()
+"""Limiters shared by all the backends."""
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+from typing import Callable, Optional
+
+from qibo.config import log, raise_error
+
+
+class PollingTimeoutError(TimeoutError):
+    """Raised when a job does not reach a final status within the ``timeout`` of a
+    :class:`qibo_cloud_backends.polling.Poller`. Unlike the timeouts of the requests,
+    it is never retried."""
+
+
+def log_status(status, elapsed: float):
+    """Default progress callback, logging the status of a job through the qibo logger."""
+    log.info(f"> Status {status} ({elapsed:.1f}s)")
+
+
+class Poller:
+    """Polls the status of a remote job with exponential backoff and jitter.
+
+    The first check is performed immediately, so that short jobs are picked up
+    as soon as possible, while the interval between the following checks grows
+    geometrically up to ``max_interval``, so that jobs waiting in long queues
+    cost only a few status requests.
+
+    Args:
+        interval (float): Seconds before the second status check. Defaults to ``0.5``.
+        max_interval (float): Maximum number of seconds between two status checks.
+            Defaults to ``30``.
+        backoff (float): Multiplicative growth factor of the interval. Defaults to ``2``.
+        jitter (float): Relative random variation applied to every interval, to avoid
+            synchronized polling of many jobs. Defaults to ``0.1``.
+        timeout (float): Maximum number of seconds to wait. If ``None``, waits
+            indefinitely. Defaults to ``None``.
+        callback (Callable): Function called as ``callback(status, elapsed)`` after
+            every status check, e.g. :func:`qibo_cloud_backends.polling.log_status`.
+            Defaults to ``None``.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        jitter: float = 0.1,
+        timeout: Optional[float] = None,
+        callback: Optional[Callable] = None,
+    ):
+        if interval <= 0 or max_interval < interval:
+            raise_error(
+                ValueError,
+                "Polling intervals must satisfy `0 < interval <= max_interval`.",
+            )
+        if backoff < 1:
+            raise_error(
+                ValueError, f"Backoff factor must be at least 1, got {backoff}."
+            )
+        if not 0 <= jitter < 1:
+            raise_error(ValueError, f"Jitter must be in [0, 1), got {jitter}.")
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.timeout = timeout
+        self.callback = callback
+
+    def intervals(self):
+        """Generates the sequence of waiting intervals, in seconds."""
+        interval = self.interval
+        while True:
+            yield interval * (1 + random.uniform(-self.jitter, self.jitter))
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def _check(self, current, start: float, interval: float, is_final: Callable):
+        elapsed = time.monotonic() - start
+        if self.callback is not None:
+            self.callback(current, elapsed)
+        if is_final(current):
+            return True
+        if self.timeout is not None and elapsed + interval > self.timeout:
+            raise_error(
+                PollingTimeoutError,
+                f"Job still in status {current} after {elapsed:.1f}s, giving up.",
+            )
+        return False
+
+    def wait(self, status: Callable, is_final: Callable):
+        """Blocks until the job reaches a final status.
+
+        Args:
+            status (Callable): Function returning the current status of the job.
+            is_final (Callable): Function checking whether a status is final.
+
+        Returns:
+            The final status of the job.
+        """
+        start = time.monotonic()
+        for interval in self.intervals():
+            current = status()
+            if self._check(current, start, interval, is_final):
+                return current
+            time.sleep(interval)
+
+    async def async_wait(self, status: Callable, is_final: Callable):
+        """Awaits until the job reaches a final status, without blocking the event loop.
+
+        Args:
+            status (Callable): Blocking function returning the current status of the job.
+                It is executed in a separate thread.
+            is_final (Callable): Function checking whether a status is final.
+
+        Returns:
+            The final status of the job.
+        """
+        start = time.monotonic()
+        for interval in self.intervals():
+            current = await asyncio.to_thread(status)
+            if self._check(current, start, interval, is_final):
+                return current
+            await asyncio.sleep(interval)
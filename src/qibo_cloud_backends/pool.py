@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Callable, Hashable, Optional
+
+from qibo.config import raise_error
+
+DEFAULT_MAX_IDLE = 600.0
+
+
+class Pool:
+    """Thread-safe pool of expensive objects, such as backends and provider sessions.
+
+    Objects are created on first request by a factory and shared by all the
+    following requests with the same key. Objects which are not requested for
+    more than ``max_idle`` seconds are dropped, so that stale sessions are
+    eventually renewed.
+
+    Args:
+        max_idle (float): Number of seconds after which unused objects are evicted.
+            If ``None``, objects are kept until explicitly discarded.
+            Defaults to ``600``.
+    """
+
+    def __init__(self, max_idle: Optional[float] = DEFAULT_MAX_IDLE):
+        if max_idle is not None and max_idle <= 0:
+            raise_error(ValueError, f"Idle time must be positive, got {max_idle}.")
+        self.max_idle = max_idle
+        self._entries = {}
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup(self, key: Hashable):
+        # must be called holding the lock
+        now = time.monotonic()
+        if self.max_idle is not None:
+            for stale in [
+                other
+                for other, (used, _) in self._entries.items()
+                if now - used > self.max_idle
+            ]:
+                del self._entries[stale]
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries[key] = (now, entry[1])
+        return entry
+
+    def get(self, key: Hashable, factory: Callable):
+        """Returns the object pooled under ``key``, creating it if needed.
+
+        Concurrent requests of a missing key wait for a single construction,
+        while requests of other keys are not blocked.
+
+        Args:
+            key (Hashable): Identifier of the object.
+            factory (Callable): Function creating the object, called without arguments.
+
+        Returns:
+            The pooled object.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[1]
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    return entry[1]
+            instance = factory()
+            with self._lock:
+                self._entries[key] = (time.monotonic(), instance)
+                self._building.pop(key, None)
+        return instance
+
+    def keys(self) -> list:
+        """Returns the keys of the pooled objects."""
+        with self._lock:
+            return list(self._entries)
+
+    def discard(self, key: Hashable):
+        """Drops the object pooled under ``key``, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drops all the pooled objects."""
+        with self._lock:
+            self._entries.clear()
+
+
+PROVIDERS = Pool()
+"""Pool of the provider objects, shared by all the backends authenticating with the same credentials."""
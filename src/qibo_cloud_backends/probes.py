@@ -0,0 +1,165 @@
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import requests
+
+QIBO_CLIENT_URL = "https://cloud.qibo.science/api/disk_quota/"
+IBM_LOGIN_URL = "https://auth.quantum-computing.ibm.com/api/users/loginWithToken"
+# the list of the backends is public, the one of the jobs requires a valid token
+IONQ_URL = "https://api.ionq.co/v0.3/jobs"
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_TTL = 60.0
+
+# connections are kept alive between probes
+_session = requests.Session()
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Outcome of the availability check of a cloud client.
+
+    Args:
+        client (str): Name of the probed client.
+        available (bool): Whether the client can be loaded.
+        reason (str): Why the client is not available, ``None`` if it is.
+        elapsed (float): Duration of the probe, in seconds.
+    """
+
+    client: str
+    available: bool
+    reason: Optional[str]
+    elapsed: float
+
+
+def _require(package: str):
+    if importlib.util.find_spec(package) is None:
+        raise ImportError(f"package `{package}` is not installed")
+
+
+def _require_token(token: Optional[str]):
+    if not token:
+        raise RuntimeError("no token provided")
+
+
+def _probe_qibo_client(token: Optional[str], timeout: float):
+    _require("qibo_client")
+    _require_token(token)
+    response = _session.get(
+        QIBO_CLIENT_URL, headers={"x-api-token": token}, timeout=timeout
+    )
+    response.raise_for_status()
+
+
+def _probe_qiskit_client(token: Optional[str], timeout: float):
+    _require("qiskit_ibm_provider")
+    _require_token(token)
+    response = _session.post(IBM_LOGIN_URL, json={"apiToken": token}, timeout=timeout)
+    response.raise_for_status()
+
+
+def _probe_ionq_client(token: Optional[str], timeout: float):
+    _require("qiskit_ionq")
+    _require_token(token)
+    response = _session.get(
+        IONQ_URL,
+        params={"limit": 1},
+        headers={"Authorization": f"apiKey {token}"},
+        timeout=timeout,
+    )
+    if response.status_code in (401, 403):
+        raise RuntimeError(f"token rejected with status {response.status_code}")
+    response.raise_for_status()
+
+
+def _probe_braket_client(token: Optional[str], timeout: float):
+    # the default device is the local simulator, which needs no connection
+    _require("braket.devices")
+    _require("braket.default_simulator")
+
+
+# Each probe raises if the client cannot be used, performing at most one lightweight
+# authenticated request instead of constructing the provider objects
+PROBES: Dict[str, Callable] = {
+    "ionq-client": _probe_ionq_client,
+    "qibo-client": _probe_qibo_client,
+    "qiskit-client": _probe_qiskit_client,
+    "braket-client": _probe_braket_client,
+}
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _run(client: str, token: Optional[str], timeout: float) -> ProbeResult:
+    start = time.monotonic()
+    try:
+        PROBES[client](token, timeout)
+    except Exception as exception:  # pylint: disable=broad-except
+        reason = f"{type(exception).__name__}: {exception}"
+        return ProbeResult(client, False, reason, time.monotonic() - start)
+    return ProbeResult(client, True, None, time.monotonic() - start)
+
+
+def probe(
+    tokens: Dict[str, Optional[str]],
+    timeout: float = DEFAULT_TIMEOUT,
+    ttl: float = DEFAULT_TTL,
+) -> Dict[str, ProbeResult]:
+    """Checks concurrently the availability of a set of cloud clients.
+
+    Results are cached for ``ttl`` seconds per client and token. A client whose
+    probe does not complete within ``timeout`` seconds is reported as unavailable,
+    without waiting for it any further.
+
+    Args:
+        tokens (dict): Mapping between the clients to probe and their tokens.
+        timeout (float): Maximum number of seconds to wait for the probes.
+            Defaults to ``10``.
+        ttl (float): Number of seconds a probe result is reused for. Defaults to ``60``.
+
+    Returns:
+        dict: The :class:`qibo_cloud_backends.probes.ProbeResult` of each client.
+    """
+    now = time.monotonic()
+    results, pending = {}, {}
+    with _lock:
+        for client, token in tokens.items():
+            cached = _cache.get((client, token))
+            if cached is not None and now - cached[0] < ttl:
+                results[client] = cached[1]
+            else:
+                pending[client] = token
+    if not pending:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=len(pending))
+    futures = {
+        client: executor.submit(_run, client, token, timeout)
+        for client, token in pending.items()
+    }
+    wait(futures.values(), timeout=timeout)
+    # probes still running are abandoned, their threads terminate on their own
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    with _lock:
+        for client, future in futures.items():
+            if future.done():
+                result = future.result()
+                _cache[(client, pending[client])] = (now, result)
+            else:
+                result = ProbeResult(
+                    client, False, f"timed out after {timeout:.1f}s", timeout
+                )
+            results[client] = result
+    return {client: results[client] for client in tokens}
+
+
+def clear_cache():
+    """Forgets all the cached probe results."""
+    with _lock:
+        _cache.clear()
@@ -1,11 +1,15 @@
 import os
 
 import qibo_client
-from qibo.backends import NumpyBackend
 from qibo.config import raise_error
 
+from qibo_cloud_backends.abstract import CloudBackend
+from qibo_cloud_backends.jobs import QiboClientJob
+from qibo_cloud_backends.limits import credentials_id
+from qibo_cloud_backends.utils import batched
 
-class QiboClientBackend(NumpyBackend):
+
+class QiboClientBackend(CloudBackend):
     """Backend for the remote execution of Qibo circuits.
 
     Args:
@@ -34,31 +38,122 @@ class QiboClientBackend(NumpyBackend):
         self.project = project if project is not None else "personal"
         self.platform = platform if platform is not None else "k2"
         self.name = "qibo-client"
+        self.credentials = credentials_id(token)
         self.verbosity = verbosity
         self.client = qibo_client.Client(token)
 
-    def execute_circuit(self, circuit, initial_state=None, nshots=1000, verbatim=False):
-        """Executes the passed circuit.
+    def submit_circuit(self, circuit, initial_state=None, nshots=1000, verbatim=False):
+        """Submits the passed circuit without waiting for its execution.
 
         Args:
             circuit (qibo.models.Circuit): The circuit to execute.
             initial_state (ndarray): The initial state of the circuit. Defaults to `|00...0>`.
-            nshots (int): Total number of shots. Defaults to ``1000``.
+            nshots (int): Total number of shots. If it exceeds ``max_shots``, the execution is split in several jobs. Defaults to ``1000``.
             verbatim (bool): Whether to trigger the automatic transpilation (``verbatim=False``) or execute the circuit as is. Defaults to ``False``.
 
         Returns:
-            (qibo.result) The qibo result object containing the outcome of the circuit execution.
+            (qibo_cloud_backends.jobs.QiboClientJob) The handle of the submitted job.
         """
         if initial_state is not None:
             raise_error(
                 NotImplementedError,
                 "The use of an `initial_state` is not supported yet.",
             )
-        job = self.client.run_circuit(
+
+        def submit(shots):
+            job = self.client.run_circuit(
+                circuit,
+                nshots=shots,
+                device=self.platform,
+                project=self.project,
+                verbatim=verbatim,
+            )
+            return QiboClientJob(job, circuit, shots, self)
+
+        return self._split(circuit, nshots, submit)
+
+    def attach(self, job_id, circuit, nshots):
+        """Builds the handle of a job submitted before, e.g. by another process.
+
+        Args:
+            job_id (str): Identifier of the job on the server.
+            circuit (qibo.models.Circuit): The submitted circuit.
+            nshots (int): Number of shots of the job.
+
+        Returns:
+            (qibo_cloud_backends.jobs.QiboClientJob) The handle of the job.
+        """
+        return QiboClientJob(self.client.get_job(job_id), circuit, nshots, self)
+
+    def execute_circuit(
+        self, circuit, initial_state=None, nshots=1000, verbatim=False, adaptive=None
+    ):
+        """Executes the passed circuit.
+
+        Args:
+            circuit (qibo.models.Circuit): The circuit to execute.
+            initial_state (ndarray): The initial state of the circuit. Defaults to `|00...0>`.
+            nshots (int): Total number of shots. Defaults to ``1000``.
+            verbatim (bool): Whether to trigger the automatic transpilation (``verbatim=False``) or execute the circuit as is. Defaults to ``False``.
+            adaptive (:class:`qibo_cloud_backends.adaptive.AdaptiveShots`): If given, the
+                shots are executed in increments until the outcome probabilities reach the
+                target precision, ``nshots`` being the shot budget. Defaults to ``None``.
+
+        Returns:
+            (qibo.result) The qibo result object containing the outcome of the circuit execution.
+        """
+        return self._execute(
             circuit,
-            nshots=nshots,
-            device=self.platform,
-            project=self.project,
+            nshots,
+            lambda shots: self.submit_circuit(circuit, initial_state, shots, verbatim),
+            adaptive,
+            initial_state=initial_state,
             verbatim=verbatim,
         )
-        return job.result(verbose=self.verbosity)
+
+    def submit_circuits(self, circuits, nshots=1000, verbatim=False):
+        """Queues a list of circuits on the server without waiting for their execution.
+
+        Args:
+            circuits (list): The circuits to execute.
+            nshots (int): Total number of shots for each circuit. Defaults to ``1000``.
+            verbatim (bool): Whether to trigger the automatic transpilation (``verbatim=False``) or execute the circuits as they are. Defaults to ``False``.
+
+        Returns:
+            (list) The handles of the submitted jobs, in input order.
+        """
+        return [
+            self.submit_circuit(circuit, nshots=nshots, verbatim=verbatim)
+            for circuit in circuits
+        ]
+
+    def execute_circuits(
+        self,
+        circuits,
+        initial_states=None,
+        nshots=1000,
+        verbatim=False,
+        batch_size=None,
+    ):
+        """Executes a list of circuits, queueing the jobs on the server before waiting for any of them.
+
+        Args:
+            circuits (list): The circuits to execute.
+            initial_states (list): Not supported, must be ``None``.
+            nshots (int): Total number of shots for each circuit. Defaults to ``1000``.
+            verbatim (bool): Whether to trigger the automatic transpilation (``verbatim=False``) or execute the circuits as they are. Defaults to ``False``.
+            batch_size (int): Maximum number of jobs queued at the same time. If ``None``, all the jobs are queued at once. Defaults to ``None``.
+
+        Returns:
+            (list) The qibo result objects of each circuit, in input order.
+        """
+        if initial_states is not None:
+            raise_error(
+                NotImplementedError,
+                "The use of an `initial_state` is not supported yet.",
+            )
+        results = []
+        for chunk in batched(circuits, batch_size):
+            jobs = self.submit_circuits(chunk, nshots, verbatim)
+            results += [job.result() for job in jobs]
+        return results
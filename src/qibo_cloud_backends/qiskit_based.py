@@ -0,0 +1,184 @@
+from qibo.config import raise_error
+
+from qibo_cloud_backends.abstract import CloudBackend
+from qibo_cloud_backends.jobs import QiskitJob
+from qibo_cloud_backends.qiskit_translation import supports, to_qiskit
+from qibo_cloud_backends.timing import Timings
+from qibo_cloud_backends.utils import batched, sweep_values
+
+
+class QiskitBasedBackend(CloudBackend):
+    """Base class of the backends executing Qibo circuits, translated to qiskit circuits,
+    on the ``backend`` attribute, a qiskit backend of the provider.
+
+    Subclasses load the provider and its ``backend`` in ``__init__`` and implement
+    :meth:`attach`, which depends on how the provider retrieves the jobs.
+    """
+
+    backend = None
+
+    def supports(self, circuit) -> bool:
+        return supports(circuit)
+
+    def submit_circuit(self, circuit, initial_state=None, nshots=1000, **kwargs):
+        """Submits the passed circuit without waiting for its execution.
+
+        Args:
+            circuit (qibo.models.Circuit): The circuit to execute.
+            initial_state (ndarray): The initial state of the circuit.
+                Defaults to :math:`\\ket{0}^{\\otimes n}`.
+            nshots (int): Total number of shots. If it exceeds ``max_shots``, the execution
+                is split in several jobs.
+            kwargs (dict): Additional keyword arguments passed to the qiskit backends'
+                `run()` method.
+        Returns:
+            :class:`qibo_cloud_backends.jobs.QiskitJob`: Handle of the submitted job.
+        """
+        if initial_state is not None:
+            raise_error(
+                NotImplementedError,
+                "The use of an `initial_state` is not supported yet.",
+            )
+        if not circuit.measurements:
+            raise_error(RuntimeError, "No measurement found in the provided circuit.")
+        timings = Timings()
+        with timings.stage("translate"):
+            qiskit_circuit = to_qiskit(circuit)
+
+        def submit(shots):
+            job = self.backend.run(qiskit_circuit, shots=shots, **kwargs)
+            return QiskitJob(job, circuit, shots, self)
+
+        return self._split(circuit, nshots, submit, timings)
+
+    def execute_circuit(
+        self, circuit, initial_state=None, nshots=1000, adaptive=None, **kwargs
+    ):
+        """Executes the passed circuit.
+
+        Args:
+            circuit (qibo.models.Circuit): The circuit to execute.
+            initial_state (ndarray): The initial state of the circuit.
+                Defaults to :math:`\\ket{0}^{\\otimes n}`.
+            nshots (int): Total number of shots.
+            adaptive (:class:`qibo_cloud_backends.adaptive.AdaptiveShots`): If given, the
+                shots are executed in increments until the outcome probabilities reach the
+                target precision, ``nshots`` being the shot budget. Defaults to ``None``.
+            kwargs (dict): Additional keyword arguments passed to the qiskit backends'
+                `run()` method.
+        Returns:
+            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+        """
+        return self._execute(
+            circuit,
+            nshots,
+            lambda shots: self.submit_circuit(circuit, initial_state, shots, **kwargs),
+            adaptive,
+            initial_state=initial_state,
+            **kwargs,
+        )
+
+    def submit_circuits(self, circuits, nshots=1000, batch_size=None, **kwargs):
+        """Submits a list of circuits as multi-circuit jobs, without waiting for their execution.
+
+        Args:
+            circuits (list): List of :class:`qibo.models.Circuit` to be executed.
+            nshots (int): Total number of shots for each circuit. If it exceeds ``max_shots``,
+                each circuit is submitted separately, split in several jobs.
+            batch_size (int): Maximum number of circuits per job. If ``None``,
+                the limit advertised by the backend is used, if any. Defaults to ``None``.
+            kwargs (dict): Additional keyword arguments passed to the
+                qiskit backends' `run()` method.
+
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.QiskitJob` handles, in input order.
+        """
+        for circuit in circuits:
+            if not circuit.measurements:
+                raise_error(
+                    RuntimeError, "No measurement found in the provided circuit."
+                )
+        if self._exceeds_max_shots(nshots):
+            return [
+                self.submit_circuit(circuit, nshots=nshots, **kwargs)
+                for circuit in circuits
+            ]
+        qiskit_circuits = (to_qiskit(circuit) for circuit in circuits)
+        return self._run(circuits, qiskit_circuits, nshots, batch_size, **kwargs)
+
+    def _run(self, circuits, qiskit_circuits, nshots, batch_size=None, **kwargs):
+        if batch_size is None:
+            batch_size = getattr(self.backend, "max_circuits", None)
+
+        def submit(chunk):
+            job = self.backend.run([pair[1] for pair in chunk], shots=nshots, **kwargs)
+            return [
+                QiskitJob(job, pair[0], nshots, self, index)
+                for index, pair in enumerate(chunk)
+            ]
+
+        jobs = []
+        for chunk in batched(zip(circuits, qiskit_circuits), batch_size):
+            # the circuits of a chunk are submitted as a single job
+            jobs += self._limited(lambda chunk=chunk: submit(chunk))
+        return jobs
+
+    def submit_sweep(
+        self, circuit, parameter_values, nshots=1000, batch_size=None, **kwargs
+    ):
+        """Submits a parametric circuit with several sets of parameters as multi-circuit jobs,
+        translating the circuit only once and binding each parameter set to the translation.
+
+        Args:
+            circuit (:class:`qibo.models.Circuit`): The parametric circuit.
+            parameter_values (ndarray): The ``(n_sets, n_parameters)`` parameter values,
+                listing the parameters of the trainable gates in the order of
+                :meth:`qibo.models.Circuit.get_parameters`.
+            nshots (int): Total number of shots for each parameter set.
+                Defaults to :math:`10^{3}`.
+            batch_size (int): Maximum number of parameter sets per job. If ``None``,
+                the limit advertised by the backend is used, if any. Defaults to ``None``.
+            kwargs (dict): Additional keyword arguments passed to the
+                qiskit backends' `run()` method.
+
+        Returns:
+            list: The :class:`qibo_cloud_backends.jobs.QiskitJob` handles, one per parameter set.
+        """
+        if not circuit.measurements:
+            raise_error(RuntimeError, "No measurement found in the provided circuit.")
+        values = sweep_values(circuit, parameter_values)
+        if self._exceeds_max_shots(nshots):
+            return super().submit_sweep(
+                circuit, values, nshots, batch_size=batch_size, **kwargs
+            )
+
+        template = to_qiskit(circuit, parametric=True)
+        qiskit_circuits = (template.assign_parameters(row) for row in values)
+        return self._run(
+            [circuit] * len(values), qiskit_circuits, nshots, batch_size, **kwargs
+        )
+
+    def execute_circuits(
+        self, circuits, initial_states=None, nshots=1000, batch_size=None, **kwargs
+    ):
+        """Executes a list of circuits, submitting them together as multi-circuit jobs.
+
+        Args:
+            circuits (list): List of :class:`qibo.models.Circuit` to be executed.
+            initial_states (list): Not supported, must be ``None``.
+            nshots (int): Total number of shots for each circuit.
+            batch_size (int): Maximum number of circuits per job. If ``None``,
+                the limit advertised by the backend is used, if any. Defaults to ``None``.
+            kwargs (dict): Additional keyword arguments passed to the
+                qiskit backends' `run()` method.
+
+        Returns:
+            list: The :class:`qibo.result.MeasurementOutcomes` of each circuit, in input order.
+        """
+        if initial_states is not None:
+            raise_error(
+                NotImplementedError,
+                "The use of an `initial_state` is not supported yet.",
+            )
+        jobs = self.submit_circuits(circuits, nshots, batch_size, **kwargs)
+        return [job.result() for job in jobs]
@@ -1,14 +1,16 @@
 import os
-from itertools import repeat
 
-from qibo.backends import NumpyBackend
 from qibo.config import raise_error
-from qibo.result import MeasurementOutcomes
-from qiskit import QuantumCircuit
 from qiskit_ibm_provider import IBMProvider  # type: ignore
 
+from qibo_cloud_backends.jobs import QiskitJob
+from qibo_cloud_backends.limits import credentials_id
+from qibo_cloud_backends.pool import PROVIDERS
+from qibo_cloud_backends.qiskit_based import QiskitBasedBackend
+from qibo_cloud_backends.utils import qiskit_max_shots
 
-class QiskitClientBackend(NumpyBackend):
+
+class QiskitClientBackend(QiskitBasedBackend):
     """Backend for the remote execution of Qiskit circuits on the IBM servers.
 
     Args:
@@ -31,39 +33,25 @@ class QiskitClientBackend(NumpyBackend):
         if platform is None:
             platform = "ibm_kyiv"
         self.name = "qiskit-client"
-        provider = IBMProvider(token)
-        self.backend = provider.get_backend(platform)
+        self.credentials = credentials_id(token)
+        self.platform = platform
+        # the login is shared by all the backends using the same token
+        self.provider = PROVIDERS.get((self.name, token), lambda: IBMProvider(token))
+        self.backend = self.provider.get_backend(platform)
+        self.max_shots = qiskit_max_shots(self.backend)
+
+    def queue_depth(self):
+        status = getattr(self.backend, "status", None)
+        return None if status is None else status().pending_jobs
 
-    def execute_circuit(self, circuit, initial_state=None, nshots=1000, **kwargs):
-        """Executes the passed circuit.
+    def attach(self, job_id, circuit, nshots):
+        """Builds the handle of a job submitted before, e.g. by another process.
 
         Args:
-            circuit (qibo.models.Circuit): The circuit to execute.
-            initial_state (ndarray): The initial state of the circuit.
-                Defaults to :math:`\\ket{0}^{\\otimes n}`.
-            nshots (int): Total number of shots.
-            kwargs (dict): Additional keyword arguments passed to the qiskit backends'
-                `run()` method.
+            job_id (str): Identifier of the job on the IBM servers.
+            circuit (qibo.models.Circuit): The submitted circuit.
+            nshots (int): Number of shots of the job.
         Returns:
-            :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+            :class:`qibo_cloud_backends.jobs.QiskitJob`: Handle of the job.
         """
-        if initial_state is not None:
-            raise_error(
-                NotImplementedError,
-                "The use of an `initial_state` is not supported yet.",
-            )
-        measurements = circuit.measurements
-        if not measurements:
-            raise_error(RuntimeError, "No measurement found in the provided circuit.")
-        circuit = QuantumCircuit.from_qasm_str(circuit.to_qasm())
-        result = self.backend.run(circuit, shots=nshots, **kwargs).result()
-        samples = []
-        for state, count in result.get_counts().items():
-            sample = [int(bit) for bit in reversed(state)]
-            samples += list(repeat(sample, count))
-        return MeasurementOutcomes(
-            measurements,
-            backend=self,
-            samples=self.cast(samples, dtype=int),
-            nshots=nshots,
-        )
+        return QiskitJob(self.provider.retrieve_job(job_id), circuit, nshots, self)
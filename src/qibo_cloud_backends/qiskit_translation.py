@@ -0,0 +1,270 @@
+from functools import singledispatch
+
+import numpy as np
+from qibo import Circuit as QiboCircuit
+from qibo import gates as qibo_gates
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit import ParameterVector
+from qiskit.circuit import library as qiskit_gates
+from qiskit.quantum_info import Operator
+
+from qibo_cloud_backends.utils import count_parameters, is_free
+
+
+def to_qiskit(qibo_circuit: QiboCircuit, parametric: bool = False) -> QuantumCircuit:
+    """Translates a Qibo circuit into a Qiskit circuit, without going through QASM.
+
+    Each measurement gate of the Qibo circuit is mapped to a classical register
+    with the same name and size, as in :meth:`qibo.models.Circuit.to_qasm`, and
+    the measurements are appended at the end of the circuit.
+
+    Args:
+        qibo_circuit (qibo.models.Circuit): The circuit to translate.
+        parametric (bool): If ``True``, the parameters of the trainable gates are replaced by
+            the elements of a :class:`qiskit.circuit.ParameterVector` named ``p``, following
+            the order of :meth:`qibo.models.Circuit.get_parameters`, so that the circuit can
+            be bound to new values with :meth:`qiskit.QuantumCircuit.assign_parameters`.
+            Trainable :class:`qibo.gates.Unitary` gates keep their current matrix.
+            Defaults to ``False``.
+
+    Returns:
+        :class:`qiskit.QuantumCircuit`: The translated circuit.
+    """
+    if parametric:
+        symbols = iter(ParameterVector("p", count_parameters(qibo_circuit)))
+    qubits = QuantumRegister(qibo_circuit.nqubits, "q")
+    registers = {
+        register: ClassicalRegister(len(measured), register)
+        for register, measured in qibo_circuit.measurement_tuples.items()
+    }
+    circuit = QuantumCircuit(qubits, *registers.values())
+
+    # Add gates
+    for gate in qibo_circuit.queue:
+        if isinstance(gate, qibo_gates.M):
+            continue
+
+        if parametric and is_free(gate):
+            operator = _translate_op(
+                gate, [next(symbols) for _ in range(len(gate.parameters))]
+            )
+        else:
+            operator = _translate_op(gate)
+        circuit.append(operator, [qubits[q] for q in gate.qubits], copy=False)
+
+    # Add measurements
+    for register, measured in qibo_circuit.measurement_tuples.items():
+        circuit.measure([qubits[q] for q in measured], registers[register])
+
+    return circuit
+
+
+def supports(qibo_circuit: QiboCircuit) -> bool:
+    """Checks whether all the gates of a Qibo circuit can be translated to Qiskit.
+
+    Args:
+        qibo_circuit (qibo.models.Circuit): The circuit to check.
+
+    Returns:
+        bool: ``True`` if the circuit can be translated.
+    """
+    unsupported = _translate_op.dispatch(object)
+    return all(
+        isinstance(gate, qibo_gates.M)
+        or _translate_op.dispatch(type(gate)) is not unsupported
+        for gate in qibo_circuit.queue
+    )
+
+
+@singledispatch
+def _translate_op(g, parameters=None):
+    raise NotImplementedError(f"Qiskit translation does not support gate {g}")
+
+
+def _parameters(g, parameters):
+    return g.parameters if parameters is None else parameters
+
+
+@_translate_op.register
+def _(_: qibo_gates.I):
+    return qiskit_gates.IGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.H):
+    return qiskit_gates.HGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.X):
+    return qiskit_gates.XGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.Y):
+    return qiskit_gates.YGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.Z):
+    return qiskit_gates.ZGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.S):
+    return qiskit_gates.SGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.SDG):
+    return qiskit_gates.SdgGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.T):
+    return qiskit_gates.TGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.TDG):
+    return qiskit_gates.TdgGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.SX):
+    return qiskit_gates.SXGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.SXDG):
+    return qiskit_gates.SXdgGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.CNOT):
+    return qiskit_gates.CXGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.CY):
+    return qiskit_gates.CYGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.CZ):
+    return qiskit_gates.CZGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.CSX):
+    return qiskit_gates.CSXGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.SWAP):
+    return qiskit_gates.SwapGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.iSWAP):
+    return qiskit_gates.iSwapGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.ECR):
+    return qiskit_gates.ECRGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.TOFFOLI):
+    return qiskit_gates.CCXGate()
+
+
+@_translate_op.register
+def _(_: qibo_gates.CCZ):
+    return qiskit_gates.CCZGate()
+
+
+@_translate_op.register
+def _(g: qibo_gates.RX, parameters=None):
+    return qiskit_gates.RXGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.RY, parameters=None):
+    return qiskit_gates.RYGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.RZ, parameters=None):
+    return qiskit_gates.RZGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.U1, parameters=None):
+    return qiskit_gates.PhaseGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.U2, parameters=None):
+    parameters = _parameters(g, parameters)
+    return qiskit_gates.UGate(np.pi / 2, parameters[0], parameters[1])
+
+
+@_translate_op.register
+def _(g: qibo_gates.U3, parameters=None):
+    parameters = _parameters(g, parameters)
+    return qiskit_gates.UGate(parameters[0], parameters[1], parameters[2])
+
+
+@_translate_op.register
+def _(g: qibo_gates.CRX, parameters=None):
+    return qiskit_gates.CRXGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.CRY, parameters=None):
+    return qiskit_gates.CRYGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.CRZ, parameters=None):
+    return qiskit_gates.CRZGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.CU1, parameters=None):
+    return qiskit_gates.CPhaseGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.CU3, parameters=None):
+    theta, phi, lam = _parameters(g, parameters)
+    # Qibo's U3 carries the global phase exp(-i(phi + lam) / 2), which matters once controlled
+    return qiskit_gates.CUGate(theta, phi, lam, -(phi + lam) / 2)
+
+
+@_translate_op.register
+def _(g: qibo_gates.RXX, parameters=None):
+    return qiskit_gates.RXXGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.RYY, parameters=None):
+    return qiskit_gates.RYYGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.RZZ, parameters=None):
+    return qiskit_gates.RZZGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.RZX, parameters=None):
+    return qiskit_gates.RZXGate(_parameters(g, parameters)[0])
+
+
+@_translate_op.register
+def _(g: qibo_gates.Unitary):
+    # Qiskit orders the qubits of a matrix starting from the least significant one
+    return qiskit_gates.UnitaryGate(Operator(g.matrix()).reverse_qargs())
@@ -0,0 +1,258 @@
+import random
+import time
+from typing import Callable, Optional
+
+from qibo.config import log, raise_error
+
+from qibo_cloud_backends.polling import PollingTimeoutError
+
+TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+"""HTTP status codes of the responses worth retrying."""
+
+TRANSIENT_ERROR_CODES = (
+    "RequestTimeout",
+    "RequestTimeoutException",
+    "ServiceUnavailable",
+    "ServiceUnavailableException",
+    "InternalServerError",
+    "InternalFailure",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+)
+"""Error codes of the AWS responses worth retrying."""
+
+# exceptions of the HTTP libraries used by the provider SDKs, matched by name so that
+# the SDKs are not imported
+TRANSIENT_EXCEPTIONS = (
+    "ConnectionError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "Timeout",
+    "ReadTimeoutError",
+    "ConnectTimeoutError",
+    "ProtocolError",
+    "ChunkedEncodingError",
+    "EndpointConnectionError",
+    "ConnectionClosedError",
+)
+
+UNSENT_STATUS_CODES = (429, 503)
+"""HTTP status codes of the responses rejecting a request before processing it."""
+
+UNSENT_ERROR_CODES = (
+    "ServiceUnavailable",
+    "ServiceUnavailableException",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+)
+"""Error codes of the AWS responses rejecting a request before processing it."""
+
+# exceptions raised while connecting, before any byte of the request is sent
+UNSENT_EXCEPTIONS = (
+    "ConnectionRefusedError",
+    "ConnectTimeout",
+    "ConnectTimeoutError",
+    "NewConnectionError",
+    "EndpointConnectionError",
+)
+
+
+def _status_code(exception) -> Optional[int]:
+    for owner in (exception, getattr(exception, "response", None)):
+        for attribute in ("status_code", "status"):
+            code = getattr(owner, attribute, None)
+            if isinstance(code, int):
+                return code
+    response = getattr(exception, "response", None)
+    if isinstance(response, dict):
+        return response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return None
+
+
+def is_transient(exception: BaseException) -> bool:
+    """Checks whether an error is transient, hence worth retrying.
+
+    Network failures and timeouts of the HTTP clients are transient, as well as the
+    responses reporting throttling or the temporary unavailability of the service,
+    e.g. with the ``429`` and ``503`` HTTP status codes.
+
+    Args:
+        exception (Exception): The error raised by the provider's SDK.
+
+    Returns:
+        bool: ``True`` if the error is transient.
+    """
+    if isinstance(exception, PollingTimeoutError):
+        return False
+    if isinstance(exception, (ConnectionError, TimeoutError)):
+        return True
+    if any(cls.__name__ in TRANSIENT_EXCEPTIONS for cls in type(exception).__mro__):
+        return True
+    if _status_code(exception) in TRANSIENT_STATUS_CODES:
+        return True
+    response = getattr(exception, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code") in TRANSIENT_ERROR_CODES
+    return False
+
+
+def _causes(exception: BaseException):
+    # the HTTP libraries wrap the connection errors, e.g. in ``MaxRetryError.reason``
+    seen = []
+    while isinstance(exception, BaseException) and exception not in seen:
+        seen.append(exception)
+        yield exception
+        exception = (
+            exception.__cause__
+            or exception.__context__
+            or getattr(exception, "reason", None)
+        )
+
+
+def is_unsent(exception: BaseException) -> bool:
+    """Checks whether an error is known to happen before the provider received the
+    request, hence safe to retry even for requests which are not idempotent, such as
+    the submissions of new jobs.
+
+    Failed connections are unsent, as well as the responses rejecting the request
+    because of throttling or the temporary unavailability of the service, e.g. with
+    the ``429`` and ``503`` HTTP status codes. Read timeouts and dropped connections
+    are not, since the provider may have created the job anyway.
+
+    Args:
+        exception (Exception): The error raised by the provider's SDK.
+
+    Returns:
+        bool: ``True`` if the request did not reach the provider.
+    """
+    for cause in _causes(exception):
+        if any(cls.__name__ in UNSENT_EXCEPTIONS for cls in type(cause).__mro__):
+            return True
+        if _status_code(cause) in UNSENT_STATUS_CODES:
+            return True
+        response = getattr(cause, "response", None)
+        if isinstance(response, dict):
+            if response.get("Error", {}).get("Code") in UNSENT_ERROR_CODES:
+                return True
+    return False
+
+
+class RetryPolicy:
+    """Retries the requests to the providers failing with transient errors, with
+    exponential backoff and jitter.
+
+    Args:
+        attempts (int): Maximum number of attempts, including the first one.
+            Defaults to ``5``.
+        interval (float): Seconds before the first retry. Defaults to ``1``.
+        max_interval (float): Maximum number of seconds between two attempts.
+            Defaults to ``30``.
+        backoff (float): Multiplicative growth factor of the interval. Defaults to ``2``.
+        jitter (float): Relative random variation applied to every interval.
+            Defaults to ``0.1``.
+        deadline (float): Maximum number of seconds spent retrying a request, after
+            which the last error is raised. If ``None``, only the number of ``attempts``
+            is limited. Defaults to ``120``.
+        retryable (Callable): Function classifying the errors worth retrying.
+            Defaults to :func:`qibo_cloud_backends.retry.is_transient`.
+        resubmittable (Callable): Function classifying the errors of the submissions
+            worth retrying. A submission failing after reaching the provider may have
+            created the job anyway, hence the default only retries the errors raised
+            before the request was sent, so that jobs are never submitted twice.
+            Defaults to :func:`qibo_cloud_backends.retry.is_unsent`.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 5,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        jitter: float = 0.1,
+        deadline: Optional[float] = 120.0,
+        retryable: Callable = is_transient,
+        resubmittable: Callable = is_unsent,
+    ):
+        if attempts < 1:
+            raise_error(ValueError, f"Attempts must be at least 1, got {attempts}.")
+        if interval <= 0 or max_interval < interval:
+            raise_error(
+                ValueError,
+                "Retry intervals must satisfy `0 < interval <= max_interval`.",
+            )
+        if backoff < 1:
+            raise_error(
+                ValueError, f"Backoff factor must be at least 1, got {backoff}."
+            )
+        if not 0 <= jitter < 1:
+            raise_error(ValueError, f"Jitter must be in [0, 1), got {jitter}.")
+        self.attempts = attempts
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retryable = retryable
+        self.resubmittable = resubmittable
+
+    def intervals(self):
+        """Generates the sequence of waiting intervals between the attempts, in seconds."""
+        interval = self.interval
+        while True:
+            yield interval * (1 + random.uniform(-self.jitter, self.jitter))
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def call(
+        self,
+        function: Callable,
+        description: str = "request",
+        before_retry: Optional[Callable] = None,
+        retryable: Optional[Callable] = None,
+    ):
+        """Calls a function, retrying it while it fails with retryable errors.
+
+        Args:
+            function (Callable): The function performing the request, called without
+                arguments.
+            description (str): Description of the request, used in the logs.
+                Defaults to ``"request"``.
+            before_retry (Callable): Function called without arguments before every
+                retry, e.g. to reconnect. Its failures are logged and ignored.
+                Defaults to ``None``.
+            retryable (Callable): Function classifying the errors worth retrying. If
+                ``None``, the ``retryable`` attribute of the policy is used.
+                Defaults to ``None``.
+
+        Returns:
+            The value returned by ``function``.
+        """
+        if retryable is None:
+            retryable = self.retryable
+        start = time.monotonic()
+        intervals = self.intervals()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return function()
+            except Exception as exception:
+                interval = next(intervals)
+                elapsed = time.monotonic() - start
+                if (
+                    attempt == self.attempts
+                    or not retryable(exception)
+                    or (
+                        self.deadline is not None and elapsed + interval > self.deadline
+                    )
+                ):
+                    raise
+                log.warning(
+                    f"The {description} failed with {exception!r}, "
+                    + f"retrying in {interval:.1f}s ({attempt}/{self.attempts - 1})."
+                )
+            time.sleep(interval)
+            if before_retry is not None:
+                try:
+                    before_retry()
+                except Exception as exception:  # pylint: disable=broad-except
+                    log.warning(f"Cannot prepare the retry: {exception!r}")
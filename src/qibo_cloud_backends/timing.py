@@ -0,0 +1,111 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from qibo.config import log
+
+
+@dataclass
+class Timings:
+    """Timing breakdown of a circuit execution, attached as the ``timings`` attribute
+    of the results returned by the cloud backends.
+
+    The stages measured on the client are:
+
+    - ``translate``: translation of the circuit to the provider's format;
+    - ``submit``: upload of the circuit, until the provider returns the job;
+    - ``wait``: polling of the job status, covering queueing and execution on the device,
+      only measured when the backend defines a :class:`qibo_cloud_backends.polling.Poller`
+      (otherwise, the waiting is part of ``download``);
+    - ``download``: retrieval of the result from the provider;
+    - ``decode``: construction of the :class:`qibo.result.MeasurementOutcomes`;
+    - ``cache``: lookup of the result in the backend's cache, on cache hits.
+
+    Args:
+        route (str): The ``name:platform`` of the backend which executed the circuit.
+        job_id (str): Identifier of the job on the provider's servers.
+        nshots (int): Total number of shots.
+        stages (dict): Mapping between the stages and their ``(start, end)`` timestamps,
+            in seconds, as returned by :func:`time.monotonic`.
+        provider (dict): Durations reported by the provider, in seconds, such as the
+            ``queue`` and ``execution`` times, when available.
+        removed_gates (int): Number of gates removed by the optimization of the circuit
+            during the translation, when enabled.
+    """
+
+    route: Optional[str] = None
+    job_id: Optional[str] = None
+    nshots: Optional[int] = None
+    stages: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    provider: Dict[str, float] = field(default_factory=dict)
+    removed_gates: Optional[int] = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager recording the start and end timestamps of a stage."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stages[name] = (start, time.monotonic())
+
+    def durations(self) -> Dict[str, float]:
+        """Returns the duration of each recorded stage, in seconds."""
+        return {name: end - start for name, (start, end) in self.stages.items()}
+
+    @property
+    def total(self) -> float:
+        """Seconds elapsed between the start of the first stage and the end of the last one."""
+        if not self.stages:
+            return 0.0
+        starts, ends = zip(*self.stages.values())
+        return max(ends) - min(starts)
+
+
+def report(timings: Timings, callback):
+    """Forwards the timings of an execution to a callback, logging its failures instead
+    of propagating them, so that the tracing never interrupts the executions."""
+    if callback is None:
+        return
+    try:
+        callback(timings)
+    except Exception as exception:  # pylint: disable=broad-except
+        log.warning(f"Timing callback failed: {exception!r}")
+
+
+def _seconds(start, end) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    if isinstance(start, str):
+        start = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        end = datetime.fromisoformat(end.replace("Z", "+00:00"))
+    return (end - start).total_seconds()
+
+
+def braket_timings(result) -> Dict[str, float]:
+    """Reads the durations reported in the metadata of a Braket task result."""
+    metadata = getattr(result, "task_metadata", None)
+    total = _seconds(
+        getattr(metadata, "createdAt", None), getattr(metadata, "endedAt", None)
+    )
+    return {} if total is None else {"total": total}
+
+
+def qiskit_timings(job, result) -> Dict[str, float]:
+    """Reads the durations reported by a qiskit job and its result."""
+    timings = {}
+    time_per_step = getattr(job, "time_per_step", None)
+    steps = time_per_step() if callable(time_per_step) else None
+    if steps:
+        queued = steps.get("QUEUED", steps.get("CREATED"))
+        queue = _seconds(queued, steps.get("RUNNING"))
+        execution = _seconds(steps.get("RUNNING"), steps.get("COMPLETED"))
+        for name, seconds in (("queue", queue), ("execution", execution)):
+            if seconds is not None:
+                timings[name] = seconds
+    time_taken = getattr(result, "time_taken", None)
+    if time_taken is not None:
+        timings.setdefault("execution", float(time_taken))
+    return timings
@@ -0,0 +1,506 @@
+from collections import Counter
+
+import numpy as np
+from qibo import gates
+from qibo.config import raise_error
+from qibo.result import MeasurementOutcomes
+
+RESULT_FORMATS = ("samples", "packed", "counts")
+"""Representations of the results built by the backends, see :func:`bits_to_outcomes`."""
+
+MAX_STACKED_ENTRIES = 2**27
+"""Maximum number of entries of the dense arrays built by :func:`stack_frequencies`,
+i.e. 1 GiB of 64-bit counts."""
+
+
+def _counts_to_bits(counts: dict, little_endian: bool = True):
+    """Decodes the bitstrings of a counts dictionary into a binary matrix.
+
+    Args:
+        counts (dict): Mapping between the measured bitstrings and their number of occurrences.
+            Bitstrings may contain spaces separating the classical registers.
+        little_endian (bool): If ``True``, the first measured bit is the rightmost character
+            of the bitstring, as in the qiskit convention. Defaults to ``True``.
+
+    Returns:
+        (ndarray, ndarray): The ``(n_distinct, n_bits)`` binary matrix of the distinct bitstrings
+        and the corresponding occurrences.
+    """
+    states = [state.replace(" ", "") for state in counts]
+    occurrences = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    if not states:
+        return np.zeros((0, 0), dtype=np.uint8), occurrences
+    bits = np.frombuffer("".join(states).encode(), dtype=np.uint8)
+    bits = bits.reshape(len(states), -1) - ord("0")
+    if little_endian:
+        bits = bits[:, ::-1]
+    return bits, occurrences
+
+
+def _bits_to_frequencies(bits, occurrences) -> Counter:
+    powers = 2 ** np.arange(bits.shape[1] - 1, -1, -1, dtype=np.int64)
+    frequencies = Counter()
+    for state, count in zip((bits @ powers).tolist(), occurrences.tolist()):
+        frequencies[state] += count
+    return frequencies
+
+
+def counts_to_samples(counts: dict, little_endian: bool = True):
+    """Converts a counts dictionary to a binary samples array.
+
+    Args:
+        counts (dict): Mapping between the measured bitstrings and their number of occurrences.
+        little_endian (bool): If ``True``, the first measured bit is the rightmost character
+            of the bitstring, as in the qiskit convention. Defaults to ``True``.
+
+    Returns:
+        ndarray: The ``(nshots, n_bits)`` integer array of samples.
+    """
+    bits, occurrences = _counts_to_bits(counts, little_endian)
+    return np.repeat(bits.astype(np.int64), occurrences, axis=0)
+
+
+def counts_to_frequencies(counts: dict, little_endian: bool = True) -> Counter:
+    """Converts a counts dictionary to the decimal frequencies used by qibo.
+
+    Args:
+        counts (dict): Mapping between the measured bitstrings and their number of occurrences.
+        little_endian (bool): If ``True``, the first measured bit is the rightmost character
+            of the bitstring, as in the qiskit convention. Defaults to ``True``.
+
+    Returns:
+        :class:`collections.Counter`: Mapping between the decimal representation of the
+        measured bitstrings, with the first measured qubit as most significant bit,
+        and their number of occurrences.
+    """
+    bits, occurrences = _counts_to_bits(counts, little_endian)
+    return _bits_to_frequencies(bits, occurrences)
+
+
+def counts_to_outcomes(
+    measurements,
+    counts: dict,
+    backend,
+    nshots: int,
+    little_endian: bool = True,
+    result_format: str = "samples",
+) -> MeasurementOutcomes:
+    """Builds the :class:`qibo.result.MeasurementOutcomes` out of a counts dictionary.
+
+    Args:
+        measurements (list): Measurement gates of the executed circuit.
+        counts (dict): Mapping between the measured bitstrings and their number of occurrences.
+        backend (:class:`qibo.backends.abstract.Backend`): Backend to attach to the outcomes.
+        nshots (int): Total number of shots.
+        little_endian (bool): If ``True``, the first measured bit is the rightmost character
+            of the bitstring, as in the qiskit convention. Defaults to ``True``.
+        result_format (str): Representation of the outcomes, see :func:`bits_to_outcomes`.
+            Defaults to ``"samples"``.
+
+    Returns:
+        :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+    """
+    bits, occurrences = _counts_to_bits(counts, little_endian)
+    return bits_to_outcomes(
+        measurements, bits, occurrences, backend, nshots, result_format
+    )
+
+
+def bits_to_outcomes(
+    measurements, bits, occurrences, backend, nshots: int, result_format="samples"
+) -> MeasurementOutcomes:
+    """Builds the :class:`qibo.result.MeasurementOutcomes` out of the distinct measured
+    bitstrings, in one of the :data:`RESULT_FORMATS`:
+
+    - ``"samples"``: the per-shot samples are built and registered, as ``int64``;
+    - ``"packed"``: a :class:`PackedMeasurementOutcomes`, storing the samples with one bit
+      per measured qubit and shot, which are unpacked only if requested;
+    - ``"counts"``: only the frequencies are registered, the samples are generated by qibo
+      only if requested.
+
+    Args:
+        measurements (list): Measurement gates of the executed circuit.
+        bits (ndarray): ``(n_distinct, n_measured_qubits)`` binary matrix of the distinct
+            measured bitstrings, ordered as the measured qubits.
+        occurrences (ndarray): Number of occurrences of each bitstring.
+        backend (:class:`qibo.backends.abstract.Backend`): Backend to attach to the outcomes.
+        nshots (int): Total number of shots.
+        result_format (str): Representation of the outcomes. Defaults to ``"samples"``.
+
+    Returns:
+        :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+    """
+    _check_format(result_format)
+    if result_format == "samples":
+        samples = np.repeat(bits.astype(np.int64), occurrences, axis=0)
+        return samples_to_outcomes(measurements, samples, backend, nshots)
+    if result_format == "packed":
+        packed = np.repeat(np.packbits(bits, axis=1), occurrences, axis=0)
+        return PackedMeasurementOutcomes(
+            measurements, packed, bits.shape[1], backend, nshots
+        )
+    return frequencies_to_outcomes(measurements, bits, occurrences, backend, nshots)
+
+
+def _check_format(result_format: str):
+    if result_format not in RESULT_FORMATS:
+        raise_error(
+            ValueError,
+            f"Unknown result format {result_format}, expected one of {RESULT_FORMATS}.",
+        )
+
+
+def samples_to_outcomes(
+    measurements, samples, backend, nshots: int, result_format="samples"
+):
+    """Builds the :class:`qibo.result.MeasurementOutcomes` out of binary samples, discarding
+    any result previously registered in the measurement gates.
+
+    Args:
+        measurements (list): Measurement gates of the executed circuit.
+        samples (ndarray): ``(nshots, n_measured_qubits)`` binary samples.
+        backend (:class:`qibo.backends.abstract.Backend`): Backend to attach to the outcomes.
+        nshots (int): Total number of shots.
+        result_format (str): Representation of the outcomes, see :func:`bits_to_outcomes`.
+            Defaults to ``"samples"``.
+
+    Returns:
+        :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+    """
+    _check_format(result_format)
+    if result_format == "packed":
+        samples = np.asarray(samples, dtype=np.uint8)
+        return PackedMeasurementOutcomes(
+            measurements,
+            np.packbits(samples, axis=1),
+            samples.shape[1],
+            backend,
+            nshots,
+        )
+    if result_format == "counts":
+        bits, occurrences = np.unique(
+            np.asarray(samples, dtype=np.uint8), axis=0, return_counts=True
+        )
+        return frequencies_to_outcomes(measurements, bits, occurrences, backend, nshots)
+    for gate in measurements:
+        gate.result.reset()
+    return MeasurementOutcomes(
+        measurements, backend=backend, samples=samples, nshots=nshots
+    )
+
+
+def frequencies_to_outcomes(
+    measurements, bits, occurrences, backend, nshots: int
+) -> MeasurementOutcomes:
+    """Builds the :class:`qibo.result.MeasurementOutcomes` out of the distinct measured
+    bitstrings, without generating the per-shot samples.
+
+    Args:
+        measurements (list): Measurement gates of the executed circuit.
+        bits (ndarray): ``(n_distinct, n_measured_qubits)`` binary matrix of the distinct
+            measured bitstrings, ordered as the measured qubits.
+        occurrences (ndarray): Number of occurrences of each bitstring.
+        backend (:class:`qibo.backends.abstract.Backend`): Backend to attach to the outcomes.
+        nshots (int): Total number of shots.
+
+    Returns:
+        :class:`qibo.result.MeasurementOutcomes`: Outcome of the circuit execution.
+    """
+    outcomes = MeasurementOutcomes(measurements, backend=backend, nshots=nshots)
+    _register_frequencies(outcomes, bits, occurrences)
+    return outcomes
+
+
+def _register_frequencies(outcomes, bits, occurrences):
+    qubits = outcomes.measurement_gate.qubits
+    for gate in outcomes.measurements:
+        indices = [qubits.index(qubit) for qubit in gate.qubits]
+        gate.result.reset()
+        gate.result.register_frequencies(
+            _bits_to_frequencies(bits[:, indices], occurrences)
+        )
+    outcomes._frequencies = _bits_to_frequencies(bits, occurrences)
+
+
+class PackedMeasurementOutcomes(MeasurementOutcomes):
+    """:class:`qibo.result.MeasurementOutcomes` backed by bit-packed samples.
+
+    The samples are stored in the ``packed`` attribute, a ``(nshots, ceil(nbits / 8))``
+    ``uint8`` array in the :func:`numpy.packbits` layout, i.e. one bit per measured qubit
+    and shot, with the first measured qubit as most significant bit of the first byte.
+    The frequencies are computed on the distinct rows of the packed array, while the
+    samples are unpacked only when requested.
+
+    Args:
+        measurements (list): Measurement gates of the executed circuit.
+        packed (ndarray): The bit-packed samples.
+        nbits (int): Number of measured bits.
+        backend (:class:`qibo.backends.abstract.Backend`): Backend to attach to the outcomes.
+        nshots (int): Total number of shots.
+    """
+
+    def __init__(self, measurements, packed, nbits: int, backend=None, nshots=1000):
+        super().__init__(measurements, backend=backend, nshots=nshots)
+        self.packed = packed
+        self.nbits = nbits
+        rows, occurrences = np.unique(packed, axis=0, return_counts=True)
+        bits = np.unpackbits(rows, axis=1, count=nbits)
+        _register_frequencies(self, bits, occurrences)
+
+    def samples(self, binary: bool = True, registers: bool = False):
+        if self._samples is None:
+            samples = np.unpackbits(self.packed, axis=1, count=self.nbits)
+            samples = samples.astype(np.int64)
+            qubits = self.measurement_gate.qubits
+            for gate in self.measurements:
+                indices = [qubits.index(qubit) for qubit in gate.qubits]
+                gate.result.register_samples(samples[:, indices])
+            self._samples = samples
+        return super().samples(binary, registers)
+
+
+def frequencies_to_bits(frequencies: Counter, nbits: int):
+    """Converts decimal frequencies to the distinct bitstrings and their occurrences.
+
+    Args:
+        frequencies (:class:`collections.Counter`): Mapping between the decimal representation
+            of the measured bitstrings, with the first measured qubit as most significant bit,
+            and their number of occurrences.
+        nbits (int): Number of measured bits.
+
+    Returns:
+        (ndarray, ndarray): The ``(n_distinct, nbits)`` binary matrix of the distinct bitstrings
+        and the corresponding occurrences.
+    """
+    states = np.fromiter(frequencies.keys(), dtype=np.int64, count=len(frequencies))
+    occurrences = np.fromiter(
+        frequencies.values(), dtype=np.int64, count=len(frequencies)
+    )
+    shifts = np.arange(nbits - 1, -1, -1, dtype=np.int64)
+    bits = (states[:, None] >> shifts) & 1
+    return bits.astype(np.uint8), occurrences
+
+
+def z_masks(observables, nbits: int):
+    """Converts Pauli-Z strings to binary masks of the measured bits.
+
+    Args:
+        observables (list): Strings of ``"Z"`` and ``"I"`` characters, one per measured
+            bit, ordered as the measured qubits, e.g. ``"ZIZ"`` for :math:`Z_0 Z_2`.
+        nbits (int): Number of measured bits.
+
+    Returns:
+        ndarray: The ``(n_observables, nbits)`` binary matrix, with ones on the bits
+        acted upon by ``Z``.
+    """
+    if isinstance(observables, str):
+        observables = [observables]
+    masks = np.zeros((len(observables), nbits), dtype=np.int64)
+    for mask, observable in zip(masks, observables):
+        observable = observable.upper()
+        if len(observable) != nbits or set(observable) - {"I", "Z"}:
+            raise_error(
+                ValueError,
+                f"Expected a string of {nbits} `Z` or `I` characters, got {observable}.",
+            )
+        mask[:] = [char == "Z" for char in observable]
+    return masks
+
+
+def parity_expectations(bits, occurrences, observables):
+    """Computes the expectation values of Pauli-Z strings out of the distinct measured
+    bitstrings, evaluating the parities of all the observables at once.
+
+    Args:
+        bits (ndarray): ``(n_distinct, n_measured_qubits)`` binary matrix of the distinct
+            measured bitstrings, ordered as the measured qubits.
+        occurrences (ndarray): Number of occurrences of each bitstring.
+        observables (list): The Pauli-Z strings, see :func:`z_masks`.
+
+    Returns:
+        (ndarray, ndarray): The expectation values of the observables and their
+        single-shot variances. The variances of the estimates are obtained dividing
+        the latter by the number of shots.
+    """
+    masks = z_masks(observables, bits.shape[1])
+    signs = 1 - 2 * ((bits.astype(np.int64) @ masks.T) & 1)
+    expectations = occurrences @ signs / occurrences.sum()
+    return expectations, 1 - expectations**2
+
+
+def expectation_from_counts(counts: dict, observables, little_endian: bool = True):
+    """Computes the expectation values of Pauli-Z strings out of a counts dictionary,
+    without expanding it to the per-shot samples.
+
+    Args:
+        counts (dict): Mapping between the measured bitstrings and their number of
+            occurrences, e.g. as returned by qiskit's ``get_counts()`` or Braket's
+            ``measurement_counts``.
+        observables (list): The Pauli-Z strings, see :func:`z_masks`.
+        little_endian (bool): If ``True``, the first measured bit is the rightmost character
+            of the bitstring, as in the qiskit convention. Defaults to ``True``.
+
+    Returns:
+        (ndarray, ndarray): The expectation values of the observables and their
+        single-shot variances, see :func:`parity_expectations`.
+    """
+    bits, occurrences = _counts_to_bits(counts, little_endian)
+    return parity_expectations(bits, occurrences, observables)
+
+
+def split_shots(nshots: int, max_shots=None) -> list:
+    """Splits a number of shots in balanced parts, none of them exceeding ``max_shots``.
+
+    Args:
+        nshots (int): Total number of shots.
+        max_shots (int): Maximum number of shots of each part. If ``None``, the shots
+            are not split. Defaults to ``None``.
+
+    Returns:
+        list: The number of shots of each part.
+    """
+    if max_shots is None or nshots <= max_shots:
+        return [nshots]
+    if max_shots < 1:
+        raise_error(
+            ValueError, f"Shot limit must be a positive integer, got {max_shots}."
+        )
+    parts = -(-nshots // max_shots)
+    size, remainder = divmod(nshots, parts)
+    return [size + 1] * remainder + [size] * (parts - remainder)
+
+
+def qiskit_max_shots(backend):
+    """Reads the maximum number of shots of a job from the configuration of a qiskit backend.
+
+    Args:
+        backend (:class:`qiskit.providers.Backend`): The qiskit backend.
+
+    Returns:
+        int: The shot limit, or ``None`` if the backend does not advertise a meaningful one,
+        e.g. the IonQ simulator, which returns probabilities and reports a limit of one shot.
+    """
+    configuration = getattr(backend, "configuration", None)
+    max_shots = getattr(configuration(), "max_shots", None) if configuration else None
+    if max_shots is None or max_shots <= 1:
+        return None
+    return max_shots
+
+
+def is_free(gate) -> bool:
+    """Checks whether the parameters of a gate are free parameters of a parametric circuit,
+    i.e. whether the gate is trainable. Trainable :class:`qibo.gates.Unitary` gates are the
+    only exception, as their matrix is not a parameter of the translated circuits."""
+    return (
+        isinstance(gate, gates.ParametrizedGate)
+        and gate.trainable
+        and not isinstance(gate, gates.Unitary)
+    )
+
+
+def count_parameters(circuit) -> int:
+    """Counts the free parameters of a circuit, see :func:`is_free`."""
+    return sum(len(gate.parameters) for gate in circuit.queue if is_free(gate))
+
+
+def sweep_values(circuit, parameter_values):
+    """Validates the parameter sets of a sweep.
+
+    Args:
+        circuit (:class:`qibo.models.Circuit`): The parametric circuit.
+        parameter_values (ndarray): The ``(n_sets, n_parameters)`` parameter values, listing
+            the free parameters in the order of :meth:`qibo.models.Circuit.get_parameters`.
+
+    Returns:
+        ndarray: The parameter values, as a 2-D float array.
+    """
+    values = np.asarray(parameter_values, dtype=float)
+    if values.ndim == 1:
+        values = values[None, :]
+    nparams = count_parameters(circuit)
+    if values.ndim != 2 or values.shape[1] != nparams:
+        raise_error(
+            ValueError,
+            f"Expected parameter values of shape (n_sets, {nparams}), "
+            + f"got {values.shape}.",
+        )
+    return values
+
+
+def bind_parameters(circuit, values):
+    """Copies a circuit, replacing the parameters of its free gates.
+
+    Args:
+        circuit (:class:`qibo.models.Circuit`): The parametric circuit.
+        values (ndarray): Flat values of the free parameters, see :func:`sweep_values`.
+
+    Returns:
+        :class:`qibo.models.Circuit`: The circuit with the new parameters.
+    """
+    bound = circuit.copy(deep=True)
+    offset = 0
+    for gate in bound.queue:
+        if is_free(gate):
+            size = len(gate.parameters)
+            gate.parameters = tuple(values[offset : offset + size])
+            offset += size
+    return bound
+
+
+def check_stack_size(nsets: int, nbits: int):
+    """Checks that the frequencies of ``nsets`` executions measuring ``nbits`` bits fit
+    in the dense array of :func:`stack_frequencies`.
+
+    Raises:
+        ValueError: If the array would exceed :data:`MAX_STACKED_ENTRIES` entries.
+    """
+    if nsets * 2**nbits > MAX_STACKED_ENTRIES:
+        raise_error(
+            ValueError,
+            f"Stacking the frequencies of {nsets} executions measuring {nbits} bits "
+            + f"requires {nsets * 2**nbits} entries, more than {MAX_STACKED_ENTRIES}: "
+            + "measure fewer qubits or collect the frequencies of each job instead.",
+        )
+
+
+def stack_frequencies(frequencies, nsets: int, nbits: int):
+    """Stacks the frequencies of several executions in a dense array.
+
+    Args:
+        frequencies (Iterable): The :class:`collections.Counter` of decimal frequencies of
+            each execution. They are consumed one at a time.
+        nsets (int): Number of executions.
+        nbits (int): Number of measured bits.
+
+    Returns:
+        ndarray: The ``(nsets, 2**nbits)`` array of the number of occurrences of each
+        bitstring, with the first measured qubit as most significant bit.
+
+    Raises:
+        ValueError: If the array would exceed :data:`MAX_STACKED_ENTRIES` entries.
+    """
+    check_stack_size(nsets, nbits)
+    stacked = np.zeros((nsets, 2**nbits), dtype=np.int64)
+    for row, counter in zip(stacked, frequencies):
+        states = np.fromiter(counter.keys(), dtype=np.int64, count=len(counter))
+        row[states] = np.fromiter(counter.values(), dtype=np.int64, count=len(counter))
+    return stacked
+
+
+def batched(sequence, size=None):
+    """Splits a sequence in consecutive chunks.
+
+    Args:
+        sequence (list): The sequence to split.
+        size (int): Maximum length of each chunk. If ``None``, the whole sequence is
+            returned as a single chunk. Defaults to ``None``.
+
+    Returns:
+        list: The list of chunks.
+    """
+    sequence = list(sequence)
+    if size is None:
+        return [sequence]
+    if size < 1:
+        raise_error(ValueError, f"Batch size must be a positive integer, got {size}.")
+    return [sequence[i : i + size] for i in range(0, len(sequence), size)]
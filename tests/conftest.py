@@ -0,0 +1,105 @@
+import itertools
+
+import pytest
+from qibo.backends import NumpyBackend
+from qibo_client.qibo_job import QiboJobStatus
+from qiskit.providers.basic_provider import BasicSimulator
+
+from qibo_cloud_backends import (
+    MetaBackend,
+    braket_client,
+    ionq_client,
+    qibo_client,
+    qiskit_client,
+)
+from qibo_cloud_backends.pool import PROVIDERS
+
+
+class FakeProvider:
+    """Offline stand-in for the qiskit providers, serving a local simulator."""
+
+    def __init__(self, token=None):
+        self.token = token
+
+    def get_backend(self, name=None):
+        return BasicSimulator()
+
+
+class FakeQiboJob:
+    """Offline stand-in for :class:`qibo_client.qibo_job.QiboJob`."""
+
+    def __init__(self, pid, circuit, nshots):
+        self.pid = pid
+        self.circuit = circuit
+        self.nshots = nshots
+        self.deleted = False
+
+    def status(self):
+        return QiboJobStatus.SUCCESS
+
+    def delete(self):
+        self.deleted = True
+        return "Job deleted"
+
+    def result(self, wait=5, verbose=False):
+        # the server deserializes a fresh copy of the circuit
+        circuit = self.circuit.copy(deep=True)
+        return NumpyBackend().execute_circuit(circuit, nshots=self.nshots)
+
+
+class FakeQiboClient:
+    """Offline stand-in for :class:`qibo_client.Client`, executing jobs locally."""
+
+    pids = itertools.count()
+
+    def __init__(self, token, url=None):
+        self.token = token
+        self.jobs = []
+
+    def run_circuit(
+        self, circuit, device, project="personal", nshots=None, verbatim=False
+    ):
+        job = FakeQiboJob(str(next(self.pids)), circuit, nshots)
+        self.jobs.append(job)
+        return job
+
+    def get_job(self, pid):
+        return next(job for job in self.jobs if job.pid == pid)
+
+
+@pytest.fixture(autouse=True)
+def empty_pools():
+    yield
+    MetaBackend.pool.clear()
+    PROVIDERS.clear()
+
+
+@pytest.fixture
+def qiskit_backend(monkeypatch):
+    monkeypatch.setattr(qiskit_client, "IBMProvider", FakeProvider)
+    return qiskit_client.QiskitClientBackend(token="fake", platform="basic_simulator")
+
+
+@pytest.fixture
+def ionq_backend(monkeypatch):
+    monkeypatch.setattr(ionq_client, "IonQProvider", FakeProvider)
+    return ionq_client.IonQClientBackend(token="fake", platform="basic_simulator")
+
+
+@pytest.fixture
+def qibo_backend(monkeypatch):
+    monkeypatch.setattr(qibo_client.qibo_client, "Client", FakeQiboClient)
+    return qibo_client.QiboClientBackend(token="fake", platform="sim")
+
+
+@pytest.fixture
+def braket_backend():
+    return braket_client.BraketClientBackend()
+
+
+@pytest.fixture(
+    params=["braket_backend", "qiskit_backend", "ionq_backend", "qibo_backend"]
+)
+def cloud_backend(request):
+    """Each of the cloud backends, on the offline stand-ins of the providers."""
+    return request.getfixturevalue(request.param)
@@ -0,0 +1,75 @@
+from collections import Counter
+
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends.adaptive import (
+    AdaptiveShots,
+    marginal_frequencies,
+    wilson_half_width,
+)
+
+
+def test_adaptive_shots():
+    for kwargs in (
+        {"precision": 0},
+        {"confidence": 1},
+        {"initial_shots": 0},
+        {"growth": 1},
+    ):
+        with pytest.raises(ValueError):
+            AdaptiveShots(**kwargs)
+    assert AdaptiveShots(confidence=0.95).z == pytest.approx(1.96, abs=1e-3)
+
+
+def test_wilson_half_width():
+    assert wilson_half_width(0, 100, 1.96) > 0
+    assert wilson_half_width(0, 100, 1.96) == pytest.approx(
+        wilson_half_width(100, 100, 1.96)
+    )
+    assert wilson_half_width(50, 100, 1.96) > wilson_half_width(500, 1000, 1.96)
+    # close to the normal approximation for many shots
+    assert wilson_half_width(5000, 10000, 1.96) == pytest.approx(0.0098, abs=1e-4)
+
+
+def test_marginal_frequencies():
+    frequencies = Counter({0b101: 3, 0b011: 1})
+    assert marginal_frequencies(frequencies, [1, 2]) == [
+        Counter({1: 3, 0: 1}),
+        Counter({0b01: 3, 0b11: 1}),
+    ]
+
+
+def test_next_shots():
+    adaptive = AdaptiveShots(precision=0.01, initial_shots=100, growth=2)
+    assert adaptive.next_shots(100, 0.005, 1000) == 0
+    assert adaptive.next_shots(1000, 0.05, 1000) == 0
+    # the projection is capped by the growth and the budget
+    assert adaptive.next_shots(100, 0.05, 10000) == 100
+    assert adaptive.next_shots(100, 0.05, 150) == 50
+    assert adaptive.next_shots(1000, 0.0102, 10000) == 100
+
+
+def test_adaptive_execution(cloud_backend):
+    circuit = Circuit(2)
+    circuit.add(gates.X(0))
+    circuit.add(gates.M(0, 1))
+    adaptive = AdaptiveShots(precision=0.01, initial_shots=100)
+    result = cloud_backend.execute_circuit(circuit, nshots=10000, adaptive=adaptive)
+    # deterministic outcomes converge after two rounds
+    assert result.nshots == 200
+    assert result.frequencies() == {"10": 200}
+    assert result.timings.nshots == 200
+
+
+def test_adaptive_budget(qibo_backend):
+    circuit = Circuit(2)
+    circuit.add(gates.H(0))
+    circuit.add(gates.M(0))
+    circuit.add(gates.X(1))
+    circuit.add(gates.M(1))
+    adaptive = AdaptiveShots(precision=0.01, initial_shots=100)
+    result = qibo_backend.execute_circuit(circuit, nshots=1000, adaptive=adaptive)
+    assert result.nshots == 1000
+    assert sum(result.frequencies().values()) == 1000
+    assert set(result.frequencies()) <= {"01", "11"}
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -11,6 +12,7 @@ from qibo.backends import (
     set_backend,
 )
 from qibo.quantum_info import random_clifford
+from qibo_client.qibo_job import QiboJobStatus
 
 from qibo_cloud_backends import (
     BraketClientBackend,
@@ -19,6 +21,8 @@ from qibo_cloud_backends import (
     QiboClientBackend,
     QiskitClientBackend,
 )
+from qibo_cloud_backends.jobs import SplitJob
+from qibo_cloud_backends.utils import PackedMeasurementOutcomes
 
 NP_BACKEND = NumpyBackend()
 QISKIT_TK = os.environ.get("IBMQ_TOKEN")
@@ -36,8 +40,8 @@ def qiskit_circuit(nqubits=3, measurement=True):
     # ibm_kyiv's native gates are: ECR, I, RZ, SX, X
     circuit = Circuit(nqubits)
     circuit.add(gates.X(0))
-    # circuit.add(gates.ECR(0,1)) # ECR not supported by (our) QASM apparently
-    # circuit.add(gates.ECR(1,2))
+    circuit.add(gates.ECR(0, 1))
+    circuit.add(gates.ECR(1, 2))
     circuit.add(gates.SX(1))
     circuit.add(gates.RZ(2, theta=np.pi / 2))
     if measurement:
@@ -162,3 +166,146 @@ def test_ionq_backend(nqubits, seed):
     probs = result.probabilities()
 
     NP_BACKEND.assert_allclose(probs, target_probs, rtol=1e-1, atol=1e-1)
+
+
+@pytest.mark.parametrize("batch_size", [None, 2])
+def test_execute_circuits(cloud_backend, batch_size):
+    circuits = []
+    for nqubits in range(1, 6):
+        circuit = Circuit(nqubits)
+        circuit.add(gates.X(nqubits - 1))
+        circuit.add(gates.M(*range(nqubits)))
+        circuits.append(circuit)
+    results = cloud_backend.execute_circuits(circuits, nshots=10, batch_size=batch_size)
+    assert len(results) == len(circuits)
+    for nqubits, result in enumerate(results, start=1):
+        assert result.frequencies() == {"0" * (nqubits - 1) + "1": 10}
+
+
+def test_execute_circuits_initial_states():
+    backend = BraketClientBackend()
+    with pytest.raises(NotImplementedError):
+        backend.execute_circuits([qibo_circuit()], initial_states=[None])
+
+
+def test_submit_circuit(cloud_backend):
+    circuit = Circuit(2)
+    circuit.add(gates.X(1))
+    circuit.add(gates.M(0, 1))
+    job = cloud_backend.submit_circuit(circuit, nshots=10)
+    assert isinstance(job.job_id, str)
+    assert job.done()
+    assert job.result().frequencies() == {"01": 10}
+    assert job.result() is job.result()
+
+    async def main():
+        return await asyncio.gather(
+            cloud_backend.async_execute_circuit(circuit, nshots=10),
+            cloud_backend.async_execute_circuits([circuit, circuit], nshots=10),
+        )
+
+    single, many = asyncio.run(main())
+    assert single.frequencies() == {"01": 10}
+    assert [result.frequencies() for result in many] == [{"01": 10}] * 2
+
+
+def test_shot_splitting(cloud_backend):
+    cloud_backend.max_shots = 300
+    circuit = Circuit(3)
+    circuit.add(gates.X(0))
+    circuit.add(gates.H(1))
+    circuit.add(gates.M(0, 1))
+    circuit.add(gates.M(2, register_name="b"))
+    job = cloud_backend.submit_circuit(circuit, nshots=1000)
+    assert isinstance(job, SplitJob)
+    assert [part.nshots for part in job.jobs] == [250] * 4
+    assert job.done()
+    result = job.result()
+    frequencies = result.frequencies()
+    assert sum(frequencies.values()) == 1000
+    assert set(frequencies) <= {"100", "110"}
+    assert result.samples().shape == (1000, 3)
+    assert result.frequencies(registers=True)["b"] == {"0": 1000}
+
+    results = cloud_backend.execute_circuits([circuit, circuit], nshots=600)
+    assert [sum(result.frequencies().values()) for result in results] == [600] * 2
+
+
+def test_qibo_client_job_cancel(qibo_backend):
+    job = qibo_backend.submit_circuit(qibo_circuit(), nshots=10)
+    job.cancel()
+    assert job.job.deleted
+
+
+def test_qibo_client_job_failure(qibo_backend, monkeypatch):
+    job = qibo_backend.submit_circuit(qibo_circuit(), nshots=10)
+    monkeypatch.setattr(job.job, "status", lambda: QiboJobStatus.ERROR)
+    monkeypatch.setattr(job.job, "result", lambda wait=5, verbose=False: None)
+    with pytest.raises(RuntimeError, match=f"Job {job.job_id} ended in state"):
+        job.result()
+
+
+def test_execute_sweep(cloud_backend):
+    circuit = Circuit(2)
+    circuit.add(gates.RX(0, theta=0.1))
+    circuit.add(gates.X(1))
+    circuit.add(gates.RZ(1, theta=0.2, trainable=False))
+    circuit.add(gates.M(0, 1))
+    frequencies = cloud_backend.execute_sweep(circuit, [[0.0], [np.pi]], nshots=10)
+    assert frequencies.shape == (2, 4)
+    np.testing.assert_array_equal(frequencies, [[0, 10, 0, 0], [0, 0, 0, 10]])
+    assert circuit.queue[0].parameters == (0.1,)
+
+    cloud_backend.max_shots = 6
+    frequencies = cloud_backend.execute_sweep(circuit, [np.pi], nshots=10)
+    np.testing.assert_array_equal(frequencies, [[0, 0, 0, 10]])
+    with pytest.raises(ValueError):
+        cloud_backend.execute_sweep(circuit, [[0.1, 0.2]])
+    # the frequencies of the wide circuits are not stacked, before any submission
+    wide = Circuit(28)
+    wide.add(gates.RX(0, theta=0.1))
+    wide.add(gates.M(*range(28)))
+    with pytest.raises(ValueError, match="measure fewer qubits"):
+        cloud_backend.execute_sweep(wide, [[0.0]])
+
+
+def test_as_completed(cloud_backend):
+    circuits = []
+    for nqubits in range(1, 4):
+        circuit = Circuit(nqubits)
+        circuit.add(gates.X(0))
+        circuit.add(gates.M(*range(nqubits)))
+        circuits.append(circuit)
+    results = dict(cloud_backend.as_completed(circuits, nshots=10))
+    assert sorted(results) == [0, 1, 2]
+    for index, result in results.items():
+        assert result.frequencies() == {"1" + "0" * index: 10}
+
+
+@pytest.mark.parametrize("result_format", ["packed", "counts"])
+def test_result_format(cloud_backend, result_format):
+    cloud_backend.result_format = result_format
+    circuit = Circuit(3)
+    circuit.add(gates.X(0))
+    circuit.add(gates.M(0, 1))
+    circuit.add(gates.M(2, register_name="b"))
+    result = cloud_backend.execute_circuit(circuit, nshots=10)
+    assert isinstance(result, PackedMeasurementOutcomes) == (result_format == "packed")
+    assert not result.has_samples()
+    assert result.frequencies() == {"100": 10}
+    assert result.frequencies(registers=True)["b"] == {"0": 10}
+    np.testing.assert_array_equal(result.samples(), np.tile([1, 0, 0], (10, 1)))
+
+
+def test_expectation_from_counts(cloud_backend):
+    circuit = Circuit(3)
+    circuit.add(gates.X(0))
+    circuit.add(gates.H(2))
+    circuit.add(gates.M(0, 1))
+    circuit.add(gates.M(2))
+    expectations, variances = cloud_backend.expectation_from_counts(
+        circuit, ["ZII", "IZI", "ZZI", "IIZ"], nshots=1000
+    )
+    np.testing.assert_allclose(expectations[:3], [-1, 1, -1])
+    np.testing.assert_allclose(variances[:3], 0)
+    assert abs(expectations[3]) < 0.2
@@ -1,56 +1,65 @@
 import numpy as np
 import pytest
 from braket.circuits import Circuit as BraketCircuit
+from braket.circuits.serialization import IRType
 from qibo import Circuit, gates
 from qibo.backends import NumpyBackend
 
-from qibo_cloud_backends.braket_translation import to_braket
+from qibo_cloud_backends import BraketClientBackend, braket_client
+from qibo_cloud_backends.braket_translation import (
+    BraketTemplate,
+    optimize_gates,
+    template_key,
+    to_braket,
+    to_openqasm,
+)
+from qibo_cloud_backends.timing import Timings
 
 NP_BACKEND = NumpyBackend()
 
 
-@pytest.mark.parametrize(
-    "gate, expected",
-    [
-        (gates.I(0), BraketCircuit().i(0)),
-        (gates.H(0), BraketCircuit().h(0)),
-        (gates.X(0), BraketCircuit().x(0)),
-        (gates.Y(0), BraketCircuit().y(0)),
-        (gates.Z(0), BraketCircuit().z(0)),
-        (gates.S(0), BraketCircuit().s(0)),
-        (gates.SDG(0), BraketCircuit().si(0)),
-        (gates.T(0), BraketCircuit().t(0)),
-        (gates.TDG(0), BraketCircuit().ti(0)),
-        (gates.SX(0), BraketCircuit().v(0)),
-        (gates.SXDG(0), BraketCircuit().vi(0)),
-        (gates.CNOT(0, 1), BraketCircuit().cnot(0, 1)),
-        (gates.CY(0, 1), BraketCircuit().cy(0, 1)),
-        (gates.CZ(0, 1), BraketCircuit().cz(0, 1)),
-        (gates.CSX(0, 1), BraketCircuit().cv(0, 1)),
-        (gates.SWAP(0, 1), BraketCircuit().swap(0, 1)),
-        (gates.iSWAP(0, 1), BraketCircuit().iswap(0, 1)),
-        (gates.ECR(0, 1), BraketCircuit().ecr(0, 1)),
-        (gates.TOFFOLI(0, 1, 2), BraketCircuit().ccnot(0, 1, 2)),
-        (gates.RX(0, np.pi), BraketCircuit().rx(0, np.pi)),
-        (gates.RY(0, np.pi), BraketCircuit().ry(0, np.pi)),
-        (gates.RZ(0, np.pi), BraketCircuit().rz(0, np.pi)),
-        (gates.RXX(0, 1, np.pi), BraketCircuit().xx(0, 1, np.pi)),
-        (gates.RYY(0, 1, np.pi), BraketCircuit().yy(0, 1, np.pi)),
-        (gates.RZZ(0, 1, np.pi), BraketCircuit().zz(0, 1, np.pi)),
-        (gates.RXXYY(0, 1, np.pi), BraketCircuit().xy(0, 1, -np.pi)),
-        (gates.GPI(0, np.pi), BraketCircuit().gpi(0, np.pi)),
-        (gates.GPI2(0, np.pi), BraketCircuit().gpi2(0, np.pi)),
-        (gates.PRX(0, np.pi, np.pi / 2), BraketCircuit().prx(0, np.pi, np.pi / 2)),
-        (
-            gates.MS(0, 1, np.pi, np.pi / 2, np.pi / 4),
-            BraketCircuit().ms(0, 1, np.pi, np.pi / 2, np.pi / 4),
-        ),
-        (
-            gates.U3(0, np.pi, np.pi / 2, np.pi / 4),
-            BraketCircuit().u(0, np.pi, np.pi / 2, np.pi / 4),
-        ),
-    ],
-)
+GATES = [
+    (gates.I(0), BraketCircuit().i(0)),
+    (gates.H(0), BraketCircuit().h(0)),
+    (gates.X(0), BraketCircuit().x(0)),
+    (gates.Y(0), BraketCircuit().y(0)),
+    (gates.Z(0), BraketCircuit().z(0)),
+    (gates.S(0), BraketCircuit().s(0)),
+    (gates.SDG(0), BraketCircuit().si(0)),
+    (gates.T(0), BraketCircuit().t(0)),
+    (gates.TDG(0), BraketCircuit().ti(0)),
+    (gates.SX(0), BraketCircuit().v(0)),
+    (gates.SXDG(0), BraketCircuit().vi(0)),
+    (gates.CNOT(0, 1), BraketCircuit().cnot(0, 1)),
+    (gates.CY(0, 1), BraketCircuit().cy(0, 1)),
+    (gates.CZ(0, 1), BraketCircuit().cz(0, 1)),
+    (gates.CSX(0, 1), BraketCircuit().cv(0, 1)),
+    (gates.SWAP(0, 1), BraketCircuit().swap(0, 1)),
+    (gates.iSWAP(0, 1), BraketCircuit().iswap(0, 1)),
+    (gates.ECR(0, 1), BraketCircuit().ecr(0, 1)),
+    (gates.TOFFOLI(0, 1, 2), BraketCircuit().ccnot(0, 1, 2)),
+    (gates.RX(0, np.pi), BraketCircuit().rx(0, np.pi)),
+    (gates.RY(0, np.pi), BraketCircuit().ry(0, np.pi)),
+    (gates.RZ(0, np.pi), BraketCircuit().rz(0, np.pi)),
+    (gates.RXX(0, 1, np.pi), BraketCircuit().xx(0, 1, np.pi)),
+    (gates.RYY(0, 1, np.pi), BraketCircuit().yy(0, 1, np.pi)),
+    (gates.RZZ(0, 1, np.pi), BraketCircuit().zz(0, 1, np.pi)),
+    (gates.RXXYY(0, 1, np.pi), BraketCircuit().xy(0, 1, -np.pi)),
+    (gates.GPI(0, np.pi), BraketCircuit().gpi(0, np.pi)),
+    (gates.GPI2(0, np.pi), BraketCircuit().gpi2(0, np.pi)),
+    (gates.PRX(0, np.pi, np.pi / 2), BraketCircuit().prx(0, np.pi, np.pi / 2)),
+    (
+        gates.MS(0, 1, np.pi, np.pi / 2, np.pi / 4),
+        BraketCircuit().ms(0, 1, np.pi, np.pi / 2, np.pi / 4),
+    ),
+    (
+        gates.U3(0, np.pi, np.pi / 2, np.pi / 4),
+        BraketCircuit().u(0, np.pi, np.pi / 2, np.pi / 4),
+    ),
+]
+
+
+@pytest.mark.parametrize("gate, expected", GATES)
 def test_to_braket(gate, expected):
     circuit = Circuit(len(gate.qubits))
     circuit.add(gate)
@@ -63,3 +72,263 @@ def test_to_braket_verbatim():
     assert to_braket(circuit, True) == BraketCircuit().add_verbatim_box(
         BraketCircuit().prx(0, np.pi, np.pi / 2)
     )
+
+
+@pytest.mark.parametrize("verbatim", [False, True])
+@pytest.mark.parametrize(
+    "gate",
+    [gate for gate, _ in GATES] + [gates.Unitary(np.array([[0, 1j], [1j, 0]]), 1)],
+)
+def test_to_openqasm(gate, verbatim):
+    circuit = Circuit(3)
+    circuit.add(gate)
+    circuit.add(gates.M(2, 0))
+    circuit.add(gates.M(1, register_name="b"))
+    expected = to_braket(circuit, verbatim).to_ir(IRType.OPENQASM).source
+    assert to_openqasm(circuit, verbatim) == expected
+
+
+def test_to_openqasm_unsupported():
+    circuit = Circuit(2)
+    circuit.add(gates.CRX(0, 1, 0.1))
+    with pytest.raises(NotImplementedError):
+        to_openqasm(circuit, False)
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_braket_client_openqasm(optimize):
+    circuit = Circuit(3)
+    circuit.add(gates.H(0))
+    circuit.add(gates.CNOT(0, 2))
+    circuit.add(gates.X(1))
+    circuit.add(gates.M(2, 1))
+    backend = BraketClientBackend(openqasm=True, optimize=optimize)
+    result = backend.execute_circuit(circuit, nshots=1000)
+    assert set(result.frequencies()) == {"01", "11"}
+    results = backend.execute_circuits([circuit, circuit], nshots=100)
+    assert [sum(result.frequencies().values()) for result in results] == [100, 100]
+
+
+def test_braket_client_processes():
+    circuits = []
+    for qubits in ([0], [1], [0, 2], [1, 2]):
+        circuit = Circuit(3)
+        circuit.add(gates.X(qubit) for qubit in qubits)
+        circuit.add(gates.M(0, 1, 2))
+        circuits.append(circuit)
+    backend = BraketClientBackend("local_simulator:braket_sv", processes=2)
+    results = backend.execute_circuits(circuits, nshots=100)
+    assert [result.frequencies() for result in results] == [
+        {"100": 100},
+        {"010": 100},
+        {"101": 100},
+        {"011": 100},
+    ]
+    assert backend.execute_circuit(circuits[2], nshots=10).frequencies() == {"101": 10}
+    frequencies = backend.execute_sweep(
+        variational_circuit(0.1), [[0.0] * 8], nshots=10
+    )
+    assert frequencies.sum() == 10
+    backend.close()
+    assert backend._executor is None
+
+
+def test_braket_client_processes_options(monkeypatch):
+    backend = BraketClientBackend(
+        "local_simulator:braket_sv", parametric=True, processes=2
+    )
+    serialized, submitted = [], []
+    serialize, run = braket_client._openqasm_source, backend._run_local
+
+    def openqasm_source(braket_circuit):
+        serialized.append(braket_circuit)
+        return serialize(braket_circuit)
+
+    def run_local(source, shots, inputs, **kwargs):
+        submitted.append(kwargs)
+        return run(source, shots, inputs, **kwargs)
+
+    monkeypatch.setattr(braket_client, "_openqasm_source", openqasm_source)
+    monkeypatch.setattr(backend, "_run_local", run_local)
+    frequencies = backend.execute_sweep(
+        variational_circuit(0.1), [[0.0] * 8] * 3, nshots=10, max_parallel=2
+    )
+    assert frequencies.sum(axis=1).tolist() == [10] * 3
+    # the template is serialized once, the batch options are not forwarded
+    assert len(serialized) == 1
+    assert submitted == [{}] * 3
+    backend.execute_circuit(variational_circuit(0.1), nshots=10, batch_size=1)
+    assert submitted[-1] == {"batch_size": 1}
+    backend.close()
+
+
+def redundant_circuit():
+    circuit = Circuit(2)
+    circuit.add(gates.H(0))
+    circuit.add(gates.H(0))
+    circuit.add(gates.S(1))
+    circuit.add(gates.I(1))
+    circuit.add(gates.SDG(1))
+    circuit.add(gates.RZ(0, 0.3))
+    circuit.add(gates.RZ(0, 0.4))
+    circuit.add(gates.CNOT(0, 1))
+    circuit.add(gates.RX(1, np.pi))
+    circuit.add(gates.RX(1, np.pi))
+    circuit.add(gates.H(1))
+    circuit.add(gates.T(1))
+    circuit.add(gates.RY(0, 0.5))
+    circuit.add(gates.M(0, 1))
+    return circuit
+
+
+def test_optimize_gates():
+    circuit = redundant_circuit()
+    queue = [gate for gate in circuit.queue if not isinstance(gate, gates.M)]
+    optimized = optimize_gates(queue)
+    assert [gate.__class__ for gate in optimized] == [
+        gates.RZ,
+        gates.CNOT,
+        gates.RY,
+        gates.U3,
+    ]
+    assert optimized[0].parameters[0] == pytest.approx(0.7)
+    assert len(circuit.queue) == 14
+
+    unitaries = []
+    for gate_list in (queue, optimized):
+        unitary_circuit = Circuit(2)
+        unitary_circuit.add(gate_list)
+        unitaries.append(unitary_circuit.unitary(NP_BACKEND))
+    unitary, optimized_unitary = unitaries
+    phase = np.trace(optimized_unitary.conj().T @ unitary) / 4
+    NP_BACKEND.assert_allclose(unitary, phase * optimized_unitary, atol=1e-8)
+
+
+@pytest.mark.parametrize(
+    "native,expected",
+    [
+        (None, [gates.U3]),
+        ({"u", "rx", "ry", "rz"}, [gates.U3]),
+        ({"rx", "ry", "rz"}, [gates.RZ, gates.RY, gates.RZ]),
+        ({"rx", "rz"}, [gates.RZ, gates.RX, gates.RZ]),
+        ({"h", "t", "v", "s"}, [gates.H, gates.T, gates.SX, gates.S]),
+    ],
+)
+def test_optimize_gates_native(native, expected):
+    queue = [gates.H(0), gates.T(0), gates.SX(0), gates.S(0)]
+    optimized = optimize_gates(queue, native)
+    assert [gate.__class__ for gate in optimized] == expected
+
+    unitaries = []
+    for gate_list in (queue, optimized):
+        unitary_circuit = Circuit(1)
+        unitary_circuit.add(gate_list)
+        unitaries.append(unitary_circuit.unitary(NP_BACKEND))
+    unitary, optimized_unitary = unitaries
+    phase = np.trace(optimized_unitary.conj().T @ unitary) / 2
+    NP_BACKEND.assert_allclose(unitary, phase * optimized_unitary, atol=1e-8)
+
+
+def test_to_braket_optimize():
+    circuit = redundant_circuit()
+    assert len(to_braket(circuit, False, optimize=True).instructions) < len(
+        to_braket(circuit, False).instructions
+    )
+    assert to_braket(circuit, True, optimize=True) == to_braket(circuit, True)
+    assert to_openqasm(circuit, False, optimize=True) == (
+        to_braket(circuit, False, optimize=True).to_ir(IRType.OPENQASM).source
+    )
+    for translate in (to_braket, to_openqasm):
+        timings = Timings()
+        translate(circuit, False, optimize=True, timings=timings)
+        assert timings.removed_gates == 9
+
+    backend = BraketClientBackend(optimize=True)
+    assert "u" in backend.native_operations
+    result = backend.execute_circuit(circuit, nshots=1000)
+    assert result.timings.removed_gates == 9
+    NP_BACKEND.assert_allclose(
+        result.probabilities(),
+        NP_BACKEND.execute_circuit(circuit).probabilities(),
+        atol=1e-1,
+    )
+
+
+def variational_circuit(theta, trainable=True):
+    circuit = Circuit(2)
+    circuit.add(gates.H(0))
+    circuit.add(gates.RX(0, theta, trainable=trainable))
+    circuit.add(gates.U3(1, theta, theta / 2, theta / 4))
+    circuit.add(gates.RXXYY(0, 1, theta))
+    circuit.add(gates.MS(0, 1, theta, theta / 2, theta / 4))
+    circuit.add(gates.Unitary(np.eye(2), 1))
+    circuit.add(gates.M(0, 1))
+    return circuit
+
+
+@pytest.mark.parametrize("verbatim", [True, False])
+def test_braket_template(verbatim):
+    circuit = variational_circuit(np.pi / 3)
+    template = BraketTemplate(circuit, verbatim)
+    assert template.parameter_names == [f"p{i}" for i in range(8)]
+    bound = template.circuit.make_bound_circuit(template.inputs(circuit))
+    assert bound == to_braket(circuit, verbatim)
+    assert template.inputs(BraketTemplate.parameters(circuit)) == template.inputs(
+        circuit
+    )
+    with pytest.raises(ValueError):
+        template.inputs([0.1, 0.2])
+
+
+def test_template_key():
+    key = template_key(variational_circuit(0.1))
+    assert key == template_key(variational_circuit(0.2))
+    assert key != template_key(variational_circuit(0.1, trainable=False))
+    assert template_key(variational_circuit(0.1, trainable=False)) != template_key(
+        variational_circuit(0.2, trainable=False)
+    )
+
+
+def test_braket_client_parametric():
+    backend = BraketClientBackend(parametric=True)
+    template = backend.template(variational_circuit(0.1))
+    for theta in (0.3, np.pi / 2):
+        circuit = variational_circuit(theta)
+        assert backend.template(circuit) is template
+        result = backend.execute_circuit(circuit, nshots=1000)
+        NP_BACKEND.assert_allclose(
+            result.probabilities(),
+            NP_BACKEND.execute_circuit(circuit).probabilities(),
+            atol=1e-1,
+        )
+    results = backend.execute_circuits(
+        [variational_circuit(0.3), variational_circuit(np.pi)], nshots=1000
+    )
+    assert backend.template(variational_circuit(np.pi)) is template
+    NP_BACKEND.assert_allclose(
+        results[1].probabilities(),
+        NP_BACKEND.execute_circuit(variational_circuit(np.pi)).probabilities(),
+        atol=1e-1,
+    )
+
+
+def test_braket_client_split_batch_options(braket_backend, monkeypatch):
+    calls = []
+    run = braket_backend.device.run
+
+    def record(circuit, shots, inputs, **kwargs):
+        calls.append(kwargs)
+        return run(circuit, shots=shots, inputs=inputs)
+
+    monkeypatch.setattr(braket_backend.device, "run", record)
+    braket_backend.max_shots = 6
+    circuit = Circuit(1)
+    circuit.add(gates.X(0))
+    circuit.add(gates.M(0))
+    jobs = braket_backend.submit_circuits(
+        [circuit] * 2, nshots=10, max_parallel=2, poll_timeout_seconds=5
+    )
+    assert [job.frequencies() for job in jobs] == [{1: 10}] * 2
+    # the options of the tasks are forwarded, the ones of the batches are not
+    assert len(calls) == 4
+    assert calls == [{"poll_timeout_seconds": 5}] * 4
@@ -0,0 +1,143 @@
+import os
+import time
+
+import numpy as np
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends import BraketClientBackend
+from qibo_cloud_backends.cache import ResultCache, fingerprint
+from qibo_cloud_backends.utils import PackedMeasurementOutcomes
+
+
+def circuit(theta=0.1):
+    circuit = Circuit(3)
+    circuit.add(gates.H(0))
+    circuit.add(gates.RX(1, theta=theta))
+    circuit.add(gates.M(0, 1))
+    return circuit
+
+
+def test_fingerprint():
+    key = fingerprint(circuit(), 100, "sim")
+    assert key == fingerprint(circuit(), 100, "sim")
+    assert key != fingerprint(circuit(0.2), 100, "sim")
+    assert key != fingerprint(circuit(), 101, "sim")
+    assert key != fingerprint(circuit(), 100, "qpu")
+    assert key != fingerprint(circuit(), 100, "sim", verbatim=True)
+    # previous results registered in the measurement gates do not matter
+    executed = circuit()
+    executed()
+    assert key == fingerprint(executed, 100, "sim")
+
+
+def test_result_cache(tmp_path):
+    cache = ResultCache(tmp_path)
+    samples = np.random.randint(0, 2, size=(100, 11))
+    assert cache.get("key") is None
+    cache.put("key", samples)
+    np.testing.assert_array_equal(cache.get("key"), samples)
+    assert os.path.getsize(tmp_path / "key.npz") < samples.nbytes / 8
+    cache.clear()
+    assert cache.get("key") is None
+
+
+def test_result_cache_ttl(tmp_path):
+    cache = ResultCache(tmp_path, ttl=1e-3)
+    cache.put("key", np.ones((10, 2)))
+    time.sleep(1e-2)
+    assert cache.get("key") is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_result_cache_eviction(tmp_path):
+    samples = np.random.randint(0, 2, size=(1000, 8))
+    ResultCache(tmp_path / "probe").put("probe", samples)
+    size = os.path.getsize(tmp_path / "probe" / "probe.npz")
+    cache = ResultCache(tmp_path / "cache", max_size=2 * size)
+    cache.put("first", samples)
+    cache.put("second", samples)
+    os.utime(tmp_path / "cache" / "first.npz", (0, 0))
+    cache.get("second")
+    cache.put("third", samples)
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
+    assert cache.get("third") is not None
+
+
+def test_result_cache_size_tracking(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_size=2**20)
+    scans = []
+    evict = cache._evict
+    monkeypatch.setattr(cache, "_evict", lambda: scans.append(1) or evict())
+    samples = np.random.randint(0, 2, size=(100, 8))
+    for key in ("first", "second", "first"):
+        cache.put(key, samples)
+    # the directory is only scanned at the first write
+    assert len(scans) == 1
+    assert cache._size == sum(path.stat().st_size for path in tmp_path.iterdir())
+    cache.max_size = cache._size
+    os.utime(tmp_path / "second.npz", (0, 0))
+    cache.put("third", samples)
+    assert len(scans) == 2
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+
+
+def test_result_cache_failed_write(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "savez", fail)
+    with pytest.raises(OSError):
+        cache.put("key", np.ones((10, 2)))
+    assert not list(tmp_path.iterdir())
+
+    stale = tmp_path / "stale.tmp"
+    stale.touch()
+    os.utime(stale, (0, 0))
+    monkeypatch.undo()
+    cache.put("key", np.ones((10, 2)))
+    assert [path.name for path in tmp_path.iterdir()] == ["key.npz"]
+
+
+def test_backend_cache(tmp_path, monkeypatch):
+    backend = BraketClientBackend()
+    backend.cache = ResultCache(tmp_path)
+    result = backend.execute_circuit(circuit(), nshots=50)
+
+    def offline(*args, **kwargs):
+        raise ConnectionError
+
+    monkeypatch.setattr(backend, "submit_circuit", offline)
+    cached = backend.execute_circuit(circuit(), nshots=50)
+    np.testing.assert_array_equal(cached.samples(), result.samples())
+    with pytest.raises(ConnectionError):
+        backend.execute_circuit(circuit(), nshots=51)
+
+
+def test_backend_cache_packed(tmp_path):
+    backend = BraketClientBackend()
+    backend.cache = ResultCache(tmp_path)
+    backend.result_format = "packed"
+    result = backend.execute_circuit(circuit(), nshots=50)
+    cached = backend.execute_circuit(circuit(), nshots=50)
+    assert isinstance(cached, PackedMeasurementOutcomes)
+    np.testing.assert_array_equal(cached.packed, result.packed)
+    backend.result_format = "samples"
+    np.testing.assert_array_equal(
+        backend.execute_circuit(circuit(), nshots=50).samples(), result.samples()
+    )
+
+
+def test_backend_cache_counts(tmp_path):
+    backend = BraketClientBackend()
+    backend.cache = ResultCache(tmp_path)
+    backend.result_format = "counts"
+    result = backend.execute_circuit(circuit(), nshots=50)
+    # caching the result does not build its samples
+    assert not result.has_samples()
+    cached = backend.execute_circuit(circuit(), nshots=50)
+    assert cached.frequencies() == result.frequencies()
@@ -0,0 +1,113 @@
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends import BraketClientBackend, MetaBackend
+from qibo_cloud_backends.braket_translation import supports as braket_supports
+from qibo_cloud_backends.dispatcher import DispatcherBackend
+from qibo_cloud_backends.qiskit_translation import supports as qiskit_supports
+
+
+def circuit(gate=None):
+    circuit = Circuit(2)
+    circuit.add(gates.X(0) if gate is None else gate)
+    circuit.add(gates.M(0, 1))
+    return circuit
+
+
+def test_supports():
+    assert braket_supports(circuit(gates.GPI2(0, 0.1)))
+    assert not qiskit_supports(circuit(gates.GPI2(0, 0.1)))
+    assert qiskit_supports(circuit(gates.CU3(0, 1, 0.1, 0.2, 0.3)))
+    assert not braket_supports(circuit(gates.CU3(0, 1, 0.1, 0.2, 0.3)))
+
+
+def test_dispatcher_spreads_the_load(qiskit_backend):
+    dispatcher = DispatcherBackend([BraketClientBackend(), qiskit_backend])
+    results = dispatcher.execute_circuits([circuit() for _ in range(8)], nshots=10)
+    assert [result.frequencies() for result in results] == [{"10": 10}] * 8
+    routes = [decision.route for decision in dispatcher.decisions]
+    assert set(routes) == set(dispatcher.routes)
+    assert sum(stats.completed for stats in dispatcher.stats.values()) == 8
+    assert all(stats.in_flight == 0 for stats in dispatcher.stats.values())
+    assert all(stats.latency > 0 for stats in dispatcher.stats.values())
+
+
+def test_dispatcher_gate_compatibility(qiskit_backend):
+    dispatcher = DispatcherBackend([qiskit_backend, BraketClientBackend()])
+    dispatcher.execute_circuit(circuit(gates.GPI2(0, 0.1)), nshots=10)
+    decision = dispatcher.decisions[-1]
+    assert decision.candidates == ["aws:local_simulator:default"]
+    assert decision.route == "aws:local_simulator:default"
+    with pytest.raises(NotImplementedError):
+        dispatcher.execute_circuit(circuit(gates.FSWAP(0, 1)), nshots=10)
+    assert not dispatcher.supports(circuit(gates.FSWAP(0, 1)))
+
+
+def test_dispatcher_failover(qiskit_backend, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ConnectionError("provider unreachable")
+
+    monkeypatch.setattr(qiskit_backend, "execute_circuit", fail)
+    dispatcher = DispatcherBackend([qiskit_backend, BraketClientBackend()])
+    result = dispatcher.execute_circuit(circuit(), nshots=10)
+    assert result.frequencies() == {"10": 10}
+    decision = dispatcher.decisions[-1]
+    assert decision.route == "aws:local_simulator:default"
+    assert decision.failures == [
+        ("qiskit-client:basic_simulator", "ConnectionError: provider unreachable")
+    ]
+    # the failing backend is tried last afterwards
+    assert dispatcher.rank(circuit()) == [1, 0]
+
+    monkeypatch.setattr(dispatcher.backends[1], "execute_circuit", fail)
+    with pytest.raises(RuntimeError, match="provider unreachable"):
+        dispatcher.execute_circuit(circuit(), nshots=10)
+    assert dispatcher.decisions[-1].route is None
+
+
+def test_dispatcher_queue_depth(qiskit_backend, monkeypatch):
+    braket = BraketClientBackend()
+    monkeypatch.setattr(qiskit_backend, "queue_depth", lambda: 100)
+    dispatcher = DispatcherBackend([qiskit_backend, braket])
+    for stats in dispatcher.stats.values():
+        stats.latency = 1.0
+    assert dispatcher.rank(circuit()) == [1, 0]
+    assert dispatcher.stats["qiskit-client:basic_simulator"].queue_depth == 100
+
+
+def test_dispatcher_from_clients():
+    dispatcher = DispatcherBackend.from_clients({"braket-client": {}})
+    assert dispatcher.backends == [MetaBackend.load("braket-client")]
+    with pytest.raises(ValueError):
+        DispatcherBackend([])
+
+
+def test_dispatcher_sweep_and_expectations(qiskit_backend, monkeypatch):
+    parametric = Circuit(2)
+    parametric.add(gates.RX(0, 0.0))
+    parametric.add(gates.M(0, 1))
+    dispatcher = DispatcherBackend([qiskit_backend, BraketClientBackend()])
+    counts = dispatcher.execute_sweep(parametric, [[0.0], [3.141592653589793]], 10)
+    assert counts.tolist() == [[10, 0, 0, 0], [0, 0, 10, 0]]
+    expectations, _ = dispatcher.expectation_from_counts(circuit(), ["ZI", "IZ"], 10)
+    assert expectations.tolist() == [-1.0, 1.0]
+    assert len(dispatcher.decisions) == 2
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("provider unreachable")
+
+    monkeypatch.setattr(qiskit_backend, "execute_sweep", fail)
+    counts = dispatcher.execute_sweep(parametric, [[0.0]], 10)
+    assert counts.tolist() == [[10, 0, 0, 0]]
+    assert dispatcher.decisions[-1].route == "aws:local_simulator:default"
+
+
+def test_dispatcher_submissions(qiskit_backend):
+    dispatcher = DispatcherBackend([qiskit_backend, BraketClientBackend()])
+    jobs = dispatcher.submit_circuits([circuit(), circuit()], nshots=10)
+    assert [job.result().frequencies() for job in jobs] == [{"10": 10}] * 2
+    results = dict(dispatcher.as_completed([circuit(), circuit()], nshots=10))
+    assert sorted(results) == [0, 1]
+    assert all(result.frequencies() == {"10": 10} for result in results.values())
+    with pytest.raises(NotImplementedError):
+        dispatcher.submit_circuit(circuit(gates.FSWAP(0, 1)), nshots=10)
@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+PROVIDERS = ("braket", "qiskit", "qiskit_ibm_provider", "qiskit_ionq", "qibo_client")
+
+SCRIPT = """
+import json, sys, time
+
+start = time.perf_counter()
+import qibo
+qibo_time = time.perf_counter() - start
+
+start = time.perf_counter()
+import qibo_cloud_backends
+{statement}
+package_time = time.perf_counter() - start
+
+loaded = [m for m in {providers} if m in sys.modules]
+print(json.dumps({{"qibo": qibo_time, "package": package_time, "loaded": loaded}}))
+"""
+
+
+def import_profile(statement=""):
+    script = SCRIPT.format(statement=statement, providers=PROVIDERS)
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_import_does_not_load_providers():
+    profile = import_profile()
+    assert profile["loaded"] == []
+    # importing the package on top of qibo should be almost free
+    assert profile["package"] < 0.5
+
+
+@pytest.mark.parametrize(
+    "name,provider",
+    [
+        ("BraketClientBackend", "braket"),
+        ("IonQClientBackend", "qiskit_ionq"),
+        ("QiboClientBackend", "qibo_client"),
+        ("QiskitClientBackend", "qiskit_ibm_provider"),
+    ],
+)
+def test_backends_lazy_resolution(name, provider):
+    profile = import_profile(f"qibo_cloud_backends.{name}")
+    assert provider in profile["loaded"]
+    assert name in dir(__import__("qibo_cloud_backends"))
@@ -0,0 +1,90 @@
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends import BraketClientBackend, qibo_client
+from qibo_cloud_backends.cache import fingerprint
+from qibo_cloud_backends.journal import JobJournal
+
+
+def circuit():
+    circuit = Circuit(3)
+    circuit.add(gates.X(0))
+    circuit.add(gates.M(0, 1))
+    circuit.add(gates.M(2, register_name="b"))
+    return circuit
+
+
+def test_job_journal(tmp_path, qibo_backend):
+    journal = JobJournal(tmp_path)
+    job = qibo_backend.submit_circuit(circuit(), nshots=10)
+    journal.record("key", job)
+    entry = journal.get("key")
+    assert entry["jobs"] == [[job.job_id, 10]]
+    assert list(journal.entries("qibo-client:sim")) == ["key"]
+    assert journal.entries("aws:sim") == {}
+    rebuilt = JobJournal.circuit(entry)
+    assert rebuilt.nqubits == 3
+    assert [gate.qubits for gate in rebuilt.measurements] == [(0, 1), (2,)]
+    assert [gate.register_name for gate in rebuilt.measurements] == [
+        gate.register_name for gate in circuit().measurements
+    ]
+    journal.discard("key")
+    assert journal.get("key") is None
+    journal.record("key", job)
+    journal.clear()
+    assert journal.entries() == {}
+
+
+def test_backend_journal(tmp_path, qibo_backend):
+    qibo_backend.journal = JobJournal(tmp_path)
+    qibo_backend.max_shots = 6
+    # the process dies after the submission
+    qibo_backend._journaled(
+        circuit(),
+        10,
+        lambda: qibo_backend.submit_circuit(circuit(), nshots=10),
+        initial_state=None,
+        verbatim=False,
+    )
+    key = fingerprint(
+        circuit(), 10, "qibo-client:sim", initial_state=None, verbatim=False
+    )
+    assert len(qibo_backend.journal.get(key)["jobs"]) == 2
+
+    restarted = qibo_client.QiboClientBackend(token="fake", platform="sim")
+    restarted.client = qibo_backend.client
+    restarted.journal = JobJournal(tmp_path)
+    result = restarted.execute_circuit(circuit(), nshots=10)
+    assert result.frequencies() == {"100": 10}
+    assert len(restarted.client.jobs) == 2
+    assert restarted.journal.entries() == {}
+
+    job = restarted._journaled(
+        circuit(), 5, lambda: restarted.submit_circuit(circuit(), nshots=5)
+    )
+    jobs = restarted.resume()
+    assert list(jobs) == [job.journal_key]
+    assert jobs[job.journal_key].result().frequencies() == {"100": 5}
+    assert restarted.journal.entries() == {}
+
+
+def test_backend_journal_reattach_failure(tmp_path):
+    backend = BraketClientBackend()
+    backend.journal = JobJournal(tmp_path)
+    backend.execute_circuit(circuit(), nshots=10)
+    assert backend.journal.entries() == {}
+    job = backend.submit_circuit(circuit(), nshots=10)
+    key = fingerprint(
+        circuit(), 10, "aws:local_simulator:default", verbatim_circuit=False
+    )
+    backend.journal.record(key, job)
+    with pytest.raises(NotImplementedError):
+        backend.resume()
+    result = backend.execute_circuit(circuit(), nshots=10)
+    assert result.frequencies() == {"100": 10}
+    assert backend.journal.entries() == {}
+
+
+def test_resume_without_journal(qibo_backend):
+    with pytest.raises(RuntimeError):
+        qibo_backend.resume()
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends import MetaBackend
+from qibo_cloud_backends.limits import (
+    LIMITERS,
+    Limiters,
+    RateLimit,
+    RateLimiter,
+    credentials_id,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_limits():
+    yield
+    LIMITERS.clear()
+
+
+def circuit():
+    circuit = Circuit(2)
+    circuit.add(gates.X(0))
+    circuit.add(gates.M(0, 1))
+    return circuit
+
+
+def test_rate_limit():
+    for kwargs in ({"rate": 0}, {"burst": 0}, {"max_in_flight": 0}):
+        with pytest.raises(ValueError):
+            RateLimit(**kwargs)
+
+
+def test_rate_limiter_rate():
+    limiter = RateLimiter(RateLimit(rate=20, burst=2))
+    start = time.monotonic()
+    waits = [limiter.acquire() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert time.monotonic() - start >= 0.09
+    stats = limiter.stats()
+    assert stats.submissions == 4
+    assert stats.throttled == 2
+    assert stats.wait_time >= 0.09
+    assert stats.in_flight == 4
+
+
+def test_rate_limiter_in_flight():
+    limiter = RateLimiter(RateLimit(max_in_flight=2))
+    limiter.acquire(2)
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.1)
+    limiter.release()
+    assert acquired.wait(1)
+    thread.join()
+    assert limiter.stats().in_flight == 2
+    # larger submissions wait for all the jobs in flight to complete
+    limiter.release(2)
+    limiter.acquire(5)
+    assert limiter.stats().in_flight == 5
+
+
+def test_limiters():
+    limiters = Limiters()
+    assert limiters.get("qiskit-client", credentials_id("a")) is None
+    limiters.configure("qiskit-client", RateLimit(rate=1))
+    limiters.configure("qiskit-client", RateLimit(rate=2), token="b")
+    first = limiters.get("qiskit-client", credentials_id("a"))
+    assert first.limit.rate == 1
+    assert limiters.get("qiskit-client", credentials_id("a")) is first
+    assert limiters.get("qiskit-client", credentials_id("c")) is not first
+    assert limiters.get("qiskit-client", credentials_id("b")).limit.rate == 2
+    assert limiters.get("ionq-client") is None
+    assert set(limiters.stats()) == {
+        ("qiskit-client", credentials_id(token)) for token in "abc"
+    }
+    limiters.configure("qiskit-client", None)
+    assert limiters.get("qiskit-client", credentials_id("a")) is None
+    limiters.clear()
+    assert limiters.stats() == {}
+
+
+def test_meta_backend_limit():
+    MetaBackend.limit("braket-client", rate=10, max_in_flight=3)
+    assert LIMITERS.get("aws").limit == RateLimit(10, 1, 3)
+    MetaBackend.limit("braket-client")
+    assert LIMITERS.get("aws") is None
+    with pytest.raises(ValueError):
+        MetaBackend.limit("unknown-client", rate=1)
+
+
+def test_backend_limits(cloud_backend):
+    limit = RateLimit(rate=100, burst=2, max_in_flight=2, poll_interval=0.01)
+    LIMITERS.configure(cloud_backend.name, limit)
+    limiter = LIMITERS.get(cloud_backend.name, cloud_backend.credentials)
+    job = cloud_backend.submit_circuit(circuit(), nshots=10)
+    assert limiter.stats().in_flight == 1
+    job.result()
+    assert limiter.stats().in_flight == 0
+
+    cloud_backend.max_shots = 6
+    assert cloud_backend.execute_circuit(circuit(), nshots=10).frequencies() == {
+        "10": 10
+    }
+    results = cloud_backend.execute_circuits([circuit()] * 3, nshots=4)
+    assert [result.frequencies() for result in results] == [{"10": 4}] * 3
+    stats = limiter.stats()
+    assert stats.in_flight == 0
+    assert stats.submissions >= 4
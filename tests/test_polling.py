@@ -0,0 +1,122 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends import BraketClientBackend
+from qibo_cloud_backends.jobs import BraketJob, CloudJob, as_completed
+from qibo_cloud_backends.polling import Poller
+
+
+class FakeTask:
+    def __init__(self, states):
+        self.id = "fake-task"
+        self.states = iter(states)
+        self.calls = 0
+
+    def state(self):
+        self.calls += 1
+        return next(self.states)
+
+    def result(self):
+        return None
+
+
+def test_poller_intervals():
+    poller = Poller(interval=1, max_interval=8, backoff=2, jitter=0)
+    assert list(itertools.islice(poller.intervals(), 6)) == [1, 2, 4, 8, 8, 8]
+    poller = Poller(interval=1, max_interval=8, jitter=0.5)
+    for interval, target in zip(poller.intervals(), [1, 2, 4, 8, 8]):
+        assert 0.5 * target <= interval <= 1.5 * target
+
+
+@pytest.mark.parametrize("final", ["COMPLETED", "FAILED", "CANCELLED"])
+def test_poller_stops_on_final_states(final):
+    history = []
+    poller = Poller(interval=1e-3, callback=lambda *args: history.append(args))
+    task = FakeTask(["QUEUED", "RUNNING", final, "UNREACHABLE"])
+    job = BraketJob(task, None, 10, None)
+    assert job.wait(poller) == final
+    assert [status for status, _ in history] == ["QUEUED", "RUNNING", final]
+    task = FakeTask(["QUEUED", final])
+    assert asyncio.run(poller.async_wait(task.state, job._is_final)) == final
+
+
+def test_poller_timeout():
+    poller = Poller(interval=1e-2, timeout=5e-2)
+    task = FakeTask(itertools.repeat("QUEUED"))
+    with pytest.raises(TimeoutError):
+        BraketJob(task, None, 10, None).wait(poller)
+    assert 1 < task.calls < 10
+
+
+@pytest.mark.parametrize("kwargs", [{"interval": 0}, {"backoff": 0.5}, {"jitter": 1}])
+def test_poller_invalid(kwargs):
+    with pytest.raises(ValueError):
+        Poller(**kwargs)
+
+
+def test_braket_failed_task():
+    backend = BraketClientBackend(poller=Poller(interval=1e-3))
+    circuit = Circuit(1)
+    circuit.add(gates.M(0))
+    job = BraketJob(FakeTask(["RUNNING", "FAILED", "FAILED"]), circuit, 10, backend)
+    with pytest.raises(RuntimeError):
+        job.result()
+
+
+def test_braket_verbosity(caplog):
+    backend = BraketClientBackend(verbosity=True)
+    circuit = Circuit(1)
+    circuit.add(gates.M(0))
+    with caplog.at_level("INFO"):
+        backend.execute_circuit(circuit, nshots=10)
+    assert "COMPLETED" in caplog.text
+
+
+class FakeJob:
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    def status(self):
+        self.calls += 1
+        return "DONE" if self.calls > self.delay else "RUNNING"
+
+
+class FakeHandle(CloudJob):
+    @property
+    def job_id(self) -> str:
+        return str(id(self.job))
+
+    def status(self):
+        return self.job.status()
+
+    def _is_final(self, status) -> bool:
+        return status == "DONE"
+
+    def _fetch(self):
+        return SimpleNamespace(name=self.circuit)
+
+
+def test_as_completed():
+    backend = SimpleNamespace(name="fake", platform="sim")
+    shared = FakeJob(1)
+    jobs = [
+        FakeHandle(FakeJob(3), "slow", 10, backend),
+        FakeHandle(shared, "first", 10, backend),
+        FakeHandle(FakeJob(0), "fast", 10, backend),
+        FakeHandle(shared, "second", 10, backend),
+    ]
+    poller = Poller(interval=1e-3, jitter=0)
+    results = [(index, result.name) for index, result in as_completed(jobs, poller)]
+    assert results == [(2, "fast"), (1, "first"), (3, "second"), (0, "slow")]
+    # the handles sharing a provider job trigger a single status request
+    assert shared.calls == 2
+    assert list(as_completed([], poller)) == []
+
+    slow = FakeHandle(FakeJob(100), "slow", 10, backend)
+    with pytest.raises(TimeoutError):
+        list(as_completed([slow], Poller(interval=1e-2, timeout=5e-2)))
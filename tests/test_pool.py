@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from qibo_cloud_backends import MetaBackend
+from qibo_cloud_backends.pool import PROVIDERS, Pool
+
+
+def test_pool_reuses_objects():
+    pool = Pool()
+    first = pool.get("key", object)
+    assert pool.get("key", object) is first
+    assert pool.get("other", object) is not first
+    assert len(pool) == 2
+    pool.discard("key")
+    assert pool.keys() == ["other"]
+    assert pool.get("key", object) is not first
+    pool.clear()
+    assert len(pool) == 0
+
+
+def test_pool_idle_eviction():
+    pool = Pool(max_idle=0.05)
+    first = pool.get("key", object)
+    time.sleep(0.1)
+    assert pool.get("key", object) is not first
+
+
+def test_pool_single_construction():
+    pool = Pool()
+    calls = []
+
+    def factory():
+        calls.append(None)
+        time.sleep(0.1)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.get("key", factory)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_pool_failed_construction():
+    pool = Pool()
+
+    def factory():
+        raise RuntimeError("unavailable")
+
+    with pytest.raises(RuntimeError):
+        pool.get("key", factory)
+    assert pool.get("key", lambda: 1) == 1
+
+
+def test_pool_invalid_idle():
+    with pytest.raises(ValueError):
+        Pool(max_idle=0)
+
+
+def test_metabackend_pooling(qiskit_backend):
+    backend = MetaBackend.load("qiskit-client", token="fake", platform="a")
+    assert MetaBackend.load("qiskit-client", token="fake", platform="a") is backend
+    assert MetaBackend.load("qiskit-client", token="fake", pooled=False) is not backend
+    other = MetaBackend.load("qiskit-client", token="fake", platform="b")
+    assert other is not backend
+    # the provider is shared by the platforms
+    assert PROVIDERS.keys() == [("qiskit-client", "fake")]
+
+    MetaBackend.invalidate(platform="a")
+    assert MetaBackend.load("qiskit-client", token="fake", platform="a") is not backend
+    assert MetaBackend.load("qiskit-client", token="fake", platform="b") is other
+    assert len(PROVIDERS) == 1
+
+    MetaBackend.invalidate(token="fake")
+    assert len(MetaBackend.pool) == 0
+    assert len(PROVIDERS) == 0
+
+
+def test_metabackend_unsupported_client():
+    with pytest.raises(ValueError):
+        MetaBackend.load("unknown-client")
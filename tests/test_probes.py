@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from qibo_cloud_backends import CLIENTS, MetaBackend, probes
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    probes.clear_cache()
+    yield
+    probes.clear_cache()
+
+
+def test_probe_reports_reason_and_elapsed(monkeypatch):
+    def failing(token, timeout):
+        raise RuntimeError("unauthorized")
+
+    monkeypatch.setitem(probes.PROBES, "qibo-client", failing)
+    results = probes.probe({"qibo-client": "token", "braket-client": None})
+    assert list(results) == ["qibo-client", "braket-client"]
+    assert not results["qibo-client"].available
+    assert results["qibo-client"].reason == "RuntimeError: unauthorized"
+    assert results["braket-client"].available
+    assert results["braket-client"].reason is None
+    assert results["braket-client"].elapsed >= 0
+
+
+def test_probe_missing_token():
+    result = probes.probe({"ionq-client": None})["ionq-client"]
+    assert not result.available
+    assert "no token" in result.reason
+
+
+def test_probe_is_concurrent_and_bounded(monkeypatch):
+    release = threading.Event()
+
+    def hanging(token, timeout):
+        release.wait(5)
+
+    for client in ("qibo-client", "qiskit-client"):
+        monkeypatch.setitem(probes.PROBES, client, hanging)
+    start = time.monotonic()
+    results = probes.probe(
+        {"qibo-client": "a", "qiskit-client": "b", "braket-client": None}, timeout=0.2
+    )
+    release.set()
+    assert time.monotonic() - start < 1
+    assert "timed out" in results["qibo-client"].reason
+    assert "timed out" in results["qiskit-client"].reason
+    assert results["braket-client"].available
+
+
+def test_probe_cache(monkeypatch):
+    calls = []
+    monkeypatch.setitem(
+        probes.PROBES, "qibo-client", lambda token, timeout: calls.append(token)
+    )
+    probes.probe({"qibo-client": "a"})
+    probes.probe({"qibo-client": "a"})
+    assert calls == ["a"]
+    probes.probe({"qibo-client": "b"})
+    probes.probe({"qibo-client": "a"}, ttl=0)
+    assert calls == ["a", "b", "a"]
+
+
+def test_list_available(monkeypatch):
+    for client in CLIENTS:
+        monkeypatch.setitem(probes.PROBES, client, lambda token, timeout: None)
+    monkeypatch.setitem(
+        probes.PROBES, "ionq-client", lambda token, timeout: _require(token)
+    )
+    available = MetaBackend().list_available({"ionq-client": None})
+    assert available == {
+        "ionq-client": False,
+        "qibo-client": True,
+        "qiskit-client": True,
+        "braket-client": True,
+    }
+
+
+def _require(token):
+    if token is None:
+        raise RuntimeError("no token provided")
+
+
+@pytest.mark.parametrize("status_code", [401, 403])
+def test_probe_ionq_rejected_token(monkeypatch, status_code):
+    requests = []
+
+    class Response:
+        def __init__(self, url, **kwargs):
+            requests.append((url, kwargs))
+            self.status_code = status_code
+
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr(probes, "_require", lambda package: None)
+    monkeypatch.setattr(probes._session, "get", Response)
+    result = probes.probe({"ionq-client": "revoked"})["ionq-client"]
+    assert not result.available
+    assert str(status_code) in result.reason
+    url, kwargs = requests[0]
+    assert url == probes.IONQ_URL
+    assert kwargs["headers"] == {"Authorization": "apiKey revoked"}
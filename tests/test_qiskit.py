@@ -0,0 +1,78 @@
+import pytest
+from qibo import Circuit, gates
+from qibo.backends import NumpyBackend
+from qibo.quantum_info import random_unitary
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from qibo_cloud_backends.qiskit_translation import to_qiskit
+
+NP_BACKEND = NumpyBackend()
+
+
+@pytest.mark.parametrize(
+    "gate",
+    [
+        gates.I(0),
+        gates.H(0),
+        gates.X(0),
+        gates.Y(0),
+        gates.Z(0),
+        gates.S(0),
+        gates.SDG(0),
+        gates.T(0),
+        gates.TDG(0),
+        gates.SX(0),
+        gates.SXDG(0),
+        gates.CNOT(0, 1),
+        gates.CNOT(1, 0),
+        gates.CY(0, 1),
+        gates.CZ(0, 1),
+        gates.CSX(0, 1),
+        gates.SWAP(0, 1),
+        gates.iSWAP(0, 1),
+        gates.ECR(0, 1),
+        gates.ECR(1, 0),
+        gates.TOFFOLI(0, 1, 2),
+        gates.CCZ(0, 1, 2),
+        gates.RX(0, 0.1),
+        gates.RY(0, 0.2),
+        gates.RZ(0, 0.3),
+        gates.U1(0, 0.4),
+        gates.U2(0, 0.5, 0.6),
+        gates.U3(0, 0.7, 0.8, 0.9),
+        gates.CRX(0, 1, 0.1),
+        gates.CRY(1, 0, 0.2),
+        gates.CRZ(0, 1, 0.3),
+        gates.CU1(0, 1, 0.4),
+        gates.CU3(0, 1, 0.7, 0.8, 0.9),
+        gates.RXX(0, 1, 0.1),
+        gates.RYY(0, 1, 0.2),
+        gates.RZZ(0, 1, 0.3),
+        gates.RZX(0, 1, 0.4),
+        gates.RZX(1, 0, 0.4),
+        gates.Unitary(random_unitary(4, seed=1, backend=NP_BACKEND), 0, 2),
+    ],
+)
+def test_to_qiskit(gate):
+    nqubits = max(gate.qubits) + 1
+    circuit = Circuit(nqubits)
+    circuit.add(gate)
+    target = Operator(circuit.unitary(backend=NP_BACKEND)).reverse_qargs()
+    assert Operator(to_qiskit(circuit)).equiv(target)
+
+
+def test_to_qiskit_measurements():
+    circuit = Circuit(3)
+    circuit.add(gates.X(0))
+    circuit.add(gates.M(0, 2))
+    circuit.add(gates.M(1, register_name="b"))
+    translated = to_qiskit(circuit)
+    assert translated == QuantumCircuit.from_qasm_str(circuit.to_qasm())
+
+
+def test_to_qiskit_unsupported():
+    circuit = Circuit(1)
+    circuit.add(gates.GPI(0, 0.1))
+    with pytest.raises(NotImplementedError):
+        to_qiskit(circuit)
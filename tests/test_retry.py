@@ -0,0 +1,174 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends import BraketClientBackend
+from qibo_cloud_backends.polling import Poller, PollingTimeoutError
+from qibo_cloud_backends.retry import RetryPolicy, is_transient, is_unsent
+
+
+def flaky(function, failures, error=ConnectionError):
+    """Wraps ``function`` so that its first ``failures`` calls raise ``error``."""
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        if len(calls) <= failures:
+            raise error("transient failure")
+        return function(*args, **kwargs)
+
+    wrapper.calls = calls
+    return wrapper
+
+
+def circuit():
+    circuit = Circuit(2)
+    circuit.add(gates.X(0))
+    circuit.add(gates.M(0, 1))
+    return circuit
+
+
+def http_error(status_code):
+    error = RuntimeError("HTTP error")
+    error.response = SimpleNamespace(status_code=status_code)
+    return error
+
+
+def aws_error(code):
+    error = RuntimeError("AWS error")
+    error.response = {"Error": {"Code": code}, "ResponseMetadata": {}}
+    return error
+
+
+def test_retry_policy():
+    for kwargs in (
+        {"attempts": 0},
+        {"interval": 0},
+        {"interval": 2, "max_interval": 1},
+        {"backoff": 0.5},
+        {"jitter": 1},
+    ):
+        with pytest.raises(ValueError):
+            RetryPolicy(**kwargs)
+    policy = RetryPolicy(interval=1, max_interval=8, jitter=0)
+    assert list(itertools.islice(policy.intervals(), 5)) == [1, 2, 4, 8, 8]
+
+
+def test_is_transient():
+    ReadTimeout = type("ReadTimeout", (OSError,), {})
+    for error in (
+        ConnectionError(),
+        TimeoutError(),
+        ReadTimeout(),
+        http_error(429),
+        http_error(503),
+        aws_error("ThrottlingException"),
+    ):
+        assert is_transient(error)
+    for error in (
+        ValueError(),
+        http_error(401),
+        aws_error("ValidationException"),
+        PollingTimeoutError(),
+    ):
+        assert not is_transient(error)
+
+
+def test_is_unsent():
+    ConnectTimeout = type("ConnectTimeout", (OSError,), {})
+    NewConnectionError = type("NewConnectionError", (OSError,), {})
+    ReadTimeout = type("ReadTimeout", (OSError,), {})
+    # the HTTP clients wrap the connection failures
+    wrapped = ConnectionError("max retries exceeded")
+    wrapped.__context__ = RuntimeError("max retries exceeded")
+    wrapped.__context__.reason = NewConnectionError()
+    for error in (
+        ConnectionRefusedError(),
+        ConnectTimeout(),
+        wrapped,
+        http_error(429),
+        http_error(503),
+        aws_error("ThrottlingException"),
+    ):
+        assert is_unsent(error)
+    for error in (
+        ConnectionError(),
+        TimeoutError(),
+        ReadTimeout(),
+        http_error(500),
+        aws_error("InternalFailure"),
+    ):
+        assert not is_unsent(error)
+
+
+def test_retry_call():
+    policy = RetryPolicy(attempts=3, interval=1e-3, jitter=0)
+    reconnections = []
+    request = flaky(lambda: "done", 2)
+    assert policy.call(request, before_retry=lambda: reconnections.append(1)) == "done"
+    assert len(request.calls) == 3
+    assert len(reconnections) == 2
+
+    request = flaky(lambda: "done", 3)
+    with pytest.raises(ConnectionError):
+        policy.call(request)
+    assert len(request.calls) == 3
+
+    request = flaky(lambda: "done", 1, ValueError)
+    with pytest.raises(ValueError):
+        policy.call(request)
+    assert len(request.calls) == 1
+
+    # the next retry would exceed the deadline
+    policy = RetryPolicy(attempts=5, interval=1, deadline=0.5)
+    request = flaky(lambda: "done", 1)
+    with pytest.raises(ConnectionError):
+        policy.call(request)
+    assert len(request.calls) == 1
+
+
+def test_backend_retry(qibo_backend):
+    qibo_backend.retry = RetryPolicy(interval=1e-3)
+    client = qibo_backend.client
+    client.run_circuit = flaky(client.run_circuit, 1, ConnectionRefusedError)
+    client.get_job = flaky(client.get_job, 0)
+    job = qibo_backend.submit_circuit(circuit(), nshots=10)
+    assert len(client.run_circuit.calls) == 2
+
+    job.job.result = flaky(job.job.result, 2, lambda message: http_error(503))
+    assert job.result().frequencies() == {"10": 10}
+    # the retrievals reattach to the same job instead of submitting it again
+    assert len(client.run_circuit.calls) == 2
+    assert client.get_job.calls == [(job.job_id,)] * 2
+
+    # the job may have been created before the response timed out
+    client.run_circuit = flaky(client.run_circuit, 1, TimeoutError)
+    with pytest.raises(TimeoutError):
+        qibo_backend.submit_circuit(circuit(), nshots=10)
+    assert len(client.run_circuit.calls) == 1
+
+
+def test_backend_retry_status():
+    backend = BraketClientBackend()
+    backend.retry = RetryPolicy(interval=1e-3)
+    job = backend.submit_circuit(circuit(), nshots=10)
+    job.job.state = flaky(job.job.state, 2, lambda message: aws_error("Throttling"))
+    assert job.result().frequencies() == {"10": 10}
+    assert len(job.job.state.calls) == 3
+
+    # the timeout of the poller is not retried
+    backend.poller = Poller(interval=1e-3, timeout=1e-3)
+    job = backend.submit_circuit(circuit(), nshots=10)
+    job.job.state = flaky(lambda: "RUNNING", 0)
+    with pytest.raises(PollingTimeoutError):
+        job.result()
+    assert len(job.job.state.calls) == 1
+
+
+def test_backend_no_retry(qibo_backend):
+    client = qibo_backend.client
+    client.run_circuit = flaky(client.run_circuit, 1)
+    with pytest.raises(ConnectionError):
+        qibo_backend.submit_circuit(circuit(), nshots=10)
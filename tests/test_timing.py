@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from qibo import Circuit, gates
+
+from qibo_cloud_backends import BraketClientBackend
+from qibo_cloud_backends.cache import ResultCache
+from qibo_cloud_backends.polling import Poller
+from qibo_cloud_backends.timing import (
+    Timings,
+    braket_timings,
+    qiskit_timings,
+    report,
+)
+
+
+def circuit():
+    circuit = Circuit(2)
+    circuit.add(gates.X(1))
+    circuit.add(gates.M(0, 1))
+    return circuit
+
+
+def test_timings():
+    timings = Timings()
+    assert timings.total == 0.0
+    with timings.stage("translate"):
+        pass
+    with pytest.raises(ValueError):
+        with timings.stage("submit"):
+            raise ValueError
+    assert list(timings.durations()) == ["translate", "submit"]
+    assert all(duration >= 0 for duration in timings.durations().values())
+    assert timings.total >= sum(timings.durations().values())
+
+
+def test_report():
+    received = []
+    report(Timings(job_id="a"), received.append)
+    assert [timings.job_id for timings in received] == ["a"]
+
+    def failing(timings):
+        raise RuntimeError
+
+    report(Timings(), failing)
+    report(Timings(), None)
+
+
+def test_provider_timings():
+    start = datetime(2024, 1, 1)
+    steps = {
+        "CREATED": start,
+        "QUEUED": start + timedelta(seconds=1),
+        "RUNNING": start + timedelta(seconds=11),
+        "COMPLETED": start + timedelta(seconds=14),
+    }
+    job = SimpleNamespace(time_per_step=lambda: steps)
+    result = SimpleNamespace(time_taken=0.5)
+    assert qiskit_timings(job, result) == {"queue": 10.0, "execution": 3.0}
+    assert qiskit_timings(object(), result) == {"execution": 0.5}
+
+    metadata = SimpleNamespace(
+        createdAt="2024-01-01T00:00:00Z", endedAt="2024-01-01T00:00:02.500Z"
+    )
+    assert braket_timings(SimpleNamespace(task_metadata=metadata)) == {"total": 2.5}
+    assert braket_timings(SimpleNamespace(task_metadata=None)) == {}
+
+
+@pytest.mark.parametrize(
+    "client", ["braket_backend", "qiskit_backend", "ionq_backend", "qibo_backend"]
+)
+def test_backend_timings(client, request):
+    backend = (
+        BraketClientBackend()
+        if client == "braket_backend"
+        else request.getfixturevalue(client)
+    )
+    backend.poller = Poller(interval=1e-3)
+    received = []
+    backend.timing_callback = received.append
+    result = backend.execute_circuit(circuit(), nshots=10)
+    timings = result.timings
+    assert received == [timings]
+    assert timings.route == f"{backend.name}:{backend.platform}"
+    assert timings.nshots == 10
+    assert isinstance(timings.job_id, str)
+    stages = ["submit", "wait", "download"]
+    if client != "qibo_backend":
+        stages = ["translate"] + stages + ["decode"]
+    assert list(timings.stages) == stages
+    starts, ends = zip(*timings.stages.values())
+    assert list(starts) == sorted(starts)
+    assert list(ends) == sorted(ends)
+
+
+def test_cached_timings(tmp_path):
+    backend = BraketClientBackend()
+    backend.cache = ResultCache(tmp_path)
+    backend.execute_circuit(circuit(), nshots=10)
+    result = backend.execute_circuit(circuit(), nshots=10)
+    assert list(result.timings.stages) == ["cache", "decode"]
@@ -0,0 +1,144 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from qibo import Circuit, gates
+from qibo.backends import NumpyBackend
+
+from qibo_cloud_backends.utils import (
+    PackedMeasurementOutcomes,
+    counts_to_frequencies,
+    counts_to_outcomes,
+    counts_to_samples,
+    expectation_from_counts,
+    frequencies_to_bits,
+    qiskit_max_shots,
+    samples_to_outcomes,
+    split_shots,
+    stack_frequencies,
+)
+
+NP_BACKEND = NumpyBackend()
+
+
+def measured_circuit():
+    circuit = Circuit(3)
+    circuit.add(gates.X(0))
+    circuit.add(gates.H(1))
+    circuit.add(gates.M(0, 2))
+    circuit.add(gates.M(1))
+    return circuit
+
+
+@pytest.mark.parametrize("little_endian", [True, False])
+def test_counts_to_samples(little_endian):
+    counts = {"0 01": 3, "1 01": 2}
+    samples = counts_to_samples(counts, little_endian)
+    bits = [[1, 0, 0], [1, 0, 1]] if little_endian else [[0, 0, 1], [1, 0, 1]]
+    target = np.repeat(np.array(bits), [3, 2], axis=0)
+    np.testing.assert_array_equal(samples, target)
+
+
+def test_counts_to_frequencies():
+    counts = {"0 01": 3, "1 01": 2}
+    assert counts_to_frequencies(counts) == {4: 3, 5: 2}
+    assert counts_to_frequencies(counts, little_endian=False) == {1: 3, 5: 2}
+
+
+@pytest.mark.parametrize("result_format", ["counts", "packed"])
+def test_counts_to_outcomes_frequencies(result_format):
+    circuit = measured_circuit()
+    counts = {"0 01": 3, "1 01": 7}
+    with_samples = counts_to_outcomes(circuit.measurements, counts, NP_BACKEND, 10)
+    target_frequencies = with_samples.frequencies()
+    target_registers = with_samples.frequencies(registers=True)
+    outcomes = counts_to_outcomes(
+        circuit.measurements, counts, NP_BACKEND, 10, result_format=result_format
+    )
+    assert not outcomes.has_samples()
+    assert outcomes.frequencies() == target_frequencies
+    assert outcomes.frequencies(registers=True) == target_registers
+    NP_BACKEND.assert_allclose(outcomes.probabilities(), with_samples.probabilities())
+    assert outcomes.samples().shape == (10, 3)
+    with pytest.raises(ValueError):
+        counts_to_outcomes(
+            circuit.measurements, counts, NP_BACKEND, 10, result_format="bits"
+        )
+
+
+def test_packed_outcomes():
+    circuit = measured_circuit()
+    samples = np.random.randint(0, 2, size=(1000, 3))
+    outcomes = samples_to_outcomes(
+        circuit.measurements, samples, NP_BACKEND, 1000, result_format="packed"
+    )
+    assert isinstance(outcomes, PackedMeasurementOutcomes)
+    assert outcomes.packed.nbytes == 1000
+    target = samples_to_outcomes(circuit.measurements, samples, NP_BACKEND, 1000)
+    assert outcomes.frequencies() == target.frequencies()
+    np.testing.assert_array_equal(outcomes.samples(), samples)
+    assert outcomes.frequencies(registers=True) == target.frequencies(registers=True)
+    registers = target.samples(registers=True)
+    for name, register in outcomes.samples(registers=True).items():
+        np.testing.assert_array_equal(register, registers[name])
+
+
+@pytest.mark.parametrize("client", ["qiskit_backend", "ionq_backend"])
+def test_counts_decoding_in_backends(client, request):
+    backend = request.getfixturevalue(client)
+    circuit = measured_circuit()
+    result = backend.execute_circuit(circuit, nshots=100)
+    samples = result.samples()
+    assert samples.shape == (100, 3)
+    np.testing.assert_array_equal(samples[:, :2], np.tile([1, 0], (100, 1)))
+
+
+def test_frequencies_to_bits():
+    bits, occurrences = frequencies_to_bits({0b101: 3, 0b010: 2}, 3)
+    np.testing.assert_array_equal(bits, [[1, 0, 1], [0, 1, 0]])
+    np.testing.assert_array_equal(occurrences, [3, 2])
+
+
+@pytest.mark.parametrize(
+    "nshots,max_shots,target",
+    [
+        (1000, None, [1000]),
+        (1000, 1000, [1000]),
+        (1000, 300, [250, 250, 250, 250]),
+        (1001, 500, [334, 334, 333]),
+    ],
+)
+def test_split_shots(nshots, max_shots, target):
+    assert split_shots(nshots, max_shots) == target
+
+
+def test_split_shots_invalid():
+    with pytest.raises(ValueError):
+        split_shots(10, 0)
+
+
+def test_qiskit_max_shots(ionq_backend):
+    assert qiskit_max_shots(object()) is None
+    # the basic simulator reports no limit
+    assert qiskit_max_shots(ionq_backend.backend) is None
+
+
+def test_stack_frequencies():
+    stacked = stack_frequencies(iter([Counter({1: 3, 2: 1}), Counter({3: 4})]), 2, 2)
+    np.testing.assert_array_equal(stacked, [[0, 3, 1, 0], [0, 0, 0, 4]])
+    with pytest.raises(ValueError, match="measure fewer qubits"):
+        stack_frequencies(iter([]), 4, 26)
+
+
+def test_expectation_from_counts():
+    counts = {"0 01": 3, "1 01": 1}
+    observables = ["ZII", "izi", "IIZ", "ZIZ"]
+    expectations, variances = expectation_from_counts(counts, observables)
+    np.testing.assert_allclose(expectations, [-1, 1, 0.5, -0.5])
+    np.testing.assert_allclose(variances, [0, 0, 0.75, 0.75])
+    big_endian, _ = expectation_from_counts({"001": 4}, "IIZ", little_endian=False)
+    np.testing.assert_allclose(big_endian, [-1])
+    with pytest.raises(ValueError):
+        expectation_from_counts(counts, ["ZZ"])
+    with pytest.raises(ValueError):
+        expectation_from_counts(counts, ["XII"])